@@ -0,0 +1,4 @@
+import logging
+
+# Biblioteka nie konfiguruje logowania - komunikaty (poziom INFO) widać po logging.basicConfig(level=logging.INFO)
+logging.getLogger(__name__).addHandler(logging.NullHandler())
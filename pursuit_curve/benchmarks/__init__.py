@@ -0,0 +1,10 @@
+from .suite import GROUPS, Scenario, compare, measure, run_suite, scenarios
+
+__all__ = [
+    "GROUPS",
+    "Scenario",
+    "compare",
+    "measure",
+    "run_suite",
+    "scenarios",
+]
@@ -0,0 +1,87 @@
+"""
+Uruchomienie z linii poleceń:
+
+    python -m pursuit_curve.benchmarks --output wyniki.json
+    python -m pursuit_curve.benchmarks --quick --compare wyniki.json --threshold 0.2
+
+Z --compare kod wyjścia 1 oznacza co najmniej jedną regresję względem linii bazowej.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any
+
+from pursuit_curve.common import set_backend
+from pursuit_curve.common.backend import BACKENDS
+
+from .suite import DEFAULT_THRESHOLD, GROUPS, MIN_TIME, compare, run_suite
+
+
+def _format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def _print_result(result: dict[str, Any]) -> None:
+    print(f"{result['name']:<48}{_format_seconds(result['best']):>12}{_format_seconds(result['mean']):>12}", flush=True)
+
+
+def _print_comparison(rows: list[dict[str, Any]]) -> None:
+    print(f"\n{'Benchmark':<48}{'baza':>12}{'teraz':>12}{'zmiana':>10}  status")
+    for row in rows:
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%" if "ratio" in row else "-"
+        print(
+            f"{row['name']:<48}{_format_seconds(row['baseline']):>12}{_format_seconds(row['current']):>12}"
+            f"{change:>10}  {row['status']}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pursuit_curve.benchmarks", description="Benchmarki strategii")
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"Grupy oddzielone przecinkami: {','.join(GROUPS)}")
+    parser.add_argument("--quick", action="store_true", help="Mniejsze zakresy N i liczby agentów")
+    parser.add_argument("--filter", default=None, help="Tylko scenariusze, których nazwa zawiera ten napis")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--backend", default="numpy", choices=BACKENDS)
+    parser.add_argument("--output", default=None, help="Plik JSON na wyniki")
+    parser.add_argument("--compare", default=None, help="Plik JSON z linią bazową")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Względny próg regresji")
+    args = parser.parse_args(argv)
+
+    set_backend(args.backend)
+    print(f"{'Benchmark':<48}{'najlepszy':>12}{'średni':>12}")
+    report = run_suite(
+        tuple(args.groups.split(",")),
+        quick=args.quick,
+        pattern=args.filter,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        progress=_print_result,
+    )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare is None:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(report, baseline, args.threshold)
+    if args.filter is not None or set(args.groups.split(",")) != set(GROUPS):
+        # Przebieg częściowy - brak pozostałych przypadków linii bazowej nie jest istotny
+        rows = [row for row in rows if row["status"] != "missing"]
+    _print_comparison(rows)
+    regressions = [row for row in rows if row["status"] == "regression"]
+    print(f"\nRegresje: {len(regressions)} (próg {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Skalowanie GraphPursuit: czas dynamics() i kroku RK4 oraz pamięć w funkcji liczby agentów."""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
+
+from pursuit_curve.graph import GraphPursuit, cyclic_targets, run_graph_pursuit
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def best_time(func, repeat: int = 5) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(n: int, steps: int = 10, on_capture: str = "merge") -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    # Pierścień z losowym zaburzeniem - część agentów łapie cel już w pierwszych krokach
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    radius = n / (2 * np.pi) * 1.5
+    positions = radius * np.column_stack([np.cos(angles), np.sin(angles)]) + rng.normal(scale=0.5, size=(n, 2))
+    strategy = GraphPursuit(cyclic_targets(n), speed=1.0, capture_radius=0.5, on_capture=on_capture)
+
+    y = positions.ravel()
+    out = np.empty_like(y)
+    rhs = best_time(lambda: strategy.dynamics(0.0, y, out=out))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run_graph_pursuit(positions, strategy, t_span=(0, steps * 0.1), max_step=0.1, method="rk4")
+    run = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "rhs_s": rhs,
+        "step_s": run / max(result.n_steps, 1),
+        "peak_bytes": peak,
+        "captured": int(result.captured.sum()),
+    }
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'n':>10}{'dynamics [ms]':>16}{'ns/agent':>12}{'krok RK4 [ms]':>16}{'pamięć [MB]':>14}{'B/agent':>10}")
+    for n in sizes:
+        m = measure(n)
+        print(
+            f"{n:>10,}{m['rhs_s'] * 1e3:>16.3f}{m['rhs_s'] / n * 1e9:>12.1f}{m['step_s'] * 1e3:>16.2f}"
+            f"{m['peak_bytes'] / 1e6:>14.1f}{m['peak_bytes'] / n:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
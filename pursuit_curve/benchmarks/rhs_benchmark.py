@@ -0,0 +1,87 @@
+"""Mikrobenchmark: liczba wywołań Strategy.dynamics() na sekundę dla każdej strategii."""
+
+import inspect
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
+
+from pursuit_curve.common import Point2D, Point3D, PointND, Strategy
+from pursuit_curve.d2.continuous import (
+    ContinuousConstantBearing,
+    ContinuousCyclicPursuit,
+    ContinuousDirectPursuit,
+    ContinuousProportionalNavigation,
+    ContinuousTargetCircleStrategy,
+)
+from pursuit_curve.d3.continuous import ContinuousDirectPursuit3D, ContinuousTargetHelixStrategy
+from pursuit_curve.dn.continuous import ContinuousDirectPursuitND, ContinuousTargetLinearStrategyND
+from pursuit_curve.sphere.continuous import ContinuousDirectPursuitSphere, ContinuousTargetSphereStrategy
+from pursuit_curve.torus.continuous import ContinuousDirectPursuitTorus, ContinuousTargetTorusStrategy
+
+
+def rhs_cases() -> list[tuple[str, Strategy, np.ndarray]]:
+    rng = np.random.default_rng(0)
+    circle = ContinuousTargetCircleStrategy(angular_velocity=0.3, r=5.0)
+    cases: list[tuple[str, Strategy, np.ndarray]] = [
+        ("DirectPursuit", ContinuousDirectPursuit(Point2D(1.5, 1.5), circle), np.array([15.0, 0.0, 5.0, 0.0])),
+        (
+            "ConstantBearing",
+            ContinuousConstantBearing(Point2D(1.5, 1.5), circle, bearing_angle_deg=30.0),
+            np.array([15.0, 0.0, 5.0, 0.0]),
+        ),
+        (
+            "ProportionalNavigation",
+            ContinuousProportionalNavigation(Point2D(1.5, 1.5), circle),
+            np.array([15.0, 0.0, 5.0, 0.0, np.pi]),
+        ),
+        (
+            "DirectPursuit3D",
+            ContinuousDirectPursuit3D(Point3D(2.5, 2.5, 2.5), ContinuousTargetHelixStrategy(1.0, 1.0, 0.5)),
+            np.array([12.0, 12.0, 12.0, 5.0, 0.0, 0.0]),
+        ),
+        (
+            "DirectPursuitSphere",
+            ContinuousDirectPursuitSphere(1.5, ContinuousTargetSphereStrategy(dr=0.0, dtheta=0.1, dphi=np.pi / 4)),
+            np.array([5.0, np.pi / 4, 2.0, 5.0, 0.0, 0.0]),
+        ),
+        (
+            "DirectPursuitTorus",
+            ContinuousDirectPursuitTorus(2.0, ContinuousTargetTorusStrategy(omega_u=0.5, omega_v=1.0), R=2.0, r=1.0),
+            np.array([0.0, 0.0, np.pi / 2, np.pi / 2]),
+        ),
+    ]
+    for n in (18, 1000):
+        cases.append((f"CyclicPursuit n={n}", ContinuousCyclicPursuit(Point2D(1.0, 1.0), n=n), rng.normal(size=2 * n)))
+    for n in (10, 1000):
+        strategy = ContinuousDirectPursuitND(
+            PointND(tuple([2.5] * n)), ContinuousTargetLinearStrategyND(PointND(tuple([1.0] * n)))
+        )
+        cases.append((f"DirectPursuitND N={n}", strategy, rng.normal(size=2 * n)))
+    return cases
+
+
+def evaluations_per_second(strategy: Strategy, y: np.ndarray, reuse_output: bool, number: int = 2000) -> float:
+    if reuse_output:
+        out = np.empty_like(y)
+        timer = timeit.Timer(lambda: strategy.dynamics(0.5, y, out=out))  # type: ignore [call-arg]
+    else:
+        timer = timeit.Timer(lambda: strategy.dynamics(0.5, y))
+    best = min(timer.repeat(repeat=5, number=number))
+    return number / best
+
+
+def main() -> None:
+    print(f"{'Strategia':<28}{'dynamics(t, y) [1/s]':>24}{'dynamics(t, y, out) [1/s]':>28}")
+    for name, strategy, y in rhs_cases():
+        fresh = evaluations_per_second(strategy, y, reuse_output=False)
+        line = f"{name:<28}{fresh:>24,.0f}"
+        if "out" in inspect.signature(strategy.dynamics).parameters:
+            line += f"{evaluations_per_second(strategy, y, reuse_output=True):>28,.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Zestaw benchmarków strategii ciągłych: prawa strona (dynamics), zdarzenie złapania (common.events),
+pełne całkowanie i eksport animacji - dla każdej strategii z d2, d3, dn, sphere i torus, w funkcji
+wymiaru N (dn) i liczby agentów (pościg cykliczny).
+
+Wynik to słownik JSON {"meta": ..., "results": [...]}; compare() zestawia go z zapisaną linią
+bazową i oznacza przypadki wolniejsze o więcej niż próg jako regresje.
+"""
+
+import platform
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from pursuit_curve.common import Point2D, Point3D, PointND, Strategy, get_backend
+from pursuit_curve.common.events import simulation_events
+from pursuit_curve.common.integrators import integrate
+from pursuit_curve.d2.continuous import (
+    ContinuousConstantBearing,
+    ContinuousCyclicPursuit,
+    ContinuousDirectPursuit,
+    ContinuousProportionalNavigation,
+    ContinuousTargetCircleStrategy,
+    ContinuousTargetLinearStrategy,
+    animate_continuous_pursuit,
+    cyclic_pursuit_animation,
+)
+from pursuit_curve.d3.continuous import (
+    ContinuousDirectPursuit3D,
+    ContinuousTargetHelixStrategy,
+    ContinuousTargetLinearStrategy3D,
+    ContinuousTargetLissajousStrategy,
+    animate_continuous_pursuit_3d,
+)
+from pursuit_curve.dn.continuous import ContinuousDirectPursuitND, ContinuousTargetLinearStrategyND
+from pursuit_curve.sphere.continuous import (
+    ContinuousDirectPursuitSphere,
+    ContinuousTargetSphereStrategy,
+    animate_sphere_pursuit_3d,
+)
+from pursuit_curve.torus.continuous import (
+    ContinuousDirectPursuitTorus,
+    ContinuousTargetTorusStrategy,
+    animate_torus_pursuit_3d,
+)
+
+GROUPS = ("rhs", "capture", "integrate", "render")
+DIMENSIONS = (2, 3, 10, 100, 1000, 10000)
+"""Wymiary N dla ContinuousDirectPursuitND"""
+AGENTS = (3, 10, 100, 1000, 10000)
+"""Liczby agentów dla ContinuousCyclicPursuit"""
+QUICK_DIMENSIONS = (2, 10, 100)
+QUICK_AGENTS = (3, 10, 100)
+RENDER_FRAMES = 30
+MAX_RENDER_AGENTS = 1000
+"""Powyżej tej liczby agentów eksport animacji nie jest mierzony"""
+MIN_TIME = 0.2
+"""Minimalny łączny czas jednej serii pomiarów krótkich operacji [s]"""
+DEFAULT_THRESHOLD = 0.1
+
+Renderer = Callable[[Any, str], None]
+
+
+@dataclass
+class Scenario:
+    name: str
+    family: str
+    """Moduł strategii: "d2", "d3", "dn", "sphere" albo "torus" """
+    build: Callable[[], tuple[list[float], Strategy]]
+    t_span: tuple[float, float]
+    size: int = 1
+    """Wymiar N albo liczba agentów - oś skalowania"""
+    max_step: float = 0.1
+    render: Renderer | None = None
+    """Eksport animacji rozwiązania do pliku (backend "raster")"""
+
+
+def _pursuit_2d(pursuer: type, target: Any, **kwargs: Any) -> tuple[list[float], Strategy]:
+    return [15.0, 0.0, 5.0, 0.0], pursuer(Point2D(1.5, 1.5), target, **kwargs)
+
+
+def _pursuit_3d(target: Any) -> tuple[list[float], Strategy]:
+    return [12.0, 12.0, 12.0, 5.0, 0.0, 0.0], ContinuousDirectPursuit3D(Point3D(2.5, 2.5, 2.5), target)
+
+
+def _pursuit_nd(n: int) -> tuple[list[float], Strategy]:
+    rng = np.random.default_rng(n)
+    strategy = ContinuousDirectPursuitND(
+        PointND(tuple([2.5] * n)), ContinuousTargetLinearStrategyND(PointND(tuple(rng.uniform(-1, 1, n))))
+    )
+    return [12.0] * n + [0.0] * n, strategy
+
+
+def _cyclic(n: int) -> tuple[list[float], Strategy]:
+    # Agenci na okręgu o obwodzie rosnącym z n - odstęp między sąsiadami nie zależy od ich liczby
+    radius = 2.0 * n / (2 * np.pi) + 5.0
+    angles = 2 * np.pi * np.arange(n) / n
+    state = list(chain.from_iterable(zip(radius * np.cos(angles), radius * np.sin(angles))))
+    return state, ContinuousCyclicPursuit(Point2D(1.0, 1.0), n=n)
+
+
+def scenarios(dimensions: tuple[int, ...] = DIMENSIONS, agents: tuple[int, ...] = AGENTS) -> list[Scenario]:
+    circle = ContinuousTargetCircleStrategy(angular_velocity=0.3, r=5.0)
+    linear = ContinuousTargetLinearStrategy(Point2D(1.0, 0.5))
+    render_2d = partial(animate_continuous_pursuit, num_frames=RENDER_FRAMES, backend="raster")
+    render_3d = partial(animate_continuous_pursuit_3d, num_frames=RENDER_FRAMES, backend="raster")
+    cases = [
+        Scenario(
+            "DirectPursuit", "d2", partial(_pursuit_2d, ContinuousDirectPursuit, circle), (0, 60), render=render_2d
+        ),
+        Scenario(
+            "ConstantBearing",
+            "d2",
+            partial(_pursuit_2d, ContinuousConstantBearing, circle, bearing_angle_deg=30.0),
+            (0, 60),
+            render=render_2d,
+        ),
+        Scenario(
+            "ProportionalNavigation",
+            "d2",
+            partial(_pursuit_2d, ContinuousProportionalNavigation, linear),
+            (0, 60),
+            render=render_2d,
+        ),
+        Scenario(
+            "DirectPursuit3D-Linear",
+            "d3",
+            partial(_pursuit_3d, ContinuousTargetLinearStrategy3D(Point3D(1.0, 0.5, 0.2))),
+            (0, 60),
+            size=3,
+            render=render_3d,
+        ),
+        Scenario(
+            "DirectPursuit3D-Helix",
+            "d3",
+            partial(_pursuit_3d, ContinuousTargetHelixStrategy(1.0, 1.0, 0.5)),
+            (0, 60),
+            size=3,
+            render=render_3d,
+        ),
+        Scenario(
+            "DirectPursuit3D-Lissajous",
+            "d3",
+            partial(_pursuit_3d, ContinuousTargetLissajousStrategy(Point3D(5.0, 5.0, 5.0), Point3D(2.0, 3.0, 5.0))),
+            (0, 60),
+            size=3,
+            render=render_3d,
+        ),
+        Scenario(
+            "DirectPursuitSphere",
+            "sphere",
+            lambda: (
+                [5.0, np.pi / 4, 2.0, 5.0, 0.0, 0.0],
+                ContinuousDirectPursuitSphere(1.5, ContinuousTargetSphereStrategy(dr=0.0, dtheta=0.1, dphi=np.pi / 4)),
+            ),
+            (0, 60),
+            size=3,
+            render=partial(animate_sphere_pursuit_3d, num_frames=RENDER_FRAMES, backend="raster"),
+        ),
+        Scenario(
+            "DirectPursuitTorus",
+            "torus",
+            lambda: (
+                [0.0, 0.0, np.pi / 2, np.pi / 2],
+                ContinuousDirectPursuitTorus(
+                    2.0, ContinuousTargetTorusStrategy(omega_u=0.5, omega_v=1.0), R=2.0, r=1.0
+                ),
+            ),
+            (0, 60),
+            render=partial(animate_torus_pursuit_3d, R=2.0, r=1.0, num_frames=RENDER_FRAMES, backend="raster"),
+        ),
+    ]
+    for n in dimensions:
+        cases.append(Scenario(f"DirectPursuitND N={n}", "dn", partial(_pursuit_nd, n), (0, 20), size=n))
+    render_cyclic = partial(cyclic_pursuit_animation, num_frames=RENDER_FRAMES, backend="raster")
+    for n in agents:
+        cases.append(
+            Scenario(
+                f"CyclicPursuit n={n}",
+                "d2",
+                partial(_cyclic, n),
+                (0, 20),
+                size=n,
+                render=render_cyclic if n <= MAX_RENDER_AGENTS else None,
+            )
+        )
+    return cases
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = MIN_TIME) -> dict[str, float]:
+    """
+    Czas jednego wywołania func: liczba wywołań w serii jest podwajana, aż seria trwa min_time,
+    potem repeat serii. best - najlepsza seria (najmniej zaburzona), mean - średnia serii.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    series = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        series.append(time.perf_counter() - start)
+    per_call = np.array(series) / number
+    return {"best": float(per_call.min()), "mean": float(per_call.mean()), "number": number, "repeat": repeat}
+
+
+def _method(strategy: Strategy) -> str:
+    return strategy.integrator or "dopri5"
+
+
+def _bench_rhs(scenario: Scenario, repeat: int, min_time: float) -> dict[str, Any]:
+    initial_state, strategy = scenario.build()
+    y = np.asarray(strategy.augment_state(initial_state), dtype=np.float64)
+    out = np.empty_like(y)
+    return measure(lambda: strategy.dynamics(0.5, y, out), repeat, min_time)
+
+
+def _bench_capture(scenario: Scenario, repeat: int, min_time: float) -> dict[str, Any]:
+    """Zdarzenie złapania tak, jak wywołuje je integrator - w stanie, dla którego dynamics() już policzyła pochodną."""
+    initial_state, strategy = scenario.build()
+    y = np.asarray(strategy.augment_state(initial_state), dtype=np.float64)
+    event = simulation_events(strategy)[0]
+    strategy.dynamics(0.5, y, np.empty_like(y))
+    return measure(lambda: event(0.5, y), repeat, min_time)
+
+
+def _integrate(scenario: Scenario) -> Any:
+    initial_state, strategy = scenario.build()
+    return integrate(strategy, initial_state, scenario.t_span, method=_method(strategy), max_step=scenario.max_step)
+
+
+def _bench_integrate(scenario: Scenario, repeat: int, min_time: float) -> dict[str, Any]:
+    solution = _integrate(scenario)
+    timing = measure(lambda: _integrate(scenario), repeat, min_time)
+    return {**timing, "n_steps": len(solution.t) - 1, "nfev": int(solution.nfev)}
+
+
+def _bench_render(scenario: Scenario, repeat: int, min_time: float) -> dict[str, Any]:
+    assert scenario.render is not None
+    render = scenario.render
+    solution = _integrate(scenario)
+    with tempfile.TemporaryDirectory() as tmp:
+        file = str(Path(tmp) / "frames.npz")
+
+        timing = measure(lambda: render(solution, file=file), repeat, min_time)  # type: ignore [call-arg]
+    return {**timing, "frames": RENDER_FRAMES}
+
+
+BENCHMARKS: dict[str, Callable[[Scenario, int, float], dict[str, Any]]] = {
+    "rhs": _bench_rhs,
+    "capture": _bench_capture,
+    "integrate": _bench_integrate,
+    "render": _bench_render,
+}
+
+
+def run_suite(
+    groups: tuple[str, ...] = GROUPS,
+    quick: bool = False,
+    pattern: str | None = None,
+    repeat: int = 5,
+    min_time: float = MIN_TIME,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    groups: Mierzone operacje - podzbiór GROUPS
+    quick: Mniejsze zakresy N i liczby agentów (QUICK_DIMENSIONS, QUICK_AGENTS)
+    pattern: Tylko scenariusze, których nazwa zawiera ten napis
+    progress: Wywoływana z każdym wynikiem zaraz po pomiarze
+    """
+    for group in groups:
+        if group not in BENCHMARKS:
+            raise ValueError(f"Nieznana grupa benchmarków: {group}")
+    cases = scenarios(QUICK_DIMENSIONS, QUICK_AGENTS) if quick else scenarios()
+    results = []
+    for group in groups:
+        for scenario in cases:
+            if pattern is not None and pattern not in scenario.name:
+                continue
+            if group == "render" and scenario.render is None:
+                continue
+            result = {
+                "name": f"{group}/{scenario.name}",
+                "group": group,
+                "scenario": scenario.name,
+                "family": scenario.family,
+                "size": scenario.size,
+                **BENCHMARKS[group](scenario, repeat, min_time),
+            }
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "backend": get_backend(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Zestawia wyniki po nazwie. status: "regression" (wolniej o więcej niż threshold),
+    "improvement" (szybciej o więcej niż threshold), "ok", "new" (brak w linii bazowej)
+    albo "missing" (brak w bieżącym przebiegu).
+    """
+    reference = {result["name"]: result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        base = reference.pop(result["name"], None)
+        if base is None:
+            rows.append({"name": result["name"], "baseline": None, "current": result["best"], "status": "new"})
+            continue
+        ratio = result["best"] / base["best"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": result["name"],
+                "baseline": base["best"],
+                "current": result["best"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    rows.extend(
+        {"name": name, "baseline": base["best"], "current": None, "status": "missing"}
+        for name, base in reference.items()
+    )
+    return rows
@@ -0,0 +1,11 @@
+from .scenario import canonical, scenario_key
+from .simulation import cached_metrics, cached_simulation
+from .store import ScenarioCache
+
+__all__ = [
+    "ScenarioCache",
+    "cached_metrics",
+    "cached_simulation",
+    "canonical",
+    "scenario_key",
+]
@@ -0,0 +1,91 @@
+"""
+Kanoniczny klucz scenariusza symulacji.
+
+Scenariusz to klasa strategii z jej parametrami (Strategy.parameters, rekurencyjnie dla strategii celu),
+stan początkowy, t_span, max_step i integrator. Wartości są sprowadzane do postaci kanonicznej
+(liczby zmiennoprzecinkowe przez float.hex, a całkowite jak int; tablice przez dtype, kształt i skrót
+danych), więc klucz nie zależy od kolejności atrybutów, typu sekwencji (lista/krotka) ani zapisu liczby.
+"""
+
+import dataclasses
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+from pursuit_curve.common import Strategy, TargetStrategy
+
+KEY_VERSION = 2
+"""Wersja formatu klucza - zmiana unieważnia wszystkie wpisy cache"""
+
+
+def _qualname(value: object) -> str:
+    cls = type(value)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def canonical(value: Any) -> Any:
+    """
+    Postać kanoniczna wartości - struktura JSON, w której każdy typ niebędący skalarem JSON jest
+    oznaczony etykietą. Nieobsługiwany typ (np. funkcja) zgłasza TypeError - nie da się z niego
+    wyznaczyć stabilnego klucza.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, np.integer)) and not isinstance(value, np.bool_):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (float, np.floating)):
+        # 1.0 i 1 to ten sam parametr - całkowite wartości zapisujemy jak int
+        if float(value).is_integer() and abs(value) < 2**53:
+            return int(value)
+        return ["float", float(value).hex()]
+    if isinstance(value, (list, tuple)):
+        return ["seq", [canonical(item) for item in value]]
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        if data.dtype == object:
+            return ["seq", [canonical(item) for item in data.tolist()]]
+        return ["array", data.dtype.str, list(data.shape), hashlib.sha256(data.tobytes()).hexdigest()]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError(f"Klucze słownika muszą być napisami: {list(value)}")
+        return ["map", {key: canonical(item) for key, item in value.items()}]
+    if isinstance(value, (Strategy, TargetStrategy)):
+        return ["object", _qualname(value), canonical(value.parameters())]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+        return ["object", _qualname(value), canonical(fields)]
+    if not callable(value) and hasattr(value, "__dict__"):
+        public = {name: item for name, item in vars(value).items() if not name.startswith("_")}
+        return ["object", _qualname(value), canonical(public)]
+    raise TypeError(f"Nie można wyznaczyć postaci kanonicznej dla {type(value).__name__}")
+
+
+def scenario_key(
+    initial_state: Any,
+    strategy: Strategy,
+    t_span: tuple[float, float],
+    max_step: float,
+    method: str,
+    **extra: Any,
+) -> str:
+    """
+    Skrót SHA-256 (hex) scenariusza.
+
+    method: Integrator już rozstrzygnięty (np. strategy.integrator albo "RK45")
+    extra: Dodatkowe składniki klucza, np. geometria i pary dla metryk
+    """
+    payload = {
+        "version": KEY_VERSION,
+        "initial_state": canonical(np.asarray(initial_state, dtype=np.float64)),
+        "strategy": canonical(strategy),
+        "t_span": canonical([float(t_span[0]), float(t_span[1])]),
+        "max_step": canonical(float(max_step)),
+        "method": method,
+        "extra": canonical(extra),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
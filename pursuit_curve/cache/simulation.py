@@ -0,0 +1,109 @@
+"""
+run_continuous_simulation i compute_metrics z cache wyników adresowanym kluczem scenariusza.
+"""
+
+import dataclasses
+import os
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from pursuit_curve.common import Strategy, TrajectoryReader, stream_continuous_simulation
+from pursuit_curve.metrics import Euclidean, Geometry, MetricSeries, PursuitMetrics, compute_metrics
+
+from .scenario import scenario_key
+from .store import ScenarioCache
+
+TRAJECTORY_SUFFIX = ".traj"
+METRICS_SUFFIX = ".metrics.npz"
+SERIES_PREFIX = "series."
+
+
+def cached_simulation(
+    initial_state: list[float],
+    strategy: Strategy,
+    cache: ScenarioCache,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str | None = None,
+) -> TrajectoryReader:
+    """
+    run_continuous_simulation() z cache: trajektoria scenariusza jest czytana z cache, a przy braku
+    wpisu liczona i zapisywana strumieniowo (stream_continuous_simulation) - także dla metod solve_ivp.
+    Zwraca TrajectoryReader; metadata zawiera klucz scenariusza i integrator.
+
+    Klucz wyznaczają parametry strategii (Strategy.parameters), więc stan zmieniany w trakcie
+    symulacji (runtime_state) nie wpływa na trafienie.
+    """
+    method = method or strategy.integrator or "RK45"
+    key = scenario_key(initial_state, strategy, t_span, max_step, method)
+    reader = cache.get(key, TRAJECTORY_SUFFIX, TrajectoryReader)
+    if reader is not None:
+        return reader
+
+    metadata = {"key": key, "method": method}
+    with cache.writing(key, TRAJECTORY_SUFFIX) as tmp:
+        stream_continuous_simulation(initial_state, strategy, tmp, t_span, max_step, method, metadata).close()
+    reader = TrajectoryReader(cache.path(key, TRAJECTORY_SUFFIX))
+    cache.remember(key, TRAJECTORY_SUFFIX, reader)
+    return reader
+
+
+def _save_metrics(path: str | os.PathLike, metrics: PursuitMetrics) -> None:
+    arrays = {}
+    for field in dataclasses.fields(PursuitMetrics):
+        value = getattr(metrics, field.name)
+        if field.name != "series":
+            arrays[field.name] = np.asarray(value)
+        elif value is not None:
+            for series_field in dataclasses.fields(MetricSeries):
+                arrays[SERIES_PREFIX + series_field.name] = getattr(value, series_field.name)
+    np.savez(path, **arrays)
+
+
+def _load_metrics(path: str | os.PathLike) -> PursuitMetrics:
+    with np.load(path) as data:
+        values = {name: data[name] for name in data.files}
+    series = {
+        name.removeprefix(SERIES_PREFIX): values.pop(name) for name in list(values) if name.startswith(SERIES_PREFIX)
+    }
+    return PursuitMetrics(
+        **{
+            **values,
+            "t_start": float(values["t_start"]),
+            "t_end": float(values["t_end"]),
+            "n_samples": int(values["n_samples"]),
+            "series": MetricSeries(**series) if series else None,
+        }
+    )
+
+
+def cached_metrics(
+    initial_state: list[float],
+    strategy: Strategy,
+    cache: ScenarioCache,
+    geometry: Geometry | None = None,
+    pairs: ArrayLike | None = None,
+    series: bool = False,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str | None = None,
+) -> PursuitMetrics:
+    """
+    compute_metrics() dla scenariusza z cache - przy braku wpisu metryki liczone są z trajektorii
+    cached_simulation(), która też trafia do cache.
+    """
+    geometry = geometry or Euclidean()
+    method = method or strategy.integrator or "RK45"
+    pairs = None if pairs is None else np.asarray(pairs, dtype=np.intp)
+    key = scenario_key(initial_state, strategy, t_span, max_step, method, geometry=geometry, pairs=pairs, series=series)
+    metrics = cache.get(key, METRICS_SUFFIX, _load_metrics)
+    if metrics is not None:
+        return metrics
+
+    solution = cached_simulation(initial_state, strategy, cache, t_span, max_step, method)
+    metrics = compute_metrics(solution, geometry, pairs, series)
+    with cache.writing(key, METRICS_SUFFIX) as tmp:
+        _save_metrics(tmp, metrics)
+    cache.remember(key, METRICS_SUFFIX, metrics)
+    return metrics
@@ -0,0 +1,140 @@
+"""
+Magazyn wyników adresowany kluczem scenariusza: katalog na dysku z limitem rozmiaru (LRU) i warstwa
+w pamięci procesu.
+
+Wpis to plik <klucz><sufiks> w katalogu cache. Zapis idzie do pliku tymczasowego z pid w nazwie
+i kończy się os.replace, więc procesy zapisujące ten sam klucz równolegle nie widzą nawzajem
+niepełnych plików - wygrywa ostatni, a oba wyniki są identyczne. Czas modyfikacji pliku pełni rolę
+czasu ostatniego użycia: odczyt go odświeża, a eviction usuwa wpisy o najstarszym.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+TEMPORARY_PREFIX = "."
+"""Pliki tymczasowe (zapis w toku) - pomijane przez odczyt i eviction"""
+
+
+class ScenarioCache:
+    """
+    directory: Katalog wpisów - może być współdzielony przez wiele procesów
+    max_bytes: Limit łącznego rozmiaru wpisów; po każdym zapisie usuwane są najdawniej używane
+    memory_items: Liczba wpisów trzymanych w pamięci procesu (0 - bez warstwy w pamięci)
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 1 << 30, memory_items: int = 32):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+
+    def path(self, key: str, suffix: str) -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def _touch(self, path: Path) -> bool:
+        """Odświeża czas użycia wpisu; False, gdy wpis usunął w międzyczasie inny proces."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def remember(self, key: str, suffix: str, value: Any) -> None:
+        """Dodaje wartość do warstwy w pamięci, usuwając najdawniej używaną po przekroczeniu memory_items."""
+        if self.memory_items <= 0:
+            return
+        name = f"{key}{suffix}"
+        self._memory[name] = value
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, suffix: str, load: Callable[[Path], T]) -> T | None:
+        """
+        Wartość wpisu z pamięci albo z dysku (load(path)); None, gdy wpisu nie ma.
+        Wpis w pamięci jest ważny tylko dopóki istnieje jego plik.
+        """
+        name = f"{key}{suffix}"
+        path = self.path(key, suffix)
+        if name in self._memory:
+            if self._touch(path):
+                self._memory.move_to_end(name)
+                self.hits += 1
+                return self._memory[name]
+            del self._memory[name]
+        try:
+            value = load(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.remember(key, suffix, value)
+        self.hits += 1
+        return value
+
+    @contextmanager
+    def writing(self, key: str, suffix: str) -> Iterator[Path]:
+        """
+        Ścieżka pliku tymczasowego dla wpisu. Po wyjściu z bloku bez wyjątku plik jest atomowo
+        przenoszony pod klucz i uruchamiana jest eviction; po wyjątku - usuwany.
+        """
+        path = self.path(key, suffix)
+        tmp = path.with_name(f"{TEMPORARY_PREFIX}{key}.{os.getpid()}.{threading.get_ident()}.tmp{suffix}")
+        try:
+            yield tmp
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, path)
+        self.evict(keep=path)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        """(czas użycia, rozmiar, ścieżka) wpisów; plik usunięty w trakcie listowania jest pomijany."""
+        entries = []
+        for path in self.directory.iterdir():
+            if path.name.startswith(TEMPORARY_PREFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def evict(self, keep: Path | None = None) -> int:
+        """
+        Usuwa najdawniej używane wpisy, aż łączny rozmiar zmieści się w max_bytes. Zwraca liczbę
+        usuniętych wpisów. keep - wpis, który zostaje niezależnie od limitu (właśnie zapisany).
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # Ten sam wpis może równolegle usuwać inny proces
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.name, None)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy (bez plików tymczasowych zapisów w toku)."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._memory.clear()
@@ -1,11 +1,46 @@
-from .continuous_simulation import run_continuous_simulation
-from .types import Point2D, Point3D, PointND, Strategy, TargetStrategy
+from .analytic_target import AnalyticTargetStrategy
+from .backend import KernelSpec, get_backend, numba_enabled, set_backend
+from .batch_simulation import BatchSolution, run_batch_simulation
+from .continuous_simulation import pursuer_target_distance, run_continuous_simulation, stream_continuous_simulation
+from .events import CaptureEvent, CollisionEvent, EscapeEvent, Event, TimeoutEvent
+from .instrumentation import Instrumentation, SimulationStats
+from .integrators import StepStream
+from .memory import MemoryReport, profile_memory
+from .progressive import ProgressiveSimulation, SimulationChunk
+from .tabulated_target import TabulatedTargetStrategy
+from .trajectory_store import TrajectoryReader, TrajectoryWriter
+from .types import Point2D, Point3D, PointND, Strategy, TargetStrategy, stack_components
 
 __all__ = [
+    "AnalyticTargetStrategy",
+    "BatchSolution",
+    "CaptureEvent",
+    "CollisionEvent",
+    "EscapeEvent",
+    "Event",
+    "Instrumentation",
+    "KernelSpec",
+    "MemoryReport",
     "Point2D",
     "Point3D",
     "PointND",
+    "ProgressiveSimulation",
+    "SimulationChunk",
+    "SimulationStats",
+    "StepStream",
     "Strategy",
+    "TabulatedTargetStrategy",
     "TargetStrategy",
+    "TimeoutEvent",
+    "TrajectoryReader",
+    "TrajectoryWriter",
+    "get_backend",
+    "numba_enabled",
+    "profile_memory",
+    "pursuer_target_distance",
+    "run_batch_simulation",
     "run_continuous_simulation",
+    "set_backend",
+    "stream_continuous_simulation",
+    "stack_components",
 ]
@@ -0,0 +1,126 @@
+"""
+Całkowanie bez celu w stanie ODE. Gdy trajektoria celu jest znana w postaci zamkniętej
+(TargetStrategy.closed_form), jego współrzędne nie muszą być całkowane numerycznie: solwer dostaje
+tylko stan ścigającego (i dodatkowe zmienne strategii), a pozycja celu w każdym wywołaniu dynamics()
+liczona jest z TargetStrategy.displacement(). Wynik uzupełniany jest pozycjami celu dla wszystkich
+kroków jednym wywołaniem, więc ma ten sam układ stanu co zwykła symulacja.
+
+Stan strategii to [ścigający (dim), cel (dim), dodatkowe zmienne], gdzie dim to wymiar prędkości celu.
+"""
+
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.optimize import OptimizeResult
+
+from .backend import numba_enabled
+from .types import Strategy, TargetStrategy
+
+
+class AnalyticTargetStrategy(Strategy):
+    """
+    Pośrednik strategii całkujący stan bez współrzędnych celu.
+    initial_state: Pełny stan początkowy strategii - z niego brana jest pozycja startowa celu
+    t0: Chwila, w której cel jest w pozycji startowej
+    reuse: Czy stop_condition() może brać odległość policzoną przez dynamics() (events.REUSE_METHODS)
+    Stan początkowy dla solwera to initial_state tego obiektu.
+    """
+
+    def __init__(self, strategy: Strategy, initial_state: Any, t0: float = 0.0, reuse: bool = False):
+        target: TargetStrategy = strategy.target_strategy  # type: ignore [attr-defined]
+        if not target.closed_form:
+            raise ValueError(f"Cel {type(target).__name__} nie ma trajektorii w postaci zamkniętej")
+        state = np.array(strategy.augment_state(initial_state), dtype=np.float64)
+        self.strategy = strategy
+        self.integrator = strategy.integrator
+        self.capture_radius = strategy.capture_radius
+        self.dim = dim = np.asarray(target.calculate_movement(t0)).size
+        self.initial_state = np.delete(state, np.s_[dim : 2 * dim])
+        self._target = target
+        # Pozycja celu to _offset + displacement(t)
+        self._offset = state[dim : 2 * dim] - target.displacement(t0)
+        self._state = state
+        self._derivative = np.empty_like(state)
+        self._reuse = reuse and strategy.distance_cached and not numba_enabled()
+        self._last_y: NDArray[np.float64] | None = None
+
+    @property
+    def target_strategy(self) -> TargetStrategy:
+        return self.strategy.target_strategy  # type: ignore [attr-defined]
+
+    @target_strategy.setter
+    def target_strategy(self, target: TargetStrategy) -> None:
+        # Instrumentation podmienia cel strategii na czas przebiegu
+        self.strategy.target_strategy = target  # type: ignore [attr-defined]
+
+    def target_position(self, t: float | NDArray[np.float64]) -> NDArray[np.float64]:
+        """Pozycja celu (dim,) w chwili t albo (dim, K) w chwilach t (K,)."""
+        d = self._target.displacement(t)
+        return d + self._offset.reshape(self._offset.shape + (1,) * (d.ndim - 1))
+
+    def full_states(self, t: float | NDArray[np.float64], y: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Stany bez celu (n, K) w chwilach t (K,) -> pełne stany strategii (n + dim, K); też dla wektora."""
+        d = self.dim
+        return np.concatenate([y[:d], self.target_position(t), y[d:]])
+
+    def _full_state(self, t: float, y: NDArray[np.float64]) -> NDArray[np.float64]:
+        d = self.dim
+        state = self._state
+        state[:d] = y[:d]
+        state[d : 2 * d] = self._offset + self._target.displacement(t)
+        state[2 * d :] = y[d:]
+        return state
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        d = self.dim
+        f = self.strategy.dynamics(t, self._full_state(t, y), self._derivative)
+        self._last_y = y
+        if out is None:
+            out = np.empty(len(y))
+        out[:d] = f[:d]
+        out[d:] = f[2 * d :]
+        return out
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        d = self.dim
+        position = np.broadcast_to(self.target_position(t)[:, np.newaxis], (d, Y.shape[1]))
+        F = self.strategy.dynamics_batch(t, np.concatenate([Y[:d], position, Y[d:]]))
+        return np.concatenate([F[:d], F[2 * d :]])
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if self._reuse and y is self._last_y:
+            # dynamics() dla tego samego y liczyło odległość na buforze _state (patrz Strategy.cached_distance)
+            distance = self.strategy.cached_distance(self._state)
+            if distance is not None:
+                return distance - self.capture_radius
+        return self.strategy.capture_distance(self._full_state(t, np.asarray(y))) - self.capture_radius
+
+    stop_condition.terminal = True  # type: ignore [attr-defined]
+    stop_condition.direction = -1  # type: ignore [attr-defined]
+
+    def expand(self, solution: OptimizeResult) -> OptimizeResult:
+        """Uzupełnia y, y_events i sol wyniku solwera o pozycje celu."""
+        n = len(self.initial_state)
+        solution.y = self.full_states(solution.t, solution.y)
+        solution.y_events = [
+            self.full_states(np.asarray(t), np.asarray(y).reshape(-1, n).T).T
+            for t, y in zip(solution.t_events, solution.y_events)
+        ]
+        if solution.get("sol") is not None:
+            solution.sol = _TargetDenseOutput(solution.sol, self)
+        return solution
+
+
+class _TargetDenseOutput:
+    """Interpolant wyniku z pozycjami celu liczonymi analitycznie."""
+
+    def __init__(self, sol: Any, strategy: AnalyticTargetStrategy):
+        self._sol = sol
+        self._strategy = strategy
+
+    def __call__(self, t: float | NDArray[np.float64]) -> NDArray[np.float64]:
+        return self._strategy.full_states(t, self._sol(t))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._sol, name)
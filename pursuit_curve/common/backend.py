@@ -0,0 +1,119 @@
+"""
+Wybór backendu obliczeń: "numpy" (domyślny) albo "numba" (kernele kompilowane w trybie nopython).
+
+Numba jest zależnością opcjonalną - bez niej dostępny jest tylko backend "numpy".
+Zmienne środowiskowe:
+    PURSUIT_CURVE_BACKEND=numba      - backend wybrany przy imporcie
+    PURSUIT_CURVE_NUMBA_CACHE=1      - zapisuj skompilowane kernele na dysk (cache=True w numba),
+                                       żeby procesy robocze nie płaciły za kompilację przy każdym starcie
+"""
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .types import TargetStrategy
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - zależy od środowiska
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+BACKENDS = ("numpy", "numba")
+
+_backend = "numpy"
+_cache = os.environ.get("PURSUIT_CURVE_NUMBA_CACHE", "0") == "1"
+
+
+def set_backend(name: str, cache: bool | None = None) -> None:
+    """
+    name: "numpy" albo "numba"
+    cache: Czy kernele numba mają być zapisywane na dysk (dotyczy kerneli jeszcze nieskompilowanych)
+    """
+    global _backend, _cache
+    if name not in BACKENDS:
+        raise ValueError(f"Nieznany backend: {name}")
+    if name == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("Backend 'numba' wymaga zainstalowanego pakietu numba")
+    _backend = name
+    if cache is not None:
+        _cache = cache
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def numba_enabled() -> bool:
+    return _backend == "numba"
+
+
+class Kernel:
+    """
+    Funkcja kompilowana leniwie przy pierwszym użyciu z backendem numba.
+    Bez numby (albo z backendem "numpy") wywoływana jest zwykła funkcja pythonowa.
+    """
+
+    def __init__(self, func: Callable[..., Any]):
+        self.func = func
+        self._compiled: Any = None
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    @property
+    def compiled(self) -> Any:
+        """Dyspozytor numba - można go przekazać jako argument do innego kernela."""
+        if self._compiled is None:
+            if numba is None:
+                raise ImportError("Kompilacja kerneli wymaga zainstalowanego pakietu numba")
+            self._compiled = numba.njit(cache=_cache)(self.func)
+        return self._compiled
+
+    def __call__(self, *args: Any) -> Any:
+        if numba_enabled():
+            return self.compiled(*args)
+        return self.func(*args)
+
+
+def kernel(func: Callable[..., Any]) -> Kernel:
+    return Kernel(func)
+
+
+@dataclass
+class KernelSpec:
+    """
+    Opis strategii dla backendu numba: kernel dynamiki, kernel zatrzymania i ich parametry.
+    Jeśli podano target_strategy, jej prędkość wpisywana jest do params[target_offset:] przed
+    każdym wywołaniem - chyba że cel ma stałą prędkość (wtedy jest już w params).
+    """
+
+    kernel: Kernel
+    stop: Kernel
+    params: NDArray[np.float64]
+    stop_params: NDArray[np.float64]
+    target_strategy: "TargetStrategy | None" = None
+    target_offset: int = 0
+
+    @property
+    def autonomous(self) -> bool:
+        """Czy parametry nie zależą od czasu - tylko wtedy cała pętla całkowania może być skompilowana."""
+        return self.target_strategy is None or self.target_strategy.constant_velocity
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> NDArray:
+        if out is None:
+            out = np.empty(len(y))
+        if not self.autonomous:
+            self.params[self.target_offset :] = self.target_strategy.calculate_movement(t)  # type: ignore [union-attr]
+        return self.kernel(t, y, self.params, out)
+
+    def stop_condition(self, y: NDArray[np.float64]) -> float:
+        return self.stop(np.asarray(y, dtype=np.float64), self.stop_params)
+
+
+if os.environ.get("PURSUIT_CURVE_BACKEND"):
+    set_backend(os.environ["PURSUIT_CURVE_BACKEND"])
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .integrators import dopri5_step, error_norm, euler_step, rk4_step, step_factor
+from .types import Strategy
+
+FIXED_STEP_METHODS = {"euler": euler_step, "rk4": rk4_step}
+
+
+@dataclass
+class BatchSolution:
+    t: NDArray[np.float64]
+    """Chwile czasu kroków (K,) - wspólne dla wszystkich scenariuszy"""
+    y: NDArray[np.float64] | None
+    """Trajektorie (K, M, n_states) albo None gdy store_trajectories=False"""
+    capture_times: NDArray[np.float64]
+    """Czas złapania celu (M,), NaN gdy cel nie został złapany"""
+    captured: NDArray[np.bool_]
+    final_states: NDArray[np.float64]
+    """Stany końcowe (M, n_states) - dla złapanych scenariuszy stan w chwili złapania"""
+    n_steps: int
+    n_rejected: int
+    success: bool
+    message: str
+
+
+def run_batch_simulation(
+    initial_states: ArrayLike,
+    strategy: Strategy,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str = "dopri5",
+    rtol: float = 1e-3,
+    atol: float = 1e-6,
+    store_trajectories: bool = True,
+) -> BatchSolution:
+    """
+    Całkuje M scenariuszy naraz, jednym wektorowym wywołaniem strategy.dynamics_batch() na etap.
+
+    initial_states: tablica (M, n_states), wiersz to stan początkowy jednego scenariusza
+    strategy: Strategia z metodami dynamics_batch() i stop_condition_batch().
+              Parametry strategii mogą być tablicami (M,) - po jednej wartości na scenariusz.
+    t_span: Przedział czasu (t_start, t_end)
+    max_step: Krok metod stałokrokowych ("euler", "rk4") / maksymalny krok dla "dopri5"
+    method: "dopri5" (Dormand-Prince, wspólny adaptacyjny krok), "rk4" lub "euler"
+    store_trajectories: Czy zapisywać stany po każdym kroku
+
+    Złapanie celu wykrywane jest osobno dla każdego scenariusza (zmiana znaku stop_condition_batch
+    z + na -). Czas złapania wyznaczany jest interpolacją liniową w obrębie kroku, a złapany
+    scenariusz zostaje zamrożony.
+    """
+    if method != "dopri5" and method not in FIXED_STEP_METHODS:
+        raise ValueError(f"Nieznana metoda: {method}")
+
+    Y = np.array(strategy.augment_state(initial_states), dtype=np.float64)
+    if Y.ndim != 2:
+        raise ValueError("initial_states musi mieć kształt (M, n_states)")
+    Y = np.ascontiguousarray(Y.T)
+    M = Y.shape[1]
+
+    t0, t1 = t_span
+    active = np.ones(M, dtype=bool)
+    capture_times = np.full(M, np.nan)
+
+    def rhs(t: float, Z: NDArray[np.float64]) -> NDArray[np.float64]:
+        dZ = np.broadcast_to(strategy.dynamics_batch(t, Z), Z.shape).copy()
+        dZ[:, ~active] = 0.0
+        return dZ
+
+    t = t0
+    g = strategy.stop_condition_batch(t, Y)
+    ts = [t]
+    ys = [Y.T.copy()] if store_trajectories else []
+    n_steps = 0
+    n_rejected = 0
+    success = True
+    message = "Osiągnięto koniec przedziału czasu."
+
+    if method == "dopri5":
+        f = rhs(t, Y)
+        h = min(max_step, t1 - t0)
+
+    while t < t1 and active.any():
+        if method == "dopri5":
+            h = min(h, max_step, t1 - t)
+            if h < 10 * np.finfo(float).eps * max(abs(t), 1.0):
+                success = False
+                message = "Wymagany krok jest mniejszy niż precyzja czasu."
+                break
+            Y_new, f_new, error = dopri5_step(rhs, t, Y, h, f)
+            err = float(error_norm(error[:, active], Y[:, active], Y_new[:, active], rtol, atol).max())
+            if err > 1:
+                h *= step_factor(err)
+                n_rejected += 1
+                continue
+        else:
+            h = min(max_step, t1 - t)
+            Y_new = FIXED_STEP_METHODS[method](rhs, t, Y, h)
+
+        g_new = strategy.stop_condition_batch(t + h, Y_new)
+        hit = active & (g > 0) & (g_new <= 0)
+        if hit.any():
+            theta = g[hit] / (g[hit] - g_new[hit])
+            capture_times[hit] = t + theta * h
+            Y_new[:, hit] = Y[:, hit] + theta * (Y_new[:, hit] - Y[:, hit])
+            active &= ~hit
+            if method == "dopri5":
+                f_new[:, hit] = 0.0
+
+        t += h
+        Y = Y_new
+        g = g_new
+        n_steps += 1
+        ts.append(t)
+        if store_trajectories:
+            ys.append(Y.T.copy())
+        if method == "dopri5":
+            f = f_new
+            h *= step_factor(err)
+
+    if not active.any():
+        message = "Wszystkie scenariusze zakończone złapaniem celu."
+
+    return BatchSolution(
+        t=np.array(ts),
+        y=np.stack(ys) if store_trajectories else None,
+        capture_times=capture_times,
+        captured=~np.isnan(capture_times),
+        final_states=Y.T.copy(),
+        n_steps=n_steps,
+        n_rejected=n_rejected,
+        success=success,
+        message=message,
+    )
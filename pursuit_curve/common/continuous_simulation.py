@@ -1,30 +1,236 @@
+import logging
+import os
+from typing import Any, Callable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
 from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
 
+from .analytic_target import AnalyticTargetStrategy
+from .events import REUSE_METHODS, EventFn, simulation_events
+from .instrumentation import Instrumentation
+from .integrators import STEPPERS, StepStream, integrate
+from .memory import profile_memory
+from .progressive import CHUNK_SIZE, ProgressiveSimulation
+from .trajectory_store import TrajectoryReader, TrajectoryWriter
 from .types import Strategy
 
+logger = logging.getLogger(__name__)
+
+DistanceFn = Callable[[NDArray[np.float64]], float]
+DISTANCE_DTYPE = np.float32
+"""Typ zapisu odległości w trybie low_memory"""
+
+
+def pursuer_target_distance(y: NDArray[np.float64]) -> float:
+    """Odległość euklidesowa ścigający-cel: pierwsza połowa wektora stanu to ścigający, druga - cel."""
+    half = y.size // 2
+    return float(np.linalg.norm(y[half:] - y[:half]))
+
+
+def _simulate_distance(
+    initial_state: list[float],
+    strategy: Strategy,
+    t_span: tuple[float, float],
+    max_step: float,
+    method: str,
+    distance: DistanceFn,
+    events: Sequence[EventFn] | None = None,
+) -> OptimizeResult:
+    """Całkowanie strumieniowe (StepStream) - zachowywane są tylko czasy kroków i odległości."""
+    stream = StepStream(strategy, initial_state, t_span, method=method, max_step=max_step, events=events)
+    capacity = int(np.ceil((t_span[1] - t_span[0]) / max_step)) + 2
+    ts = np.empty(capacity)
+    distances = np.empty(capacity, dtype=DISTANCE_DTYPE)
+    size = 0
+    for t, y, _ in stream:
+        if size == len(ts):
+            ts = np.resize(ts, 2 * size)
+            distances = np.resize(distances, 2 * size)
+        ts[size] = t
+        distances[size] = distance(y)
+        size += 1
+    n = stream.initial_state.size
+    return OptimizeResult(
+        t=ts[:size].copy(),
+        distance=distances[:size].copy(),
+        y_final=y.copy(),
+        t_events=[np.array(times) for times in stream.t_events],
+        y_events=[np.array(states).reshape(-1, n) for states in stream.y_events],
+        nfev=stream.nfev,
+        n_rejected=stream.n_rejected,
+        status=stream.status,
+        message=stream.message,
+        success=stream.status >= 0,
+    )
+
 
 def run_continuous_simulation(
     initial_state: list[float],
     strategy: Strategy,
     t_span: tuple[float, float] = (0, 50),
     max_step: float = 0.1,
+    vectorized: bool = False,
+    method: str | None = None,
+    dense_output: bool = True,
+    low_memory: bool = False,
+    distance: DistanceFn | None = None,
+    profile: bool = False,
+    instrumentation: Instrumentation | None = None,
+    events: Sequence[EventFn] = (),
+    analytic_target: bool = False,
 ):
     """
     initial_state: [pursuer_x, pursuer_y, ..., target_x, target_y, ...]
     strategy: Strategia z metodami dynamics() i stop_condition()
     t_span: Przedział czasu (t_start, t_end)
     max_step: Maksymalny krok czasowy solwera
+    vectorized: Użyj strategy.dynamics_batch() w trybie vectorized=True solwera
+    method: Integrator - "euler", "rk4", "dopri5" (własna pętla, patrz integrators.integrate)
+            albo metoda solve_ivp ("RK45", "DOP853", ...). Domyślnie strategy.integrator,
+            a gdy ta nie jest ustawiona - RK45 z solve_ivp.
+    dense_output: Czy wynik ma interpolant sol - bez niego pamięć wyniku to tylko kroki
+    low_memory: Tryb dla dużych N: całkowanie strumieniowe bez trajektorii - wynik ma tylko t,
+                distance (float32, odległość w każdym kroku), y_final i pola zdarzeń. Wymaga
+                integratora z STEPPERS (domyślnie strategy.integrator albo "dopri5").
+    distance: Odległość ścigający-cel ze stanu dla low_memory (domyślnie strategy.capture_distance,
+              a gdy strategia jej nie ma - pursuer_target_distance)
+    profile: Raport pamięci (common.memory.MemoryReport) - logowany i zapisany w solution.memory
+    instrumentation: Liczniki i czasy wywołań strategii (common.instrumentation) - statystyki
+                     przebiegu trafiają do instrumentation.runs i solution.stats
+    events: Dodatkowe zdarzenia (common.events: TimeoutEvent, EscapeEvent, CollisionEvent, ...) -
+            t_events[0] to zawsze złapanie celu, t_events[i] - i-te zdarzenie z listy
+    analytic_target: Cel o trajektorii w postaci zamkniętej (TargetStrategy.closed_form) poza stanem
+                     ODE - całkowany jest tylko ścigający (common.analytic_target), a y, y_events
+                     i sol wyniku uzupełniane są pozycjami celu. Opłaca się, gdy krok ogranicza ruch
+                     celu (duże max_step, szybko zmienna trajektoria); przy kroku ograniczonym przez
+                     max_step przeważa narzut pośrednika. Nie działa z low_memory.
+    Podsumowanie przebiegu jest logowane (logger pursuit_curve.common.continuous_simulation, poziom INFO).
     """
-    solution = solve_ivp(
-        fun=strategy.dynamics,
-        t_span=t_span,
-        y0=initial_state,
-        events=strategy.stop_condition,
-        dense_output=True,
-        max_step=max_step,
-    )
+    if low_memory:
+        method = method or strategy.integrator or "dopri5"
+        if method not in STEPPERS:
+            raise ValueError(f"Tryb low_memory wymaga integratora z STEPPERS, a nie {method}")
+        if distance is None:
+            overridden = type(strategy).capture_distance is not Strategy.capture_distance
+            distance = strategy.capture_distance if overridden else pursuer_target_distance
+    else:
+        method = method or strategy.integrator or "RK45"
+
+    initial_state = strategy.augment_state(initial_state)
+    if analytic_target:
+        if low_memory:
+            raise ValueError("Tryb low_memory nie obsługuje analytic_target")
+        reuse = method in REUSE_METHODS and not vectorized
+        reduced = AnalyticTargetStrategy(strategy, initial_state, t_span[0], reuse)
+        strategy, initial_state = reduced, reduced.initial_state
+    # Bez dodatkowych zdarzeń integrate() może wybrać skompilowaną pętlę czasową (backend numba)
+    custom_events = bool(events) or instrumentation is not None
+    events = simulation_events(strategy, events, reuse=method in REUSE_METHODS and not vectorized)
+    if instrumentation is not None:
+        events = [instrumentation.event(event) for event in events]
+
+    def simulate(strategy: Strategy) -> OptimizeResult:
+        if low_memory:
+            return _simulate_distance(initial_state, strategy, t_span, max_step, method, distance, events)
+        if method in STEPPERS:
+            return integrate(
+                strategy,
+                initial_state,
+                t_span,
+                method=method,
+                max_step=max_step,
+                dense_output=dense_output,
+                events=events if custom_events else None,
+            )
+        return solve_ivp(
+            fun=strategy.dynamics_batch if vectorized else strategy.dynamics,
+            t_span=t_span,
+            y0=initial_state,
+            method=method if instrumentation is None else instrumentation.solver(method),
+            events=events,
+            dense_output=dense_output,
+            max_step=max_step,
+            vectorized=vectorized,
+        )
+
+    def run() -> OptimizeResult:
+        if instrumentation is None:
+            return simulate(strategy)
+        return instrumentation.run(simulate, strategy, method)
 
-    print(f"Symulacja zakończona w czasie t={solution.t[-1]:.2f}s")
-    print(f"Liczba kroków solwera: {len(solution.t)}")
+    if profile:
+        solution, report = profile_memory(run)
+        solution.memory = report
+    else:
+        solution = run()
+    if analytic_target:
+        solution = reduced.expand(solution)
+    if instrumentation is not None:
+        solution.stats = instrumentation.runs[-1]
+
+    logger.info(
+        "Symulacja zakończona w czasie t=%.2fs, liczba kroków solwera: %d",
+        solution.t[-1],
+        len(solution.t),
+        extra={"method": method, "t_final": float(solution.t[-1]), "n_steps": len(solution.t), "nfev": solution.nfev},
+    )
+    if profile:
+        logger.info("%s", report.format(), extra={"memory": report})
+    if instrumentation is not None:
+        logger.info("Statystyki przebiegu: %s", solution.stats, extra={"stats": solution.stats})
 
     return solution
+
+
+def stream_continuous_simulation(
+    initial_state: list[float],
+    strategy: Strategy,
+    path: str | os.PathLike,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str | None = None,
+    metadata: dict[str, Any] | None = None,
+    buffer_bytes: int = 1 << 20,
+    events: Sequence[EventFn] = (),
+    chunk_size: int = CHUNK_SIZE,
+) -> TrajectoryReader:
+    """
+    Jak run_continuous_simulation(), ale zaakceptowane kroki trafiają od razu do pliku path
+    (TrajectoryWriter), więc zużycie pamięci nie rośnie z długością symulacji.
+
+    method: Integrator z integrators.STEPPERS ("euler", "rk4", "dopri5") albo metoda solve_ivp
+            ("RK45", ...) - domyślnie strategy.integrator, a gdy nie jest ustawiony - "dopri5"
+    metadata: Słownik zapisywany w nagłówku pliku (JSON)
+    buffer_bytes: Rozmiar bufora zapisu
+    events: Dodatkowe zdarzenia jak w run_continuous_simulation - symulacja kończy się na pierwszym
+            terminalnym, a nagłówek pliku przechowuje tylko chwilę złapania celu
+    chunk_size: Liczba kroków w porcji symulacji przyrostowej (common.progressive), z której
+                zapisywany jest plik
+    Zwraca TrajectoryReader otwarty na zapisanym pliku.
+    """
+    method = method or strategy.integrator or "dopri5"
+    simulation = ProgressiveSimulation(initial_state, strategy, t_span, max_step, method, events, chunk_size)
+    with TrajectoryWriter(path, simulation.initial_state.size, metadata, buffer_bytes) as writer:
+        for chunk in simulation:
+            writer.extend(chunk.t, chunk.y, chunk.f)
+        writer.status = simulation.status
+        if simulation.t_events[0]:
+            writer.t_event = simulation.t_events[0][0]
+
+    t = simulation.t
+    logger.info(
+        "Symulacja zakończona w czasie t=%.2fs, liczba kroków solwera: %d",
+        t,
+        writer.count,
+        extra={
+            "method": method,
+            "t_final": float(t),
+            "n_steps": writer.count,
+            "nfev": simulation.nfev,
+            "path": str(path),
+        },
+    )
+
+    return TrajectoryReader(path)
@@ -0,0 +1,147 @@
+"""
+Zdarzenia symulacji w konwencji solve_ivp: funkcja g(t, y), zdarzenie to zmiana znaku g, atrybuty
+terminal (czy kończy symulację) i direction (-1 - przejście malejąco, 1 - rosnąco, 0 - oba).
+
+run_continuous_simulation przyjmuje listę dodatkowych zdarzeń - pierwszym zdarzeniem jest zawsze
+złapanie celu (simulation_events), więc t_events[0] to chwile złapania, a t_events[i] - chwile
+i-tego zdarzenia z listy. StepStream i integrate dostają pełną listę z simulation_events.
+
+Zdarzenia odległości (CaptureEvent, EscapeEvent) biorą odległość policzoną już przez dynamics()
+dla tego samego stanu (Strategy.cached_distance), zamiast liczyć ją od nowa w każdym kroku.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.spatial import cKDTree
+
+from .backend import numba_enabled
+
+if TYPE_CHECKING:
+    from .types import Strategy
+
+EventFn = Callable[[float, NDArray[np.float64]], float]
+
+CAPTURE_RADIUS = 0.5
+"""Domyślny promień złapania w przestrzeniach euklidesowych"""
+REUSE_METHODS = ("euler", "rk4", "dopri5", "RK23", "RK45", "DOP853")
+"""
+Integratory, które wywołują zdarzenia na stanie końca kroku przekazanym wcześniej do dynamics()
+i nie zmieniają go w miejscu - tylko dla nich zdarzenia mogą korzystać z Strategy.cached_distance.
+Metody niejawne (BDF) poprawiają stan po ostatnim wywołaniu prawej strony.
+"""
+
+
+class Event(ABC):
+    """
+    Bazowa klasa zdarzenia.
+    terminal: Czy zdarzenie kończy symulację
+    direction: Kierunek przejścia g przez zero, który liczy się jako zdarzenie
+    """
+
+    name = "event"
+
+    def __init__(self, terminal: bool = True, direction: float = 0):
+        self.terminal = terminal
+        self.direction = direction
+
+    @abstractmethod
+    def __call__(self, t: float, y: NDArray[np.float64]) -> float: ...
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(terminal={self.terminal}, direction={self.direction})"
+
+
+class DistanceEvent(Event):
+    """
+    g = odległość złapania strategii (Strategy.capture_distance) - radius.
+    reuse: Czy korzystać z odległości zapamiętanej przez dynamics() (patrz REUSE_METHODS)
+    """
+
+    def __init__(
+        self, strategy: Strategy, radius: float, terminal: bool = True, direction: float = 0, reuse: bool = True
+    ):
+        super().__init__(terminal, direction)
+        self.strategy = strategy
+        self.radius = radius
+        self.reuse = reuse
+
+    def __call__(self, t: float, y: NDArray[np.float64]) -> float:
+        distance = self.strategy.cached_distance(y) if self.reuse else None
+        if distance is None:
+            distance = self.strategy.capture_distance(np.asarray(y))
+        return distance - self.radius
+
+
+class CaptureEvent(DistanceEvent):
+    """Ścigający zbliżył się do celu na radius (domyślnie strategy.capture_radius)."""
+
+    name = "capture"
+
+    def __init__(self, strategy: Strategy, radius: float | None = None, terminal: bool = True, reuse: bool = True):
+        super().__init__(strategy, strategy.capture_radius if radius is None else radius, terminal, -1, reuse)
+
+
+class EscapeEvent(DistanceEvent):
+    """Cel oddalił się od ścigającego na więcej niż radius."""
+
+    name = "escape"
+
+    def __init__(self, strategy: Strategy, radius: float, terminal: bool = True, reuse: bool = True):
+        super().__init__(strategy, radius, terminal, 1, reuse)
+
+
+class TimeoutEvent(Event):
+    """Upłynął czas t_max - w odróżnieniu od końca t_span kończy symulację ze statusem zdarzenia."""
+
+    name = "timeout"
+
+    def __init__(self, t_max: float, terminal: bool = True):
+        super().__init__(terminal, -1)
+        self.t_max = t_max
+
+    def __call__(self, t: float, y: NDArray[np.float64]) -> float:
+        return self.t_max - t
+
+
+class CollisionEvent(Event):
+    """
+    Dwóch agentów zbliżyło się na radius. Stan to kolejne pozycje agentów, po dim współrzędnych
+    (jak w ContinuousCyclicPursuit); agents - indeksy sprawdzanych agentów (domyślnie wszyscy).
+    Najmniejsza odległość liczona jest drzewem k-d, więc koszt to O(n log n) zamiast O(n^2).
+    """
+
+    name = "collision"
+
+    def __init__(self, dim: int, radius: float, agents: Sequence[int] | None = None, terminal: bool = True):
+        super().__init__(terminal, -1)
+        self.dim = dim
+        self.radius = radius
+        self.agents = None if agents is None else np.asarray(agents, dtype=np.intp)
+
+    def __call__(self, t: float, y: NDArray[np.float64]) -> float:
+        positions = np.asarray(y).reshape(-1, self.dim)
+        if self.agents is not None:
+            positions = positions[self.agents]
+        if len(positions) < 2:
+            return np.inf
+        distances, _ = cKDTree(positions).query(positions, k=2)
+        return float(distances[:, 1].min()) - self.radius
+
+
+def simulation_events(strategy: Strategy, events: Sequence[EventFn] = (), reuse: bool = True) -> list[EventFn]:
+    """
+    Zdarzenia symulacji: złapanie celu i dodatkowe zdarzenia events.
+    Strategie z distance_cached dostają CaptureEvent korzystający z odległości z dynamics(),
+    pozostałe (oraz backend numba, w którym dynamics() jej nie zapamiętuje) - strategy.stop_condition.
+    reuse: False dla integratorów spoza REUSE_METHODS
+    """
+    if strategy.distance_cached and reuse and not numba_enabled():
+        capture: EventFn = CaptureEvent(strategy)
+    else:
+        capture = strategy.stop_condition
+    return [capture, *events]
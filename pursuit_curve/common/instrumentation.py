@@ -0,0 +1,240 @@
+"""
+Instrumentacja symulacji bez zmian w strategiach: liczniki wywołań prawej strony, funkcji zdarzenia
+i ruchu celu, podział czasu na dynamikę, cel, zdarzenia i narzut solwera oraz odrzucone kroki.
+
+Strategia jest na czas przebiegu opakowana w pośrednika mierzącego wywołania; jej strategia celu
+(atrybut target_strategy) jest podmieniana i przywracana po zakończeniu. Wyniki trafiają do
+callbacku, logu JSON (jeden wiersz na przebieg) i pliku Chrome trace (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import numpy as np
+import scipy.integrate
+
+from .types import Strategy, TargetStrategy
+
+MAX_SPANS = 1_000_000
+"""Limit zapisanych przedziałów śladu - dalsze wywołania są tylko liczone"""
+
+
+@dataclass
+class SimulationStats:
+    method: str
+    wall_time: float
+    """Czas całego przebiegu [s]"""
+    n_steps: int
+    nfev: int
+    rhs_calls: int
+    event_calls: int
+    target_calls: int
+    rejected_steps: int | None
+    """Odrzucone kroki adaptacyjne; None, gdy solwer ich nie ujawnia (Radau, BDF, LSODA)"""
+    dynamics_time: float
+    """Czas w dynamics() bez ruchu celu [s]"""
+    target_time: float
+    """Czas w target_strategy.calculate_movement() [s]"""
+    event_time: float
+    """Czas w funkcjach zdarzeń - stop_condition() i common.events [s]"""
+    solver_time: float
+    """Reszta czasu przebiegu - narzut solwera [s]"""
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _InstrumentedTarget(TargetStrategy):
+    def __init__(self, inner: TargetStrategy, instrumentation: "Instrumentation"):
+        self._inner = inner
+        self._instrumentation = instrumentation
+        self.constant_velocity = inner.constant_velocity
+
+    def calculate_movement(self, t: float) -> np.ndarray:
+        start = time.perf_counter_ns()
+        try:
+            return self._inner.calculate_movement(t)
+        finally:
+            self._instrumentation._record("target", start)
+
+    @property
+    def closed_form(self) -> bool:
+        return self._inner.closed_form
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        return self._inner.velocity(t)
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        return self._inner.displacement(t)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class _InstrumentedStrategy(Strategy):
+    """
+    Pośrednik strategii. kernel_spec = None, więc integrate() nie wybiera skompilowanej pętli
+    czasowej, która omijałaby pomiar.
+    """
+
+    def __init__(self, inner: Strategy, instrumentation: "Instrumentation"):
+        self._inner = inner
+        self._instrumentation = instrumentation
+        self.integrator = inner.integrator
+        self.stop_condition = instrumentation.event(inner.stop_condition)  # type: ignore [method-assign]
+
+    def dynamics(self, t: float, y: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        start = time.perf_counter_ns()
+        try:
+            return self._inner.dynamics(t, y, out)
+        finally:
+            self._instrumentation._record("dynamics", start)
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        start = time.perf_counter_ns()
+        try:
+            return self._inner.dynamics_batch(t, Y)
+        finally:
+            self._instrumentation._record("dynamics", start)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class Instrumentation:
+    """
+    trace: Czy zapisywać przedziały czasu każdego wywołania (do write_chrome_trace)
+    callback: Wywoływany z SimulationStats po każdym przebiegu
+    json_log: Plik, do którego każdy przebieg dopisuje wiersz JSON ze statystykami
+    Jeden obiekt może mierzyć wiele przebiegów - statystyki zbierane są w runs.
+    """
+
+    def __init__(
+        self,
+        trace: bool = False,
+        callback: Callable[[SimulationStats], None] | None = None,
+        json_log: str | os.PathLike | None = None,
+        max_spans: int = MAX_SPANS,
+    ):
+        self.trace = trace
+        self.callback = callback
+        self.json_log = json_log
+        self.max_spans = max_spans
+        self.runs: list[SimulationStats] = []
+        self.spans: list[tuple[str, int, int, int]] = []
+        """(nazwa, początek [ns], czas trwania [ns], numer przebiegu)"""
+        self._reset()
+
+    def _reset(self) -> None:
+        self._calls = {"dynamics": 0, "event": 0, "target": 0}
+        self._time = {"dynamics": 0, "event": 0, "target": 0}
+        self._rejected: int | None = None
+
+    def _record(self, name: str, start: int) -> None:
+        duration = time.perf_counter_ns() - start
+        self._calls[name] += 1
+        self._time[name] += duration
+        if self.trace and len(self.spans) < self.max_spans:
+            self.spans.append((name, start, duration, len(self.runs)))
+
+    def event(self, event: Callable[[float, Any], float]) -> Callable[[float, Any], float]:
+        """Funkcja zdarzenia mierzona jak stop_condition() - z tymi samymi atrybutami terminal i direction."""
+
+        def timed(t: float, y: Any) -> float:
+            start = time.perf_counter_ns()
+            try:
+                return event(t, y)
+            finally:
+                self._record("event", start)
+
+        timed.terminal = getattr(event, "terminal", False)  # type: ignore [attr-defined]
+        timed.direction = getattr(event, "direction", 0)  # type: ignore [attr-defined]
+        return timed
+
+    def solver(self, method: str) -> str | type:
+        """
+        Metoda dla solve_ivp: dla jawnych metod Rungego-Kutty podklasa solwera licząca odrzucone kroki
+        (każda próba kroku to n_stages wywołań prawej strony), dla pozostałych - nazwa bez zmian.
+        """
+        base = getattr(scipy.integrate, method, None)
+        if base is None or not hasattr(base, "n_stages"):
+            return method
+        instrumentation = self
+        self._rejected = 0
+
+        class CountingSolver(base):  # type: ignore [valid-type, misc]
+            def _step_impl(self) -> tuple[bool, str | None]:
+                nfev = self.nfev
+                result = super()._step_impl()
+                attempts = (self.nfev - nfev) // self.n_stages
+                instrumentation._rejected += max(attempts - 1, 0)  # type: ignore [operator]
+                return result
+
+        CountingSolver.__name__ = base.__name__
+        return CountingSolver
+
+    def run(self, simulate: Callable[[Strategy], Any], strategy: Strategy, method: str) -> Any:
+        """Uruchamia simulate(strategia_opakowana) i zapisuje statystyki przebiegu. Zwraca wynik simulate."""
+        self._reset()
+        instrumented = _InstrumentedStrategy(strategy, self)
+        target = getattr(strategy, "target_strategy", None)
+        if isinstance(target, TargetStrategy):
+            strategy.target_strategy = _InstrumentedTarget(target, self)  # type: ignore [attr-defined]
+        start = time.perf_counter_ns()
+        try:
+            solution = simulate(instrumented)
+        finally:
+            wall = time.perf_counter_ns() - start
+            if isinstance(target, TargetStrategy):
+                strategy.target_strategy = target  # type: ignore [attr-defined]
+        if self.trace and len(self.spans) < self.max_spans:
+            self.spans.append(("simulation", start, wall, len(self.runs)))
+
+        rejected = solution.get("n_rejected", self._rejected)
+        stats = SimulationStats(
+            method=method,
+            wall_time=wall * 1e-9,
+            n_steps=len(solution.t) - 1,
+            nfev=int(solution.nfev),
+            rhs_calls=self._calls["dynamics"],
+            event_calls=self._calls["event"],
+            target_calls=self._calls["target"],
+            rejected_steps=None if rejected is None else int(rejected),
+            # Ruch celu liczony jest wewnątrz dynamics()
+            dynamics_time=max(self._time["dynamics"] - self._time["target"], 0) * 1e-9,
+            target_time=self._time["target"] * 1e-9,
+            event_time=self._time["event"] * 1e-9,
+            solver_time=max(wall - self._time["dynamics"] - self._time["event"], 0) * 1e-9,
+        )
+        self.runs.append(stats)
+        if self.json_log is not None:
+            with open(self.json_log, "a") as f:
+                f.write(json.dumps(stats.to_dict()) + "\n")
+        if self.callback is not None:
+            self.callback(stats)
+        return solution
+
+    def write_chrome_trace(self, path: str | os.PathLike) -> None:
+        """Zapis przedziałów (trace=True) w formacie Chrome Trace Event - wątek to numer przebiegu."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": "simulation" if name == "simulation" else "strategy",
+                "ph": "X",
+                "ts": start / 1e3,
+                "dur": duration / 1e3,
+                "pid": pid,
+                "tid": run,
+            }
+            for name, start, duration, run in self.spans
+        ]
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": run, "args": {"name": f"{stats.method} #{run}"}}
+            for run, stats in enumerate(self.runs)
+        )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
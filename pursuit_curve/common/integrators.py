@@ -0,0 +1,520 @@
+import math
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.interpolate import CubicHermiteSpline
+from scipy.optimize import OptimizeResult, brentq
+
+from .backend import KernelSpec, numba_enabled
+from .events import EventFn, simulation_events
+from .types import Strategy
+
+RHS = Callable[[float, NDArray[np.float64]], NDArray[np.float64]]
+InPlaceRHS = Callable[..., NDArray[np.float64]]
+
+# Tablica Butchera metody Dormanda-Prince'a 5(4)
+DOPRI_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+DOPRI_A = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+]
+DOPRI_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# Różnica wag rzędu 5 i 4 (ostatnia waga dotyczy f(t + h, y_new) - FSAL)
+DOPRI_E = np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+DOPRI_ORDER = 5
+
+
+def euler_step(fun: RHS, t: float, y: NDArray[np.float64], h: float) -> NDArray[np.float64]:
+    """Jawny krok Eulera. y może mieć dowolny kształt (stan w osi 0)."""
+    return y + h * fun(t, y)
+
+
+def rk4_step(fun: RHS, t: float, y: NDArray[np.float64], h: float) -> NDArray[np.float64]:
+    """Klasyczny krok Rungego-Kutty 4. rzędu."""
+    k1 = fun(t, y)
+    k2 = fun(t + h / 2, y + h / 2 * k1)
+    k3 = fun(t + h / 2, y + h / 2 * k2)
+    k4 = fun(t + h, y + h * k3)
+    return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def dopri5_step(
+    fun: RHS, t: float, y: NDArray[np.float64], h: float, f: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Krok Dormanda-Prince'a 5(4).
+    f - pochodna w (t, y) (z poprzedniego kroku - FSAL)
+    Zwraca (y_new, f_new, błąd lokalny) - wszystkie o kształcie y.
+    """
+    K = np.empty((7, *y.shape))
+    K[0] = f
+    for s in range(1, 6):
+        dy = np.tensordot(DOPRI_A[s], K[:s], axes=1) * h
+        K[s] = fun(t + DOPRI_C[s] * h, y + dy)
+    y_new = y + h * np.tensordot(DOPRI_B, K[:6], axes=1)
+    f_new = fun(t + h, y_new)
+    K[6] = f_new
+    error = h * np.tensordot(DOPRI_E, K, axes=1)
+    return y_new, f_new, error
+
+
+def error_norm(
+    error: NDArray[np.float64], y: NDArray[np.float64], y_new: NDArray[np.float64], rtol: float, atol: float
+) -> NDArray[np.float64]:
+    """Norma RMS błędu względem tolerancji, liczona po osi stanu (oś 0)."""
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return np.sqrt(np.mean((error / scale) ** 2, axis=0))
+
+
+def step_factor(err: float) -> float:
+    """Współczynnik zmiany kroku dla błędu err (jak w scipy: 0.2 <= factor <= 10)."""
+    if err == 0:
+        return 10.0
+    return min(10.0, max(0.2, 0.9 * err ** (-1 / DOPRI_ORDER)))
+
+
+class EulerStepper:
+    """Jawna metoda Eulera na buforach przydzielonych raz na całe całkowanie."""
+
+    adaptive = False
+    stages = 1
+
+    def __init__(self, fun: InPlaceRHS, n: int):
+        self.fun = fun
+
+    def step(self, t: float, y: NDArray, f: NDArray, h: float, y_new: NDArray, f_new: NDArray) -> float:
+        np.multiply(f, h, out=y_new)
+        y_new += y
+        self.fun(t + h, y_new, out=f_new)
+        return 0.0
+
+
+class RK4Stepper:
+    """Klasyczna metoda RK4. f_new z końca kroku jest k1 następnego kroku."""
+
+    adaptive = False
+    stages = 4
+
+    def __init__(self, fun: InPlaceRHS, n: int):
+        self.fun = fun
+        self.K = np.empty((3, n))
+        self.tmp = np.empty(n)
+
+    def step(self, t: float, y: NDArray, f: NDArray, h: float, y_new: NDArray, f_new: NDArray) -> float:
+        k2, k3, k4 = self.K
+        tmp = self.tmp
+        np.multiply(f, h / 2, out=tmp)
+        tmp += y
+        self.fun(t + h / 2, tmp, out=k2)
+        np.multiply(k2, h / 2, out=tmp)
+        tmp += y
+        self.fun(t + h / 2, tmp, out=k3)
+        np.multiply(k3, h, out=tmp)
+        tmp += y
+        self.fun(t + h, tmp, out=k4)
+
+        np.add(k2, k3, out=tmp)
+        tmp *= 2
+        tmp += f
+        tmp += k4
+        np.multiply(tmp, h / 6, out=y_new)
+        y_new += y
+        self.fun(t + h, y_new, out=f_new)
+        return 0.0
+
+
+class DormandPrinceStepper:
+    """Metoda Dormanda-Prince'a 5(4) z oszacowaniem błędu. Zwraca normę błędu względem tolerancji."""
+
+    adaptive = True
+    stages = 6
+
+    def __init__(self, fun: InPlaceRHS, n: int, rtol: float = 1e-3, atol: float = 1e-6):
+        self.fun = fun
+        self.rtol = rtol
+        self.atol = atol
+        self.K = np.empty((7, n))
+        self.tmp = np.empty(n)
+
+    def step(self, t: float, y: NDArray, f: NDArray, h: float, y_new: NDArray, f_new: NDArray) -> float:
+        K = self.K
+        K[0] = f
+        for s in range(1, 6):
+            np.dot(DOPRI_A[s], K[:s], out=self.tmp)
+            self.tmp *= h
+            self.tmp += y
+            self.fun(t + DOPRI_C[s] * h, self.tmp, out=K[s])
+        np.dot(DOPRI_B, K[:6], out=y_new)
+        y_new *= h
+        y_new += y
+        self.fun(t + h, y_new, out=K[6])
+        f_new[:] = K[6]
+
+        np.dot(DOPRI_E, K, out=self.tmp)
+        self.tmp *= h
+        scale = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+        self.tmp /= scale
+        return math.sqrt(np.dot(self.tmp, self.tmp) / self.tmp.size)
+
+
+STEPPERS = {"euler": EulerStepper, "rk4": RK4Stepper, "dopri5": DormandPrinceStepper}
+
+
+class TrajectoryBuffer:
+    """
+    Rosnące bufory (t, y, f) - podwajanie pojemności zamiast list małych tablic.
+    derivatives=False - bez bufora f (niepotrzebny, gdy nie powstaje interpolant)
+    """
+
+    def __init__(self, n: int, capacity: int, derivatives: bool = True):
+        self.size = 0
+        self.t = np.empty(capacity)
+        self.y = np.empty((capacity, n))
+        self.f = np.empty((capacity, n)) if derivatives else None
+
+    def append(self, t: float, y: NDArray, f: NDArray) -> None:
+        if self.size == len(self.t):
+            capacity = 2 * len(self.t)
+            self.t = np.resize(self.t, capacity)
+            self.y = np.resize(self.y, (capacity, self.y.shape[1]))
+            if self.f is not None:
+                self.f = np.resize(self.f, (capacity, self.f.shape[1]))
+        self.t[self.size] = t
+        self.y[self.size] = y
+        if self.f is not None:
+            self.f[self.size] = f
+        self.size += 1
+
+
+class HermiteDenseOutput:
+    """Interpolant kubiczny Hermite'a po węzłach kroków. Zwraca (n,) lub (n, len(t)) - jak OdeSolution."""
+
+    def __init__(self, t: NDArray, y: NDArray, f: NDArray):
+        self.spline = CubicHermiteSpline(t, y, f, axis=0) if len(t) > 1 else None
+        self.y0 = y[0]
+
+    def __call__(self, t: float | NDArray) -> NDArray:
+        if self.spline is None:
+            return np.multiply.outer(self.y0, np.ones_like(t))
+        return self.spline(t).T
+
+
+def _hermite(t0: float, y0: NDArray, f0: NDArray, t1: float, y1: NDArray, f1: NDArray, t: float) -> NDArray:
+    h = t1 - t0
+    s = (t - t0) / h
+    h00 = (1 + 2 * s) * (1 - s) ** 2
+    h10 = s * (1 - s) ** 2
+    h01 = s * s * (3 - 2 * s)
+    h11 = s * s * (s - 1)
+    return h00 * y0 + h10 * h * f0 + h01 * y1 + h11 * h * f1
+
+
+class StepStream:
+    """
+    Zaakceptowane kroki integratora jako strumień (t, y, f) - bez przechowywania trajektorii.
+
+    Iteracja zwraca najpierw stan początkowy, potem stan po każdym kroku, a przy zdarzeniu terminalnym
+    stan w chwili zdarzenia jako ostatni element. y i f to bufory wielokrotnego użytku - konsument
+    musi je skopiować, jeśli chce je zachować. Po wyczerpaniu iteratora dostępne są nfev, n_rejected,
+    status, message, t_events i y_events (listy chwil i stanów, po jednej na zdarzenie).
+
+    events: Zdarzenia (common.events); domyślnie simulation_events(strategy) - samo złapanie celu
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        initial_state: list[float],
+        t_span: tuple[float, float],
+        method: str = "rk4",
+        max_step: float = 0.1,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+        events: Sequence[EventFn] | None = None,
+    ):
+        if method not in STEPPERS:
+            raise ValueError(f"Nieznany integrator: {method}")
+        self.strategy = strategy
+        self.events = simulation_events(strategy) if events is None else list(events)
+        self.initial_state = np.array(strategy.augment_state(initial_state), dtype=np.float64)
+        self.t_span = t_span
+        self.method = method
+        self.max_step = max_step
+        self.rtol = rtol
+        self.atol = atol
+
+        self.nfev = 0
+        self.n_steps = 0
+        self.n_rejected = 0
+        self.status = 0
+        self.message = ""
+        self.t_events: list[list[float]] = [[] for _ in self.events]
+        self.y_events: list[list[NDArray]] = [[] for _ in self.events]
+
+    def __iter__(self) -> Iterator[tuple[float, NDArray[np.float64], NDArray[np.float64]]]:
+        strategy = self.strategy
+        t0, t1 = self.t_span
+        max_step = self.max_step
+        y = self.initial_state.copy()
+        n = y.size
+        stepper = STEPPERS[self.method](strategy.dynamics, n)
+        if stepper.adaptive:
+            stepper.rtol, stepper.atol = self.rtol, self.atol
+
+        f = strategy.dynamics(t0, y, out=np.empty(n))
+        self.nfev = 1
+        yield t0, y, f
+
+        events = self.events
+        terminal = [getattr(event, "terminal", False) for event in events]
+        direction = [getattr(event, "direction", 0) for event in events]
+        g = [event(t0, y) for event in events]
+
+        y_new = np.empty(n)
+        f_new = np.empty(n)
+        t = t0
+        h = max_step
+        self.status = 0
+        self.message = "The solver successfully reached the end of the integration interval."
+
+        while t < t1:
+            h = min(h, max_step, t1 - t)
+            if stepper.adaptive and h < 10 * np.finfo(float).eps * max(abs(t), 1.0):
+                self.status = -1
+                self.message = "Required step size is less than spacing between numbers."
+                return
+
+            err = stepper.step(t, y, f, h, y_new, f_new)
+            self.nfev += stepper.stages
+            if err > 1:
+                self.n_rejected += 1
+                h *= step_factor(err)
+                continue
+
+            # Dla stałego kroku liczymy czas od t0, żeby nie kumulować błędu zaokrągleń
+            t_new = t + h if stepper.adaptive else min(t0 + (self.n_steps + 1) * max_step, t1)
+            g_new = [event(t_new, y_new) for event in events]
+            found = []
+            for i, event in enumerate(events):
+                before, after = g[i], g_new[i]
+                crossed = (before > 0 >= after and direction[i] <= 0) or (before < 0 <= after and direction[i] >= 0)
+                if crossed and before != after:
+                    t_ev = brentq(lambda s: event(s, _hermite(t, y, f, t_new, y_new, f_new, s)), t, t_new)
+                    found.append((t_ev, i))
+
+            # Zdarzenia po pierwszym terminalnym w tym kroku już nie zachodzą
+            for t_ev, i in sorted(found):
+                y_ev = _hermite(t, y, f, t_new, y_new, f_new, t_ev)
+                self.t_events[i].append(t_ev)
+                self.y_events[i].append(y_ev)
+                if terminal[i]:
+                    self.status = 1
+                    self.message = "A termination event occurred."
+                    # Pierwiastek w granicy tolerancji brentq od początku kroku - ten stan już zwrócono
+                    if t_ev > t:
+                        f_ev = strategy.dynamics(t_ev, y_ev)
+                        self.nfev += 1
+                        yield t_ev, y_ev, f_ev
+                    return
+
+            t = t_new
+            y, y_new = y_new, y
+            f, f_new = f_new, f
+            g = g_new
+            self.n_steps += 1
+            yield t, y, f
+            if stepper.adaptive:
+                h *= step_factor(err)
+
+
+class StepperSolver:
+    """
+    Integrator z STEPPERS z interfejsem scipy.integrate.OdeSolver: step(), dense_output() oraz pola t, y, f,
+    t_old, t_bound, status i nfev. Kroki jak w StepStream; t_bound można zmieniać między krokami.
+    y i f to bufory wymieniane przy każdym kroku - tak jak w StepStream trzeba je skopiować.
+    """
+
+    def __init__(
+        self,
+        fun: InPlaceRHS,
+        t0: float,
+        y0: NDArray[np.float64],
+        t_bound: float,
+        method: str = "rk4",
+        max_step: float = 0.1,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ):
+        if method not in STEPPERS:
+            raise ValueError(f"Nieznany integrator: {method}")
+        n = len(y0)
+        self.stepper = STEPPERS[method](fun, n)
+        if self.stepper.adaptive:
+            self.stepper.rtol, self.stepper.atol = rtol, atol
+        self.t = self.t_old = t0
+        self.y = np.array(y0, dtype=np.float64)
+        self.f = fun(t0, self.y, out=np.empty(n))
+        self.t_bound = t_bound
+        self.max_step = max_step
+        self.nfev = 1
+        self.n_steps = 0
+        self.n_rejected = 0
+        self.status = "running"
+        self._y_new = np.empty(n)
+        self._f_new = np.empty(n)
+        self._h = max_step
+        # Stały krok liczony od początku siatki (t_grid), żeby nie kumulować błędu zaokrągleń
+        self._t_grid = t0
+        self._grid_steps = 0
+
+    def step(self) -> str | None:
+        """Jeden zaakceptowany krok (odrzucone kroki dopri5 są powtarzane). Zwraca komunikat błędu albo None."""
+        if self.status != "running":
+            raise RuntimeError("Attempt to step on a failed or finished solver.")
+        stepper = self.stepper
+        t = self.t
+        while True:
+            h = min(self._h, self.max_step, self.t_bound - t)
+            if stepper.adaptive and h < 10 * np.finfo(float).eps * max(abs(t), 1.0):
+                self.status = "failed"
+                return "Required step size is less than spacing between numbers."
+            err = stepper.step(t, self.y, self.f, h, self._y_new, self._f_new)
+            self.nfev += stepper.stages
+            if err <= 1:
+                break
+            self.n_rejected += 1
+            self._h = h * step_factor(err)
+
+        if stepper.adaptive:
+            t_new = t + h
+            self._h = h * step_factor(err)
+        else:
+            t_new = min(self._t_grid + (self._grid_steps + 1) * self.max_step, self.t_bound)
+            self._grid_steps += 1
+        if t_new >= self.t_bound:
+            self.status = "finished"
+            # Po przesunięciu t_bound siatka stałego kroku zaczyna się od końca poprzedniego horyzontu
+            self._t_grid, self._grid_steps = t_new, 0
+        self.t_old, self.t = t, t_new
+        self.y, self._y_new = self._y_new, self.y
+        self.f, self._f_new = self._f_new, self.f
+        self.n_steps += 1
+        return None
+
+    def dense_output(self) -> Callable[[float], NDArray[np.float64]]:
+        """Interpolant Hermite'a ostatniego kroku [t_old, t]."""
+        t_old, y_old, f_old = self.t_old, self._y_new.copy(), self._f_new.copy()
+        t, y, f = self.t, self.y.copy(), self.f.copy()
+        return lambda s: _hermite(t_old, y_old, f_old, t, y, f, s)
+
+
+def integrate(
+    strategy: Strategy,
+    initial_state: list[float],
+    t_span: tuple[float, float],
+    method: str = "rk4",
+    max_step: float = 0.1,
+    rtol: float = 1e-3,
+    atol: float = 1e-6,
+    dense_output: bool = True,
+    events: Sequence[EventFn] | None = None,
+) -> OptimizeResult:
+    """
+    Całkuje strategię własną pętlą czasową zamiast solve_ivp.
+
+    method: "euler", "rk4" (stały krok max_step) lub "dopri5" (adaptacyjny, krok <= max_step)
+    dense_output: Czy zbudować interpolant sol (HermiteDenseOutput) - jego współczynniki zajmują
+                  ok. 4 razy więcej pamięci niż sama trajektoria; bez niego sol to None
+    Pochodne liczone są przez strategy.dynamics(t, y, out=...) do buforów przydzielonych raz,
+    trajektoria trafia do prealokowanych tablic. Zdarzenia events (jak w StepStream, domyślnie
+    złapanie celu) lokalizowane są na interpolancie Hermite'a kroku.
+    Zwraca wynik z polami jak OdeResult solve_ivp (t, y, sol, t_events, y_events, nfev, status, ...).
+    """
+    if method not in STEPPERS:
+        raise ValueError(f"Nieznany integrator: {method}")
+
+    spec = strategy.kernel_spec
+    if numba_enabled() and spec is not None and spec.autonomous and events is None:
+        return _integrate_compiled(spec, initial_state, t_span, method, max_step, rtol, atol, dense_output)
+
+    t0, t1 = t_span
+    stream = StepStream(strategy, initial_state, t_span, method, max_step, rtol, atol, events)
+    n = stream.initial_state.size
+    buffer = TrajectoryBuffer(n, int(math.ceil((t1 - t0) / max_step)) + 2, derivatives=dense_output)
+    for t, y, f in stream:
+        buffer.append(t, y, f)
+
+    size = buffer.size
+    ts, ys = buffer.t[:size], buffer.y[:size]
+    return OptimizeResult(
+        t=ts,
+        y=ys.T,
+        sol=HermiteDenseOutput(ts, ys, buffer.f[:size]) if buffer.f is not None else None,
+        t_events=[np.array(times) for times in stream.t_events],
+        y_events=[np.array(states).reshape(-1, n) for states in stream.y_events],
+        nfev=stream.nfev,
+        n_rejected=stream.n_rejected,
+        njev=0,
+        nlu=0,
+        status=stream.status,
+        message=stream.message,
+        success=stream.status >= 0,
+    )
+
+
+METHOD_CODES = {"euler": 0, "rk4": 1, "dopri5": 2}
+
+
+def _integrate_compiled(
+    spec: KernelSpec,
+    initial_state: list[float],
+    t_span: tuple[float, float],
+    method: str,
+    max_step: float,
+    rtol: float,
+    atol: float,
+    dense_output: bool = True,
+) -> OptimizeResult:
+    """Cała pętla czasowa w kernelu numba (kernels.integrate_loop) - tylko dla strategii autonomicznych."""
+    from .kernels import integrate_loop
+
+    t0, t1 = t_span
+    y0 = np.array(initial_state, dtype=np.float64)
+    ts, ys, fs, t_event, nfev = integrate_loop.compiled(
+        spec.kernel.compiled,
+        spec.stop.compiled,
+        y0,
+        float(t0),
+        float(t1),
+        float(max_step),
+        spec.params,
+        spec.stop_params,
+        METHOD_CODES[method],
+        float(rtol),
+        float(atol),
+    )
+    captured = not math.isnan(t_event)
+    if captured:
+        status, message = 1, "A termination event occurred."
+    elif ts[-1] < t1:
+        status, message = -1, "Required step size is less than spacing between numbers."
+    else:
+        status, message = 0, "The solver successfully reached the end of the integration interval."
+    return OptimizeResult(
+        t=ts,
+        y=ys.T,
+        sol=HermiteDenseOutput(ts, ys, fs) if dense_output else None,
+        t_events=[np.array([t_event]) if captured else np.empty(0)],
+        y_events=[ys[-1:].copy() if captured else np.empty((0, y0.size))],
+        nfev=nfev,
+        njev=0,
+        nlu=0,
+        status=status,
+        message=message,
+        success=status >= 0,
+    )
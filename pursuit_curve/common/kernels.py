@@ -0,0 +1,303 @@
+"""
+Kernele dynamiki i pętle całkowania dla backendu numba.
+
+Każdy kernel ma sygnaturę kernel(t, y, params, out) -> out, a kernel zatrzymania stop(y, params) -> float,
+gdzie params to płaska tablica float64 z parametrami strategii. Dzięki jednolitej sygnaturze pętle
+całkowania przyjmują kernel jako argument i w całości kompilują się do kodu maszynowego.
+Kod pisany jest pętlami po elementach - tak, jak lubi go numba.
+"""
+
+import math
+
+import numpy as np
+
+from .backend import kernel
+from .integrators import DOPRI_B, DOPRI_C, DOPRI_E
+
+# Macierz współczynników a_ij Dormanda-Prince'a jako jedna tablica (numba nie obsługuje list tablic)
+DOPRI_A_MATRIX = np.array(
+    [
+        [0.0, 0.0, 0.0, 0.0, 0.0],
+        [1 / 5, 0.0, 0.0, 0.0, 0.0],
+        [3 / 40, 9 / 40, 0.0, 0.0, 0.0],
+        [44 / 45, -56 / 15, 32 / 9, 0.0, 0.0],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0.0],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    ]
+)
+
+
+@kernel
+def direct_pursuit(t, y, params, out):
+    """y = [pursuer(n), target(n)], params = [prędkość(n), prędkość celu(n)]"""
+    n = y.shape[0] // 2
+    dist2 = 0.0
+    for i in range(n):
+        d = y[n + i] - y[i]
+        dist2 += d * d
+    distance = math.sqrt(dist2)
+    for i in range(n):
+        if distance < 1e-6:
+            out[i] = 0.0
+        else:
+            out[i] = params[i] * (y[n + i] - y[i]) / distance
+        out[n + i] = params[n + i]
+    return out
+
+
+@kernel
+def direct_pursuit_stop(y, params):
+    """params = [promień złapania]"""
+    n = y.shape[0] // 2
+    dist2 = 0.0
+    for i in range(n):
+        d = y[n + i] - y[i]
+        dist2 += d * d
+    return math.sqrt(dist2) - params[0]
+
+
+@kernel
+def cyclic_pursuit(t, y, params, out):
+    """y = [x_0, y_0, ..., x_{n-1}, y_{n-1}], params = [v_x, v_y]"""
+    n = y.shape[0] // 2
+    min_dist = np.inf
+    for i in range(n):
+        j = (i + 1) % n
+        d = math.hypot(y[2 * j] - y[2 * i], y[2 * j + 1] - y[2 * i + 1])
+        min_dist = min(min_dist, d)
+    for i in range(n):
+        j = (i + 1) % n
+        dx = y[2 * j] - y[2 * i]
+        dy = y[2 * j + 1] - y[2 * i + 1]
+        if min_dist < 1e-6:
+            out[2 * i] = 0.0
+            out[2 * i + 1] = 0.0
+        else:
+            d = math.hypot(dx, dy)
+            out[2 * i] = params[0] * dx / d
+            out[2 * i + 1] = params[1] * dy / d
+    return out
+
+
+@kernel
+def cyclic_pursuit_stop(y, params):
+    n = y.shape[0] // 2
+    min_dist = np.inf
+    for i in range(n):
+        j = (i + 1) % n
+        min_dist = min(min_dist, math.hypot(y[2 * j] - y[2 * i], y[2 * j + 1] - y[2 * i + 1]))
+    return min_dist - params[0]
+
+
+@kernel
+def sphere_pursuit(t, y, params, out):
+    """y = [r_p, theta_p, phi_p, r_t, theta_t, phi_t], params = [vel, dr, dtheta, dphi]"""
+    r_p, theta_p, phi_p, r_t, theta_t, phi_t = y[0], y[1], y[2], y[3], y[4], y[5]
+    sin_theta, cos_theta = math.sin(theta_p), math.cos(theta_p)
+    sin_phi, cos_phi = math.sin(phi_p), math.cos(phi_p)
+    p_x, p_y, p_z = r_p * cos_theta * cos_phi, r_p * cos_theta * sin_phi, r_p * sin_theta
+    cos_theta_t = math.cos(theta_t)
+    d_x = r_t * cos_theta_t * math.cos(phi_t) - p_x
+    d_y = r_t * cos_theta_t * math.sin(phi_t) - p_y
+    d_z = r_t * math.sin(theta_t) - p_z
+
+    radial_comp = (d_x * p_x + d_y * p_y + d_z * p_z) / (r_p * r_p)
+    d_x -= radial_comp * p_x
+    d_y -= radial_comp * p_y
+    d_z -= radial_comp * p_z
+    norm = math.sqrt(d_x * d_x + d_y * d_y + d_z * d_z)
+    if norm < 1e-6:
+        out[0] = out[1] = out[2] = 0.0
+    else:
+        scale = params[0] / norm
+        vx, vy, vz = d_x * scale, d_y * scale, d_z * scale
+        out[0] = cos_theta * cos_phi * vx + cos_theta * sin_phi * vy + sin_theta * vz
+        out[1] = (-sin_theta * cos_phi * vx - sin_theta * sin_phi * vy + cos_theta * vz) / r_p
+        if abs(sin_theta) < 1e-6:
+            out[2] = 0.0
+        else:
+            out[2] = (-sin_phi * vx + cos_phi * vy) / (r_p * cos_theta)
+    out[3] = params[1]
+    out[4] = params[2]
+    out[5] = params[3]
+    return out
+
+
+@kernel
+def sphere_pursuit_stop(y, params):
+    """Odległość kątowa po wielkim okręgu minus params[0]"""
+    theta_p, phi_p, theta_t, phi_t = y[1], y[2], y[4], y[5]
+    cos_dist = math.sin(theta_p) * math.sin(theta_t) + math.cos(theta_p) * math.cos(theta_t) * math.cos(phi_t - phi_p)
+    return math.acos(min(1.0, max(-1.0, cos_dist))) - params[0]
+
+
+@kernel
+def torus_pursuit(t, y, params, out):
+    """y = [u_p, v_p, u_t, v_t], params = [vel, R, r, omega_u, omega_v]"""
+    vel, R, r = params[0], params[1], params[2]
+    # Najkrótsza różnica kątów w [-pi, pi] (math.remainder nie jest wspierane przez numba)
+    delta_u = y[2] - y[0]
+    delta_u -= 2 * math.pi * math.floor(delta_u / (2 * math.pi) + 0.5)
+    delta_v = y[3] - y[1]
+    delta_v -= 2 * math.pi * math.floor(delta_v / (2 * math.pi) + 0.5)
+    u_scale = R + r * math.cos(y[1])
+    d_u = u_scale * delta_u
+    d_v = r * delta_v
+    norm = math.hypot(d_u, d_v)
+    if norm < 1e-6:
+        out[0] = out[1] = 0.0
+    else:
+        out[0] = vel * d_u / norm / u_scale
+        out[1] = vel * d_v / norm / r
+    out[2] = params[3]
+    out[3] = params[4]
+    return out
+
+
+@kernel
+def torus_pursuit_stop(y, params):
+    """params = [R, r, promień złapania]"""
+    R, r = params[0], params[1]
+    # Najkrótsza różnica kątów w [-pi, pi] (math.remainder nie jest wspierane przez numba)
+    delta_u = y[2] - y[0]
+    delta_u -= 2 * math.pi * math.floor(delta_u / (2 * math.pi) + 0.5)
+    delta_v = y[3] - y[1]
+    delta_v -= 2 * math.pi * math.floor(delta_v / (2 * math.pi) + 0.5)
+    return math.hypot((R + r * math.cos(y[1])) * delta_u, r * delta_v) - params[2]
+
+
+@kernel
+def integrate_loop(fun, stop, y0, t0, t1, max_step, params, stop_params, method, rtol, atol):
+    """
+    Cała pętla całkowania w jednym kernelu.
+    method: 0 - Euler, 1 - RK4, 2 - Dormand-Prince 5(4) (krok adaptacyjny <= max_step)
+    Zdarzenie zatrzymania (przejście stop z + na -) lokalizowane bisekcją na interpolancie Hermite'a.
+    Zwraca (T, Y, F, t_event, nfev); t_event = NaN gdy nie było złapania.
+    """
+    n = y0.shape[0]
+    capacity = int(math.ceil((t1 - t0) / max_step)) + 2
+    T = np.empty(capacity)
+    Y = np.empty((capacity, n))
+    F = np.empty((capacity, n))
+    K = np.empty((7, n))
+    tmp = np.empty(n)
+    y_new = np.empty(n)
+    f_new = np.empty(n)
+
+    y = y0.copy()
+    f = np.empty(n)
+    fun(t0, y, params, f)
+    nfev = 1
+    T[0] = t0
+    Y[0] = y
+    F[0] = f
+    size = 1
+
+    t = t0
+    h = max_step
+    g = stop(y, stop_params)
+    t_event = np.nan
+    n_steps = 0
+
+    while t < t1:
+        h = min(h, max_step, t1 - t)
+        if method == 2 and h < 10 * 2.220446049250313e-16 * max(abs(t), 1.0):
+            break
+
+        err = 0.0
+        if method == 0:
+            for i in range(n):
+                y_new[i] = y[i] + h * f[i]
+        elif method == 1:
+            for i in range(n):
+                tmp[i] = y[i] + h / 2 * f[i]
+            fun(t + h / 2, tmp, params, K[1])
+            for i in range(n):
+                tmp[i] = y[i] + h / 2 * K[1][i]
+            fun(t + h / 2, tmp, params, K[2])
+            for i in range(n):
+                tmp[i] = y[i] + h * K[2][i]
+            fun(t + h, tmp, params, K[3])
+            for i in range(n):
+                y_new[i] = y[i] + h / 6 * (f[i] + 2 * K[1][i] + 2 * K[2][i] + K[3][i])
+            nfev += 3
+        else:
+            K[0] = f
+            for s in range(1, 6):
+                for i in range(n):
+                    acc = 0.0
+                    for j in range(s):
+                        acc += DOPRI_A_MATRIX[s, j] * K[j, i]
+                    tmp[i] = y[i] + h * acc
+                fun(t + DOPRI_C[s] * h, tmp, params, K[s])
+            for i in range(n):
+                acc = 0.0
+                for j in range(6):
+                    acc += DOPRI_B[j] * K[j, i]
+                y_new[i] = y[i] + h * acc
+            nfev += 5
+        fun(t + h, y_new, params, f_new)
+        nfev += 1
+
+        if method == 2:
+            err2 = 0.0
+            for i in range(n):
+                e = DOPRI_E[6] * f_new[i]
+                for j in range(6):
+                    e += DOPRI_E[j] * K[j, i]
+                scale = atol + rtol * max(abs(y[i]), abs(y_new[i]))
+                err2 += (h * e / scale) ** 2
+            err = math.sqrt(err2 / n)
+            if err > 1:
+                h *= max(0.2, 0.9 * err ** (-1 / 5))
+                continue
+
+        t_new = t + h if method == 2 else min(t0 + (n_steps + 1) * max_step, t1)
+        g_new = stop(y_new, stop_params)
+        if g > 0 and g_new <= 0:
+            h_step = t_new - t
+            lo, hi = 0.0, 1.0
+            for it in range(61):
+                # Ostatnia iteracja wylicza stan w znalezionym punkcie s = hi
+                s = 0.5 * (lo + hi) if it < 60 else hi
+                h00 = (1 + 2 * s) * (1 - s) ** 2
+                h10 = s * (1 - s) ** 2
+                h01 = s * s * (3 - 2 * s)
+                h11 = s * s * (s - 1)
+                for i in range(n):
+                    tmp[i] = h00 * y[i] + h10 * h_step * f[i] + h01 * y_new[i] + h11 * h_step * f_new[i]
+                if it < 60:
+                    if stop(tmp, stop_params) > 0:
+                        lo = s
+                    else:
+                        hi = s
+            t_event = t + hi * h_step
+            y_new[:] = tmp
+            fun(t_event, y_new, params, f_new)
+            nfev += 1
+            t_new = t_event
+
+        if size == T.shape[0]:
+            T2 = np.empty(2 * size)
+            Y2 = np.empty((2 * size, n))
+            F2 = np.empty((2 * size, n))
+            T2[:size] = T
+            Y2[:size] = Y
+            F2[:size] = F
+            T, Y, F = T2, Y2, F2
+        T[size] = t_new
+        Y[size] = y_new
+        F[size] = f_new
+        size += 1
+
+        t = t_new
+        y[:] = y_new
+        f[:] = f_new
+        g = g_new
+        n_steps += 1
+        if not math.isnan(t_event):
+            break
+        if method == 2:
+            h *= 10.0 if err == 0 else min(10.0, max(0.2, 0.9 * err ** (-1 / 5)))
+
+    return T[:size], Y[:size], F[:size], t_event, nfev
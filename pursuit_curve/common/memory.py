@@ -0,0 +1,199 @@
+"""
+Profil pamięci symulacji: szczyt RSS w trakcie przebiegu (próbkowany wątkiem co RSS_INTERVAL), szczyt
+alokacji w trakcie całkowania (tracemalloc) i rozbicie pamięci zatrzymanej przez wynik na składniki.
+
+Składniki wyniku:
+    trajectory - czasy i stany kroków (t, y) albo w trybie low_memory czasy i odległości
+    dense_output - interpolant sol (współczynniki OdeSolution / CubicHermiteSpline)
+    events - t_events, y_events i stan końcowy
+    solver - szczyt alokacji minus pamięć zatrzymana: bufory i stan solwera, tablice tymczasowe
+"""
+
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+RSS_INTERVAL = 0.001
+"""Odstęp próbkowania RSS w trakcie profilowanego przebiegu [s]"""
+
+COMPONENTS = {
+    "trajectory": ("t", "y", "distance"),
+    "dense_output": ("sol",),
+    "events": ("t_events", "y_events", "y_final"),
+}
+"""Składnik raportu -> pola wyniku, których tablice do niego należą"""
+
+
+def _rss_scale() -> int:
+    # ru_maxrss jest w kilobajtach na Linuksie, w bajtach na macOS
+    return 1 if sys.platform == "darwin" else 1024
+
+
+def current_rss() -> int | None:
+    """Bieżący RSS procesu w bajtach (z /proc); None, gdy niedostępny."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def process_peak_rss() -> int:
+    """Szczytowy RSS procesu od jego startu w bajtach - obejmuje też wcześniejsze przebiegi."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _rss_scale()
+
+
+class _RssSampler:
+    """Wątek zapamiętujący największy current_rss() do zatrzymania (stop)."""
+
+    def __init__(self, interval: float = RSS_INTERVAL):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        if self.peak is not None:
+            self._thread.start()
+
+    def stop(self) -> int | None:
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._sample()
+        return self.peak
+
+
+def array_bytes(obj: Any, seen: set[int] | None = None) -> int:
+    """
+    Łączny rozmiar tablic numpy osiągalnych z obj (kontenery, atrybuty obiektów). Widok liczony jest
+    jako cała tablica bazowa - trzyma ją w pamięci - a każda tablica tylko raz. Moduły i klasy są
+    pomijane (np. CubicHermiteSpline trzyma moduł numpy) - ich tablice nie należą do obiektu.
+    """
+    seen = set() if seen is None else seen
+    if isinstance(obj, np.ndarray):
+        while isinstance(obj.base, np.ndarray):
+            obj = obj.base
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return obj.nbytes
+    if id(obj) in seen or isinstance(obj, (str, bytes, int, float, complex, bool, type(None), types.ModuleType, type)):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, dict):
+        return sum(array_bytes(value, seen) for value in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sum(array_bytes(value, seen) for value in obj)
+    total = 0
+    if hasattr(obj, "__dict__"):
+        total += array_bytes(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        total += array_bytes(getattr(obj, slot, None), seen)
+    return total
+
+
+@dataclass
+class MemoryReport:
+    n_states: int
+    n_steps: int
+    peak_rss: int | None
+    """
+    Szczytowy RSS w trakcie symulacji [B] - próbkowany co RSS_INTERVAL, więc krótsze skoki mogą umknąć;
+    None, gdy bieżący RSS jest niedostępny (brak /proc)
+    """
+    process_peak_rss: int
+    """Szczytowy RSS procesu od jego startu [B] - także z wcześniejszych przebiegów"""
+    rss_before: int | None
+    """RSS przed symulacją [B]"""
+    traced_peak: int
+    """Szczyt alokacji w trakcie symulacji [B] (tracemalloc)"""
+    components: dict[str, int] = field(default_factory=dict)
+    """Składnik -> bajty (patrz opis modułu)"""
+
+    @property
+    def retained(self) -> int:
+        """Pamięć zatrzymana przez wynik [B]"""
+        return sum(size for name, size in self.components.items() if name != "solver")
+
+    @property
+    def bytes_per_step(self) -> float:
+        return self.retained / max(self.n_steps, 1)
+
+    def format(self) -> str:
+        mb = 1024 * 1024
+        lines = [
+            f"Profil pamięci: {self.n_states} stanów, {self.n_steps} kroków",
+        ]
+        if self.peak_rss is not None:
+            lines.append(f"  szczyt RSS przebiegu:  {self.peak_rss / mb:10.2f} MB")
+        lines.append(f"  szczyt RSS procesu:    {self.process_peak_rss / mb:10.2f} MB")
+        if self.rss_before is not None:
+            lines.append(f"  RSS przed symulacją:   {self.rss_before / mb:10.2f} MB")
+        lines.append(f"  szczyt alokacji:       {self.traced_peak / mb:10.2f} MB")
+        lines.extend(f"  {name + ':':<22} {size / mb:10.2f} MB" for name, size in self.components.items())
+        lines.append(f"  bajtów na krok:        {self.bytes_per_step:10.0f}")
+        return "\n".join(lines)
+
+
+def solution_components(solution: Any) -> dict[str, int]:
+    """Rozmiar składników wyniku (OdeResult lub wynik trybu low_memory) w bajtach."""
+    seen: set[int] = set()
+    return {
+        name: sum(array_bytes(solution.get(key), seen) for key in keys if key in solution)
+        for name, keys in COMPONENTS.items()
+    }
+
+
+def profile_memory(run: Callable[[], T]) -> tuple[T, MemoryReport]:
+    """
+    Uruchamia run() pod tracemalloc i zwraca (wynik, MemoryReport). Wynik musi mieć pola jak OdeResult
+    (t, y/distance, sol, ...). tracemalloc spowalnia alokacje, więc czasy z tego trybu nie są miarodajne.
+    """
+    rss_before = current_rss()
+    sampler = _RssSampler()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    sampler.start()
+    try:
+        solution = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        run_peak_rss = sampler.stop()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    components = solution_components(solution)
+    traced_peak = max(peak - start, 0)
+    components["solver"] = max(traced_peak - sum(components.values()), 0)
+    report = MemoryReport(
+        n_states=len(solution.y_final) if "y_final" in solution else solution.y.shape[0],
+        n_steps=len(solution.t) - 1,
+        peak_rss=run_peak_rss,
+        process_peak_rss=process_peak_rss(),
+        rss_before=rss_before,
+        traced_peak=traced_peak,
+        components=components,
+    )
+    return solution, report
@@ -0,0 +1,273 @@
+"""
+Symulacja przyrostowa: porcje zaakceptowanych kroków w trakcie całkowania zamiast jednego wyniku
+po całym t_span.
+
+ProgressiveSimulation wykonuje kroki solwera pojedynczo - scipy.integrate.OdeSolver.step() dla metod
+solve_ivp (RK45, DOP853, Radau, ...), a dla integratorów z STEPPERS ten sam interfejs daje
+integrators.StepperSolver. Co chunk_size kroków (albo co interval sekund) iteracja oddaje SimulationChunk
+z czasami, stanami i pochodnymi kroków oraz odległością ścigający-cel. Między porcjami wywołujący może:
+- przerwać całkowanie (break) na dowolnym własnym kryterium,
+- zmienić horyzont (t_end) - także po dojściu do końca: kolejna iteracja kontynuuje od ostatniego stanu,
+- przekazać porcję dalej: TrajectoryWriter.extend, MetricsAccumulator.update (układ (n_states, k)
+  jak OdeResult.y), podgląd na żywo.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Sequence
+
+import numpy as np
+import scipy.integrate
+from numpy.typing import NDArray
+from scipy.optimize import brentq
+
+from .backend import numba_enabled
+from .events import REUSE_METHODS, EventFn, simulation_events
+from .integrators import STEPPERS, StepperSolver
+from .types import Strategy
+
+CHUNK_SIZE = 256
+"""Domyślna liczba kroków w porcji"""
+
+DistanceFn = Callable[[NDArray[np.float64]], float]
+
+
+@dataclass
+class SimulationChunk:
+    """Kolejne kroki symulacji; pierwsza porcja zaczyna się od stanu początkowego."""
+
+    t: NDArray[np.float64]
+    """Czasy kroków (k,)"""
+    y: NDArray[np.float64]
+    """Stany (n_states, k)"""
+    f: NDArray[np.float64]
+    """Pochodne stanów (n_states, k)"""
+    distance: NDArray[np.float64]
+    """Odległość złapania w krokach (k,) - NaN, gdy strategia jej nie definiuje"""
+    min_distance: float
+    """Najmniejsza odległość od początku symulacji"""
+    t_min_distance: float
+    n_steps: int
+    """Zaakceptowane kroki od początku symulacji"""
+    nfev: int
+    done: bool
+    """
+    Ostatnia porcja iteracji - koniec horyzontu, zdarzenie terminalne albo błąd kroku. Pusta jest tylko
+    wtedy, gdy błąd kroku albo zdarzenie na samym początku kroku wypadły zaraz po poprzedniej porcji.
+    """
+    status: int
+    """Jak w OdeResult: 0 - koniec horyzontu (albo w toku), 1 - zdarzenie terminalne, -1 - błąd kroku"""
+
+
+def _solver_class(method: str) -> type | None:
+    solver = getattr(scipy.integrate, method, None)
+    if isinstance(solver, type) and issubclass(solver, scipy.integrate.OdeSolver):
+        return solver
+    return None
+
+
+class ProgressiveSimulation:
+    """
+    Iterowalna symulacja zwracająca porcje kroków (SimulationChunk).
+
+    initial_state: [pursuer_x, pursuer_y, ..., target_x, target_y, ...]
+    strategy: Strategia z metodami dynamics() i stop_condition()
+    t_span: Przedział czasu (t_start, t_end); t_end można później zmienić
+    max_step: Maksymalny krok solwera
+    method: Metoda solve_ivp ("RK45", "DOP853", ...) albo integrator z STEPPERS ("euler", "rk4", "dopri5");
+            domyślnie strategy.integrator, a gdy nie jest ustawiony - RK45
+    events: Dodatkowe zdarzenia jak w run_continuous_simulation - t_events[0] to złapanie celu
+    chunk_size: Liczba kroków w porcji
+    interval: Najdłuższy czas [s] między porcjami - dla podglądu na żywo; wtedy pierwsza porcja
+              oddawana jest zaraz po pierwszym kroku
+    distance: Odległość ze stanu (domyślnie strategy.capture_distance, jeśli strategia ją ma)
+    Po iteracji dostępne są t, y (ostatni stan), nfev, n_steps, status, message, t_events i y_events.
+    """
+
+    def __init__(
+        self,
+        initial_state: Any,
+        strategy: Strategy,
+        t_span: tuple[float, float] = (0, 50),
+        max_step: float = 0.1,
+        method: str | None = None,
+        events: Sequence[EventFn] = (),
+        chunk_size: int = CHUNK_SIZE,
+        interval: float | None = None,
+        distance: DistanceFn | None = None,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ):
+        method = method or strategy.integrator or "RK45"
+        solver_class = _solver_class(method)
+        if solver_class is None and method not in STEPPERS:
+            raise ValueError(f"Nieznany integrator: {method}")
+        if chunk_size < 1:
+            raise ValueError(f"Niepoprawny rozmiar porcji: {chunk_size}")
+        self.strategy = strategy
+        self.initial_state = np.array(strategy.augment_state(initial_state), dtype=np.float64)
+        self.method = method
+        self.max_step = max_step
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.rtol = rtol
+        self.atol = atol
+        reuse = method in REUSE_METHODS
+        self.events = simulation_events(strategy, events, reuse=reuse)
+        self._solver_class = solver_class
+        self._reuse = reuse and strategy.distance_cached and not numba_enabled()
+        if distance is None and type(strategy).capture_distance is not Strategy.capture_distance:
+            distance = strategy.capture_distance
+        self._distance = distance
+
+        self.t = float(t_span[0])
+        self.y = self.initial_state.copy()
+        self._t_end = float(t_span[1])
+        self._solver: Any = None
+        self._g: list[float] = []
+        self._extra_nfev = 0
+        self.n_steps = 0
+        self.min_distance = np.inf
+        self.t_min_distance = np.nan
+        self.status = 0
+        self.message = ""
+        self.t_events: list[list[float]] = [[] for _ in self.events]
+        self.y_events: list[list[NDArray[np.float64]]] = [[] for _ in self.events]
+
+    @property
+    def t_end(self) -> float:
+        """Horyzont całkowania - zmiana działa od następnego kroku."""
+        return self._t_end
+
+    @t_end.setter
+    def t_end(self, value: float) -> None:
+        value = float(value)
+        solver = self._solver
+        if solver is not None and self.method == "LSODA":
+            # LSODA zapamiętuje horyzont w stanie solwera Fortran przy konstrukcji
+            raise ValueError("Metoda LSODA nie pozwala zmienić horyzontu w trakcie całkowania")
+        self._t_end = value
+        if solver is not None and value > solver.t:
+            solver.t_bound = value
+            if solver.status == "finished":
+                solver.status = "running"
+
+    @property
+    def nfev(self) -> int:
+        return (self._solver.nfev if self._solver is not None else 0) + self._extra_nfev
+
+    def _derivative(self, t: float, y: NDArray[np.float64]) -> NDArray[np.float64]:
+        f = getattr(self._solver, "f", None)
+        if f is None:
+            # BDF i LSODA nie przechowują pochodnej w punkcie kroku
+            self._extra_nfev += 1
+            return self.strategy.dynamics(t, y)
+        return f
+
+    def _measure(self, t: float, y: NDArray[np.float64]) -> float:
+        distance = self.strategy.cached_distance(y) if self._reuse else None
+        if distance is None:
+            distance = self._distance(y) if self._distance is not None else np.nan
+        if distance < self.min_distance:
+            self.min_distance, self.t_min_distance = distance, t
+        return distance
+
+    def _start(self) -> None:
+        t0 = self.t
+        if self._solver_class is None:
+            self._solver = StepperSolver(
+                self.strategy.dynamics, t0, self.y, self._t_end, self.method, self.max_step, self.rtol, self.atol
+            )
+        else:
+            self._solver = self._solver_class(
+                self.strategy.dynamics, t0, self.y, self._t_end, max_step=self.max_step, rtol=self.rtol, atol=self.atol
+            )
+        self.y = self._solver.y
+        self._g = [event(t0, self.y) for event in self.events]
+
+    def __iter__(self) -> Iterator[SimulationChunk]:
+        if self.status != 0 or self.t >= self._t_end:
+            return
+        size = self.chunk_size
+        n = self.initial_state.size
+        ts, ys, fs, ds = np.empty(size + 2), np.empty((size + 2, n)), np.empty((size + 2, n)), np.empty(size + 2)
+        fill = 0
+
+        def record(t: float, y: NDArray[np.float64], f: NDArray[np.float64]) -> None:
+            nonlocal fill
+            ts[fill], ys[fill], fs[fill], ds[fill] = t, y, f, self._measure(t, y)
+            fill += 1
+
+        def chunk(done: bool) -> SimulationChunk:
+            nonlocal fill
+            count, fill = fill, 0
+            return SimulationChunk(
+                t=ts[:count].copy(),
+                y=ys[:count].T.copy(),
+                f=fs[:count].T.copy(),
+                distance=ds[:count].copy(),
+                min_distance=self.min_distance,
+                t_min_distance=self.t_min_distance,
+                n_steps=self.n_steps,
+                nfev=self.nfev,
+                done=done,
+                status=self.status,
+            )
+
+        if self._solver is None:
+            self._start()
+            record(self.t, self.y, self._derivative(self.t, self.y))
+        solver = self._solver
+        events = self.events
+        direction = [getattr(event, "direction", 0) for event in events]
+        terminal = [getattr(event, "terminal", False) for event in events]
+        interval = self.interval
+        # Przy interval pierwsza porcja zaraz po pierwszym kroku
+        last_yield = -np.inf if interval is not None and self.n_steps == 0 else time.monotonic()
+
+        while self.t < self._t_end:
+            message = solver.step()
+            if solver.status == "failed":
+                self.status, self.message = -1, message or "Integration step failed."
+                break
+            t_old, t, y = self.t, solver.t, solver.y
+            g_new = [event(t, y) for event in events]
+            found = []
+            for i, event in enumerate(events):
+                before, after = self._g[i], g_new[i]
+                crossed = (before > 0 >= after and direction[i] <= 0) or (before < 0 <= after and direction[i] >= 0)
+                if crossed and before != after:
+                    sol = solver.dense_output()
+                    found.append((brentq(lambda s: event(s, sol(s)), t_old, t), i, sol))
+            self._g = g_new
+            self.n_steps += 1
+
+            stop = False
+            # Zdarzenia po pierwszym terminalnym w tym kroku już nie zachodzą
+            for t_ev, i, sol in sorted(found, key=lambda item: item[:2]):
+                y_ev = sol(t_ev)
+                self.t_events[i].append(t_ev)
+                self.y_events[i].append(y_ev)
+                if terminal[i]:
+                    self.status, self.message = 1, "A termination event occurred."
+                    self.t, self.y = t_ev, y_ev
+                    if t_ev > t_old:
+                        self._extra_nfev += 1
+                        record(t_ev, y_ev, self.strategy.dynamics(t_ev, y_ev))
+                    stop = True
+                    break
+            if stop:
+                break
+
+            self.t, self.y = t, y
+            record(t, y, self._derivative(t, y))
+            if self.t >= self._t_end:
+                # Krok kończący horyzont trafia do ostatniej porcji (done=True), a nie do osobnej
+                break
+            if fill >= size or interval is not None and time.monotonic() - last_yield >= interval:
+                yield chunk(done=False)
+                last_yield = time.monotonic()
+
+        if self.status == 0:
+            self.message = "The solver successfully reached the end of the integration interval."
+        yield chunk(done=True)
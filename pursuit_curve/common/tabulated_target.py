@@ -0,0 +1,267 @@
+"""
+Cel poruszający się po zarejestrowanym śladzie (t, pozycja) zamiast po krzywej analitycznej.
+
+Ślad to tablica (K, 1 + dim) float64: kolumna 0 to rosnące chwile, kolejne - współrzędne celu
+w układzie strategii (x, y / x, y, z / N wymiarów / r, θ, φ na sferze / u, v na torusie). Z pliku
+.npy (np.save, np.lib.format.open_memmap przy zapisie porcjami) ślad jest mapowany w pamięć, więc
+nawet dziesiątki milionów próbek nie są wczytywane - czytane są tylko strony wokół szukanych chwil.
+
+Wyszukiwanie przedziału w trakcie całkowania używa kursora: kolejne wywołania trafiają zwykle w ten
+sam lub następny przedział (koszt zamortyzowany O(1)), a skok dalej to wyszukiwanie binarne
+bezpośrednio na memmap. Współczynniki wielomianu bieżącego przedziału są zapamiętywane.
+Poza zakresem śladu cel stoi w pierwszej / ostatniej pozycji.
+"""
+
+import bisect
+import os
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .types import TargetStrategy
+
+INTERPOLATIONS = ("linear", "cubic")
+_DERIVATIVE = np.array([[1.0], [2.0], [3.0]])
+
+
+def hermite_weights(t_prev: Any, t0: Any, t1: Any, t_next: Any, interpolation: str = "cubic") -> NDArray[np.float64]:
+    """
+    Macierz (..., 4, 4) przekształcająca próbki [p_prev, p0, p1, p_next] we współczynniki wielomianu
+    p(s) = c0 + c1 s + c2 s^2 + c3 s^3 przedziału [t0, t1], s = (t - t0) / (t1 - t0).
+    "cubic" - Hermite z pochodnymi w węzłach z różnic centralnych (p1 - p_prev) / (t1 - t_prev)
+    i (p_next - p0) / (t_next - t0) - przy t_prev = t0 / t_next = t1 różnice są jednostronne.
+    """
+    h = t1 - t0
+    scalar = np.ndim(h) == 0
+    # Dla jednego przedziału (kursor w trakcie całkowania) macierz budowana jest z liczb Pythona
+    zero: Any = 0.0 if scalar else np.zeros_like(h)
+    one = zero + 1.0
+    if interpolation == "linear":
+        rows = [[zero, one, zero, zero], [zero, -one, one, zero], [zero] * 4, [zero] * 4]
+    else:
+        a0 = h / (t1 - t_prev)
+        a1 = h / (t_next - t0)
+        rows = [
+            [zero, one, zero, zero],
+            [-a0, zero, a0, zero],
+            [2 * a0, a1 - 3, 3 - 2 * a0, -a1],
+            [-a0, 2 - a1, a0 - 2, a1],
+        ]
+    weights = np.array(rows)
+    return weights if scalar else np.moveaxis(weights, (0, 1), (-2, -1))
+
+
+class TabulatedTargetStrategy(TargetStrategy):
+    """
+    track: Ścieżka do pliku .npy (mapowanego w pamięć) albo tablica (K, 1 + dim)
+    interpolation: "cubic" (Hermite z pochodnymi z różnic centralnych - prędkość ciągła) lub "linear"
+    period: Okres współrzędnych kątowych - jedna wartość dla wszystkich albo po jednej (None - brak)
+            na współrzędną, np. (None, None, 2 * np.pi) dla (r, θ, φ) na sferze, 2 * np.pi dla torusa.
+            Przejście przez granicę okresu między próbkami jest interpolowane najkrótszą drogą
+            (pozycja jest wtedy ciągła modulo okres).
+    """
+
+    def __init__(
+        self,
+        track: str | os.PathLike | ArrayLike,
+        interpolation: str = "cubic",
+        period: float | Sequence[float | None] | None = None,
+    ):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Nieznana interpolacja: {interpolation}")
+        self.path = Path(track) if isinstance(track, (str, os.PathLike)) else None
+        self.interpolation = interpolation
+        self.period = period
+        self._open(track)
+
+    def _open(self, track: Any) -> None:
+        if self.path is not None:
+            data = np.load(self.path, mmap_mode="r")
+        else:
+            data = np.asarray(track)
+        if data.ndim != 2 or data.shape[0] < 2 or data.shape[1] < 2:
+            raise ValueError(f"Ślad musi mieć kształt (K >= 2, 1 + dim), a nie {data.shape}")
+        if data.dtype != np.float64:
+            raise ValueError(f"Ślad musi mieć typ float64, a nie {data.dtype}")
+        # Widok bez podklasy memmap - pojedyncze odczyty w wyszukiwaniu są kilka razy tańsze
+        self._track = np.asarray(data)
+        self._times = self._track[:, 0]
+        self.n_samples, self.dim = data.shape[0], data.shape[1] - 1
+        if self._times[1] <= self._times[0]:
+            raise ValueError("Chwile śladu muszą być rosnące")
+        self.t_start, self.t_end = float(self._times[0]), float(self._times[-1])
+
+        if self.period is None or np.ndim(self.period) == 0:
+            periods = [self.period] * self.dim
+        else:
+            periods = list(self.period)  # type: ignore [arg-type]
+        if len(periods) != self.dim:
+            raise ValueError(f"period ma {len(periods)} wartości dla {self.dim} współrzędnych")
+        self._periodic = np.array([p is not None for p in periods])
+        self._any_periodic = bool(self._periodic.any())
+        self._periods = np.array([p if p is not None else 0.0 for p in periods], dtype=np.float64)
+        self._first, self._last = np.array(data[0, 1:]), np.array(data[-1, 1:])
+        # Przedział kursora i współczynniki jego wielomianu: p(s) = c0 + c1 s + c2 s^2 + c3 s^3, s w [0, 1]
+        self._cursor = -1
+        self._interval = (np.inf, -np.inf, 1.0)
+        self._zero = np.zeros(self.dim)
+        self._coefficients = np.zeros((4, self.dim))
+        self._velocity_coefficients = np.zeros((3, self.dim))
+        self._origin = self.track_position(0.0)
+
+    def parameters(self) -> dict[str, Any]:
+        """Parametry bez zawartości śladu z pliku - zamiast niej rozmiar i czas modyfikacji pliku."""
+        params: dict[str, Any] = {"interpolation": self.interpolation, "period": self.period}
+        if self.path is None:
+            params["track"] = np.asarray(self._track)
+        else:
+            stat = self.path.stat()
+            params.update(path=str(self.path), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return params
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Ślad z pliku nie jest kopiowany do procesów roboczych - otwierają go ponownie
+        state = {key: value for key, value in vars(self).items() if key in ("path", "interpolation", "period")}
+        if self.path is None:
+            state["_track"] = self._track
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        track = state.pop("_track", None)
+        vars(self).update(state)
+        self._open(track)
+
+    def _wrap(self, delta: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Różnice współrzędnych okresowych sprowadzone do [-okres/2, okres/2)."""
+        if not self._any_periodic:
+            return delta
+        wrapped = delta - self._periods * np.round(delta / np.where(self._periodic, self._periods, 1.0))
+        return np.where(self._periodic, wrapped, delta)
+
+    def _coefficients_of(self, window: NDArray[np.float64], j: NDArray[np.intp]) -> NDArray[np.float64]:
+        """
+        Współczynniki (..., 4, dim) wielomianów przedziałów z próbek window[j] - j (..., 4) to indeksy
+        [poprzednia, początek, koniec, następna] (na końcach śladu powtórzone początek / koniec).
+        """
+        samples = window[j]
+        times, points = samples[..., 0], samples[..., 1:]
+        if self._any_periodic:
+            # Współrzędne okresowe rozwinięte względem początku przedziału
+            start = points[..., 1:2, :]
+            points = start + self._wrap(points - start)
+        if j.ndim == 1:
+            weights = hermite_weights(*times.tolist(), self.interpolation)
+        else:
+            weights = hermite_weights(times[..., 0], times[..., 1], times[..., 2], times[..., 3], self.interpolation)
+        return weights @ points
+
+    def _locate(self, t: float) -> None:
+        """Ustawia kursor na przedziale zawierającym t (t_start <= t <= t_end)."""
+        k = self._cursor
+        times = self._times
+        last = self.n_samples - 2
+        if 0 <= k < last and times[k + 1] <= t < times[k + 2]:
+            k += 1
+        elif 0 < k and times[k - 1] <= t < times[k]:
+            # Krok odrzucony albo etap metody wcześniej niż poprzednie wywołanie
+            k -= 1
+        else:
+            k = min(max(self._search(t) - 1, 0), last)
+        window = np.array(self._track[max(k - 1, 0) : k + 3])
+        i = min(k, 1)
+        j = np.array([i - 1 if i else i, i, i + 1, i + 2 if i + 2 < len(window) else i + 1])
+        coefficients = self._coefficients_of(window, j)
+        t0, t1 = float(window[i, 0]), float(window[i + 1, 0])
+        self._cursor = k
+        self._interval = (t0, t1, t1 - t0)
+        self._coefficients = coefficients
+        self._velocity_coefficients = coefficients[1:] * (_DERIVATIVE / (t1 - t0))
+
+    def _search(self, t: float) -> int:
+        """
+        bisect_right na chwilach śladu. Od kursora przedział rozszerzany jest wykładniczo, więc skok
+        o d próbek kosztuje O(log d) odczytów, a nie O(log K).
+        """
+        times = self._times
+        k = self._cursor
+        if k < 0:
+            return bisect.bisect_right(times, t)
+        step = 1
+        if t >= times[k]:
+            lo, hi = k, k + 1
+            while hi < self.n_samples and times[hi] <= t:
+                lo, hi = hi, hi + step
+                step *= 2
+            return bisect.bisect_right(times, t, lo, min(hi, self.n_samples))
+        lo, hi = k - 1, k
+        while lo > 0 and times[lo] > t:
+            lo, hi = lo - step, lo
+            step *= 2
+        return bisect.bisect_right(times, t, max(lo, 0), hi)
+
+    def track_position(self, t: float | NDArray[np.float64]) -> NDArray[np.float64]:
+        """Pozycja ze śladu (dim,) w chwili t albo (dim, K) w chwilach t (K,)."""
+        if np.ndim(t) != 0:
+            return self._evaluate(np.asarray(t, dtype=np.float64), derivative=False)
+        if t <= self.t_start:
+            return self._first.copy()
+        if t >= self.t_end:
+            return self._last.copy()
+        t0, t1, h = self._interval
+        if not t0 <= t < t1:
+            self._locate(t)
+            t0, _, h = self._interval
+        s = (t - t0) / h
+        return np.dot((1.0, s, s * s, s * s * s), self._coefficients)
+
+    def calculate_movement(self, t: float) -> np.ndarray:
+        if not self.t_start <= t <= self.t_end:
+            return self._zero.copy()
+        t0, t1, h = self._interval
+        if not t0 <= t < t1:
+            self._locate(t)
+            t0, _, h = self._interval
+        s = (t - t0) / h
+        return np.dot((1.0, s, s * s), self._velocity_coefficients)
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        if np.ndim(t) == 0:
+            return self.calculate_movement(float(t))  # type: ignore [arg-type]
+        return self._evaluate(np.asarray(t, dtype=np.float64), derivative=True)
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        position = self.track_position(t)
+        return position - self._origin.reshape(self._origin.shape + (1,) * (position.ndim - 1))
+
+    def _evaluate(self, t: NDArray[np.float64], derivative: bool) -> NDArray[np.float64]:
+        """
+        Pozycje lub prędkości (dim, K) w chwilach t (K,) - wczytywany jest tylko fragment śladu
+        obejmujący [min(t), max(t)], a przedziały wyszukiwane są w nim wektorowo.
+        """
+        out = np.zeros((self.dim, t.size))
+        inside = (t >= self.t_start) & (t <= self.t_end)
+        if not derivative:
+            out[:, t <= self.t_start] = self._first[:, np.newaxis]
+            out[:, t >= self.t_end] = self._last[:, np.newaxis]
+        if not inside.any():
+            return out
+
+        ti = t[inside]
+        last = self.n_samples - 2
+        lo = max(min(bisect.bisect_right(self._times, float(ti.min())) - 1, last) - 1, 0)
+        hi = min(bisect.bisect_right(self._times, float(ti.max())) + 2, self.n_samples)
+        window = np.array(self._track[lo:hi])
+        n = len(window)
+        k = np.clip(np.searchsorted(window[:, 0], ti, side="right") - 1, 0, n - 2)
+        j = np.stack([np.maximum(k - 1, 0), k, k + 1, np.minimum(k + 2, n - 1)], axis=-1)
+        coefficients = self._coefficients_of(window, j)
+        h = window[k + 1, 0] - window[k, 0]
+        s = (ti - window[k, 0]) / h
+        if derivative:
+            basis = np.stack([np.zeros_like(s), 1 / h, 2 * s / h, 3 * s * s / h], axis=-1)
+        else:
+            basis = np.stack([np.ones_like(s), s, s * s, s * s * s], axis=-1)
+        out[:, inside] = np.einsum("kc,kcd->dk", basis, coefficients)
+        return out
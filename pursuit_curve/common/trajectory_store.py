@@ -0,0 +1,240 @@
+"""
+Zapis trajektorii krok po kroku do pliku binarnego i leniwy odczyt przez memmap.
+
+Format pliku:
+    nagłówek HEADER_SIZE bajtów (HEADER_DTYPE), metadane JSON (dopełnione do 8 bajtów),
+    potem rekordy float64 [t, y_0..y_{n-1}, f_0..f_{n-1}] - po jednym na zaakceptowany krok.
+Plik jest tylko dopisywany, liczba rekordów wynika z jego rozmiaru. Status i czas zdarzenia są
+wpisywane do nagłówka przy zamknięciu zapisu.
+"""
+
+import bisect
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+MAGIC = b"PCTRAJ\x00\x01"
+HEADER_SIZE = 64
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("n_states", "<u4"),
+        ("metadata_len", "<u4"),
+        ("status", "<i4"),
+        ("complete", "<u4"),
+        ("t_event", "<f8"),
+    ]
+)
+MESSAGES = {
+    -1: "Integration step failed.",
+    0: "The solver successfully reached the end of the integration interval.",
+    1: "A termination event occurred.",
+}
+
+
+def _header(
+    n_states: int, metadata_len: int, status: int = 0, complete: bool = False, t_event: float = np.nan
+) -> bytes:
+    header = np.array([(MAGIC, n_states, metadata_len, status, complete, t_event)], dtype=HEADER_DTYPE)
+    return header.tobytes().ljust(HEADER_SIZE, b"\0")
+
+
+class TrajectoryWriter:
+    """
+    Sink na kroki solwera: append(t, y, f) kopiuje stan do bufora o rozmiarze ok. buffer_bytes,
+    zapisywanego na dysk po zapełnieniu - zużycie pamięci nie zależy od długości symulacji.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        n_states: int,
+        metadata: dict[str, Any] | None = None,
+        buffer_bytes: int = 1 << 20,
+    ):
+        self.path = Path(path)
+        self.n_states = n_states
+        self.count = 0
+        self.status = 0
+        self.t_event = np.nan
+        record_size = 8 * (1 + 2 * n_states)
+        self._buffer = np.empty((max(buffer_bytes // record_size, 1), 1 + 2 * n_states))
+        self._fill = 0
+
+        meta = json.dumps(metadata or {}).encode()
+        meta = meta.ljust(-(-len(meta) // 8) * 8, b" ")
+        self._metadata_len = len(meta)
+        self._file = open(self.path, "wb")
+        self._file.write(_header(n_states, self._metadata_len))
+        self._file.write(meta)
+
+    def append(self, t: float, y: ArrayLike, f: ArrayLike) -> None:
+        """t - czas, y - stan (n,), f - pochodna stanu (n,) potrzebna do interpolacji Hermite'a"""
+        row = self._buffer[self._fill]
+        row[0] = t
+        row[1 : 1 + self.n_states] = y
+        row[1 + self.n_states :] = f
+        self._fill += 1
+        self.count += 1
+        if self._fill == len(self._buffer):
+            self.flush()
+
+    def extend(self, t: ArrayLike, y: ArrayLike, f: ArrayLike) -> None:
+        """Porcja kroków: t (k,), y i f (n, k) - jak OdeResult.y albo progressive.SimulationChunk."""
+        t = np.asarray(t)
+        y = np.asarray(y)
+        f = np.asarray(f)
+        n = self.n_states
+        start = 0
+        while start < len(t):
+            stop = start + min(len(self._buffer) - self._fill, len(t) - start)
+            rows = self._buffer[self._fill : self._fill + stop - start]
+            rows[:, 0] = t[start:stop]
+            rows[:, 1 : 1 + n] = y[:, start:stop].T
+            rows[:, 1 + n :] = f[:, start:stop].T
+            self._fill += stop - start
+            self.count += stop - start
+            start = stop
+            if self._fill == len(self._buffer):
+                self.flush()
+
+    def flush(self) -> None:
+        self._file.write(memoryview(self._buffer[: self._fill]))
+        self._file.flush()
+        self._fill = 0
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(_header(self.n_states, self._metadata_len, self.status, True, self.t_event))
+        self._file.close()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        if exc_type is not None:
+            self.status = -1
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Leniwy odczyt pliku TrajectoryWriter. t, y, f to widoki memmap - dane czytane są z dysku dopiero
+    przy dostępie. Ma pola t, y, sol, t_events, status, message, więc może zastąpić OdeResult
+    w funkcjach animujących.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"{self.path} nie jest plikiem trajektorii")
+        self.n_states = int(header["n_states"])
+        self.status = int(header["status"])
+        self.complete = bool(header["complete"])
+        self.t_event = float(header["t_event"])
+
+        metadata_len = int(header["metadata_len"])
+        with open(self.path, "rb") as file:
+            file.seek(HEADER_SIZE)
+            self.metadata = json.loads(file.read(metadata_len) or b"{}")
+
+        offset = HEADER_SIZE + metadata_len
+        record_size = 8 * (1 + 2 * self.n_states)
+        # Niepełny ostatni rekord (przerwany zapis) jest pomijany
+        count = (self.path.stat().st_size - offset) // record_size
+        if count > 0:
+            shape = (count, 1 + 2 * self.n_states)
+            self.records = np.memmap(self.path, dtype=np.float64, mode="r", offset=offset, shape=shape)
+        else:
+            self.records = np.empty((0, 1 + 2 * self.n_states))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __reduce__(self) -> tuple[type, tuple[Path]]:
+        """Serializacja przez ścieżkę - proces roboczy otwiera plik ponownie zamiast kopiować memmap."""
+        return type(self), (self.path,)
+
+    @property
+    def t(self) -> NDArray[np.float64]:
+        return self.records[:, 0]
+
+    @property
+    def y(self) -> NDArray[np.float64]:
+        """Stany (n_states, K) - jak OdeResult.y"""
+        return self.records[:, 1 : 1 + self.n_states].T
+
+    @property
+    def f(self) -> NDArray[np.float64]:
+        return self.records[:, 1 + self.n_states :].T
+
+    @property
+    def message(self) -> str:
+        return MESSAGES.get(self.status, "") if self.complete else "Trajectory file is incomplete."
+
+    @property
+    def success(self) -> bool:
+        return self.status >= 0
+
+    @property
+    def t_events(self) -> list[NDArray[np.float64]]:
+        return [np.empty(0) if np.isnan(self.t_event) else np.array([self.t_event])]
+
+    def _search(self, values: NDArray[np.float64], side: str) -> NDArray[np.intp]:
+        """
+        Wyszukiwanie binarne bezpośrednio na kolumnie memmap - np.searchsorted skopiowałby całą
+        (nieciągłą) kolumnę czasu do pamięci.
+        """
+        column = self.t
+        search = bisect.bisect_left if side == "left" else bisect.bisect_right
+        return np.array([search(column, value) for value in values.tolist()], dtype=np.intp)
+
+    def slice(self, t_start: float | None = None, t_end: float | None = None) -> tuple[NDArray, NDArray]:
+        """Kroki z przedziału [t_start, t_end] jako (t (k,), y (n_states, k)) - wczytane tylko te rekordy."""
+        start = 0 if t_start is None else int(self._search(np.array([t_start]), "left")[0])
+        stop = len(self) if t_end is None else int(self._search(np.array([t_end]), "right")[0])
+        rows = np.array(self.records[start:stop])
+        return rows[:, 0], rows[:, 1 : 1 + self.n_states].T
+
+    def sol(self, t: ArrayLike) -> NDArray[np.float64]:
+        """Interpolacja Hermite'a między zapisanymi krokami. Zwraca (n,) lub (n, len(t)) - jak OdeSolution."""
+        t_arr = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        n = self.n_states
+        if len(self) < 2:
+            values = np.repeat(np.asarray(self.records[:1, 1 : 1 + n]).T, t_arr.size, axis=1)
+            return values[:, 0] if np.ndim(t) == 0 else values
+
+        index = np.clip(self._search(t_arr, "right") - 1, 0, len(self) - 2)
+        left = np.asarray(self.records[index])
+        right = np.asarray(self.records[index + 1])
+        h = right[:, 0] - left[:, 0]
+        s = ((t_arr - left[:, 0]) / h)[:, None]
+        h = h[:, None]
+        values = (
+            (1 + 2 * s) * (1 - s) ** 2 * left[:, 1 : 1 + n]
+            + s * (1 - s) ** 2 * h * left[:, 1 + n :]
+            + s * s * (3 - 2 * s) * right[:, 1 : 1 + n]
+            + s * s * (s - 1) * h * right[:, 1 + n :]
+        ).T
+        return values[:, 0] if np.ndim(t) == 0 else values
+
+    def close(self) -> None:
+        """Zwalnia referencję do memmap - plik zostanie odmapowany, gdy znikną też widoki t/y/f."""
+        self.records = np.empty((0, 1 + 2 * self.n_states))
+
+    def __enter__(self) -> "TrajectoryReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
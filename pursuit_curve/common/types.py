@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Any
 
 import numpy as np
 
+from .backend import KernelSpec
+from .events import CAPTURE_RADIUS
+
 
 @dataclass
 class Point2D:
@@ -43,14 +47,131 @@ class PointND:
         return list(self._coordinates)
 
 
+def stack_components(*components: float | np.ndarray) -> np.ndarray:
+    """
+    Składa współrzędne wektora w tablicę o kształcie (dim, 1) lub (dim, M).
+    Współrzędne mogą być skalarami albo tablicami (M,) - po jednej wartości na scenariusz.
+    """
+    arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(c, dtype=np.float64)) for c in components))
+    return np.stack(arrays)
+
+
+def _public_attributes(obj: object, exclude: tuple[str, ...]) -> dict[str, Any]:
+    return {name: value for name, value in vars(obj).items() if not name.startswith("_") and name not in exclude}
+
+
 class Strategy(ABC):
-    @abstractmethod
-    def dynamics(self, t: float, y: np.ndarray) -> np.ndarray: ...
+    integrator: str | None = None
+    """Domyślny integrator run_continuous_simulation ("euler", "rk4", "dopri5"); None - solve_ivp"""
+    kernel_spec: KernelSpec | None = None
+    """Kernel dla backendu numba (patrz common.backend); None - strategia zawsze liczy w numpy"""
+    runtime_state: tuple[str, ...] = ()
+    """Publiczne atrybuty zmieniane w trakcie symulacji - nie są parametrami strategii"""
+    capture_radius: float = CAPTURE_RADIUS
+    """Odległość złapania - stop_condition() to capture_distance() - capture_radius"""
+    distance_cached: bool = False
+    """Czy dynamics() zapamiętuje policzoną odległość złapania (patrz cached_distance)"""
+    _distance_state: np.ndarray | None = None
+    _distance: float = 0.0
+
+    def parameters(self) -> dict[str, Any]:
+        """
+        Parametry strategii - publiczne atrybuty instancji bez runtime_state i kernel_spec.
+        Wyznaczają klucz scenariusza w cache (cache.scenario_key); strategia trzymająca parametry
+        inaczej nadpisuje tę metodę.
+        """
+        return _public_attributes(self, (*self.runtime_state, "kernel_spec"))
+
+    def augment_state(self, state: Any) -> Any:
+        """
+        Stan początkowy całkowania z pozycji agentów (wektor lub tablica (M, n_states) scenariuszy).
+        Strategia z dodatkowymi zmiennymi stanu (np. kurs w ContinuousProportionalNavigation) dopisuje
+        je na końcu wektora; stan, który już je ma, zwracany jest bez zmian.
+        """
+        return state
 
     @abstractmethod
-    def stop_condition(self, t: float, y: list[float]) -> np.float32: ...
+    def dynamics(self, t: float, y: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """out - opcjonalny bufor na wynik; bez niego każde wywołanie alokuje nową tablicę."""
+
+    def capture_distance(self, y: np.ndarray) -> float:
+        """Odległość ścigający-cel w stanie y, w metryce przestrzeni strategii."""
+        raise NotImplementedError(f"{type(self).__name__} nie obsługuje capture_distance()")
+
+    def cached_distance(self, y: np.ndarray) -> float | None:
+        """
+        Odległość złapania policzona przez ostatnie wywołanie dynamics() na tej samej tablicy y
+        albo None. Zakłada, że y nie zmieniono w miejscu od tamtego wywołania (events.REUSE_METHODS).
+        """
+        return self._distance if y is self._distance_state else None
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
+
+    stop_condition.terminal = True  # type: ignore [attr-defined]
+    stop_condition.direction = -1  # type: ignore [attr-defined]
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """
+        Wersja wektorowa dynamics().
+        Y - tablica (n_states, M), każda kolumna to osobny scenariusz
+        Zwraca pochodne o kształcie (n_states, M).
+        """
+        raise NotImplementedError(f"{type(self).__name__} nie obsługuje dynamics_batch()")
+
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """Wersja wektorowa stop_condition(). Zwraca tablicę (M,)."""
+        raise NotImplementedError(f"{type(self).__name__} nie obsługuje stop_condition_batch()")
 
 
 class TargetStrategy(ABC):
+    """
+    Ruch celu. calculate_movement(t) to prędkość celu - prawa strona ODE dla jego współrzędnych.
+    Cel o trajektorii znanej w postaci zamkniętej implementuje displacement(); wtedy position()
+    i velocity() liczą się dla całej tablicy chwil jednym wywołaniem, a run_continuous_simulation
+    może całkować bez celu w stanie (analytic_target).
+    """
+
+    constant_velocity: bool = False
+    """Czy calculate_movement() nie zależy od czasu"""
+
+    def parameters(self) -> dict[str, Any]:
+        """Parametry ruchu celu - publiczne atrybuty instancji (patrz Strategy.parameters)."""
+        return _public_attributes(self, ())
+
     @abstractmethod
-    def calculate_movement(self, t: float) -> np.ndarray: ...
+    def calculate_movement(self, t: float) -> np.ndarray:
+        """Prędkość celu (dim,) w chwili t."""
+
+    @property
+    def closed_form(self) -> bool:
+        """Czy trajektoria jest znana analitycznie (displacement())"""
+        return self.constant_velocity or type(self).displacement is not TargetStrategy.displacement
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        """Prędkość w chwili t (dim,) albo w chwilach t (K,) -> (dim, K)."""
+        if np.ndim(t) == 0:
+            return np.asarray(self.calculate_movement(float(t)), dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+        if self.constant_velocity:
+            v = np.asarray(self.calculate_movement(0.0), dtype=np.float64)
+            return np.repeat(v[:, np.newaxis], t.size, axis=1)
+        return np.stack([self.calculate_movement(float(ti)) for ti in t], axis=-1).reshape(-1, t.size)
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        """
+        Przesunięcie celu od chwili 0 do t (całka prędkości) - (dim,) albo (dim, K) dla tablicy t (K,).
+        Cel o stałej prędkości ma je zawsze; pozostałe nadpisują tę metodę.
+        """
+        if not self.constant_velocity:
+            raise NotImplementedError(f"{type(self).__name__} nie ma trajektorii w postaci zamkniętej")
+        return np.multiply.outer(np.asarray(self.calculate_movement(0.0), dtype=np.float64), t)
+
+    def position(self, t: float | np.ndarray, start: Any, t0: float = 0.0) -> np.ndarray:
+        """
+        Pozycja w chwili t (albo (dim, K) w chwilach t (K,)) celu, który w chwili t0 był w start.
+        Pozycja startowa pochodzi ze stanu początkowego symulacji - cel jej nie przechowuje.
+        """
+        offset = np.asarray(start, dtype=np.float64) - (self.displacement(t0) if t0 else 0.0)
+        d = self.displacement(t)
+        return d + offset.reshape(offset.shape + (1,) * (d.ndim - offset.ndim))
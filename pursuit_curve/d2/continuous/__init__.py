@@ -1,3 +1,4 @@
+from .analytic import LogarithmicSpiral, PurePursuitLinear, analytic_solution, solve_pursuit
 from .animation import animate_continuous_pursuit
 from .cyclic_pursuit_animation import cyclic_pursuit_animation
 from .strategies import (
@@ -6,6 +7,7 @@ from .strategies import (
     ContinuousDirectPursuit,
     ContinuousProportionalNavigation,
     ContinuousTargetCircleStrategy,
+    ContinuousTargetLinearStrategy,
 )
 
 __all__ = [
@@ -14,6 +16,11 @@ __all__ = [
     "ContinuousProportionalNavigation",
     "animate_continuous_pursuit",
     "ContinuousTargetCircleStrategy",
+    "ContinuousTargetLinearStrategy",
     "ContinuousCyclicPursuit",
     "cyclic_pursuit_animation",
+    "PurePursuitLinear",
+    "LogarithmicSpiral",
+    "analytic_solution",
+    "solve_pursuit",
 ]
@@ -0,0 +1,360 @@
+"""
+Rozwiązania analityczne klasycznych przypadków pościgu 2D - bez całkowania numerycznego.
+
+1. Pościg bezpośredni za celem poruszającym się ze stałą prędkością po prostej.
+   W układzie związanym z prostą celu (xi - wzdłuż ruchu celu, eta - odległość od prostej)
+   nachylenie p = dxi/deta spełnia eta * dp/deta = k * sqrt(1 + p^2), k = u / v, stąd
+       p = sinh(s0 + k * lam),  lam = ln(eta / eta0),  s0 = asinh(p0)
+   a położenie, czas i odległość od celu mają postać zamkniętą w zmiennej lam:
+       xi(lam) = xi0 + eta0 / 2 * (e^s0 * E(1 + k, lam) - e^-s0 * E(1 - k, lam))
+       t(lam)  = -eta0 / (2v) * (e^s0 * E(1 + k, lam) + e^-s0 * E(1 - k, lam))
+       D(lam)  = eta0 * e^lam * cosh(s0 + k * lam)
+   gdzie E(a, lam) = (e^(a * lam) - 1) / a (dla a = 0 równe lam).
+
+2. Stały namiar beta przy nieruchomym celu - spirala logarytmiczna:
+       r(t) = r0 - v * cos(beta) * t,  theta = theta0 + tan(beta) * ln(r / r0)
+
+lam dla zadanej chwili t wyznaczane jest metodą Newtona (z bisekcją jako zabezpieczeniem), wektorowo dla
+wszystkich próbek naraz - koszt na punkt nie zależy od długości symulacji.
+"""
+
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy.optimize import OptimizeResult
+
+from pursuit_curve.common import Strategy, run_continuous_simulation
+from pursuit_curve.common.events import CAPTURE_RADIUS
+
+from .strategies import ContinuousConstantBearing, ContinuousDirectPursuit, ContinuousTargetLinearStrategy
+
+BISECTION_ITERS = 64
+TABLE_SIZE = 64
+
+
+def _expm1_ratio(a: float, lam: NDArray[np.float64] | float) -> NDArray[np.float64]:
+    """E(a, lam) = (e^(a * lam) - 1) / a, z granicą lam dla a = 0"""
+    if a == 0:
+        return np.asarray(lam, dtype=np.float64)
+    return np.expm1(a * np.asarray(lam)) / a
+
+
+class AnalyticTrajectory(ABC):
+    """Wspólny interfejs: wywołanie (t) zwraca stany (4, K) jak OdeSolution, capture_time - czas złapania albo None."""
+
+    name = ""
+    capture_time: float | None = None
+
+    @abstractmethod
+    def states(self, t: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Stany (4, K) w chwilach t (K,) z przedziału [0, capture_time]."""
+
+    def __call__(self, t: ArrayLike) -> NDArray[np.float64]:
+        t_arr = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        if self.capture_time is not None:
+            t_arr = np.minimum(t_arr, self.capture_time)
+        y = self.states(np.maximum(t_arr, 0.0))
+        return y[:, 0] if np.ndim(t) == 0 else y
+
+
+class PurePursuitLinear(AnalyticTrajectory):
+    """
+    Pościg bezpośredni (prędkość ścigającego speed) za celem o stałej prędkości target_velocity.
+    Czas liczony od chwili, w której ścigający jest w pursuer, a cel w target.
+    """
+
+    name = "pure_pursuit_linear"
+
+    def __init__(
+        self,
+        pursuer: ArrayLike,
+        target: ArrayLike,
+        speed: float,
+        target_velocity: ArrayLike,
+        capture_radius: float = CAPTURE_RADIUS,
+    ):
+        self.pursuer = np.asarray(pursuer, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.target_velocity = np.asarray(target_velocity, dtype=np.float64)
+        self.v = float(speed)
+        self.capture_radius = capture_radius
+
+        rel = self.pursuer - self.target
+        self.D0 = float(np.hypot(*rel))
+        u = float(np.hypot(*self.target_velocity))
+        self.k = u / self.v
+
+        # Baza (e, n): e - kierunek ruchu celu, n - prostopadły, zwrócony w stronę ścigającego
+        if u > 0:
+            self.e = self.target_velocity / u
+        else:
+            # Cel nieruchomy - dowolny kierunek, wybieramy prostopadły do linii namiaru (p0 = 0)
+            self.e = np.array([-rel[1], rel[0]]) / max(self.D0, np.finfo(float).tiny)
+        self.n = np.array([-self.e[1], self.e[0]])
+        self.xi0 = float(rel @ self.e)
+        self.eta0 = float(rel @ self.n)
+        if self.eta0 < 0:
+            self.n = -self.n
+            self.eta0 = -self.eta0
+
+        # Ścigający na prostej ruchu celu - ruch jednowymiarowy
+        self.collinear = self.eta0 <= 1e-12 * max(self.D0, 1.0)
+        if self.collinear:
+            self.direction = -math.copysign(1.0, self.xi0)
+            self.closing_speed = self.v - self.direction * u
+        else:
+            self.s0 = math.asinh(self.xi0 / self.eta0)
+            self.exp_s0 = math.exp(self.s0)
+        self.capture_time, self._capture_lam = self._capture()
+
+    def distance(self, lam: NDArray[np.float64] | float) -> NDArray[np.float64]:
+        return self.eta0 * np.exp(lam) * np.cosh(self.s0 + self.k * np.asarray(lam))
+
+    def time(self, lam: NDArray[np.float64] | float) -> NDArray[np.float64]:
+        return (
+            -self.eta0
+            / (2 * self.v)
+            * (self.exp_s0 * _expm1_ratio(1 + self.k, lam) + _expm1_ratio(1 - self.k, lam) / self.exp_s0)
+        )
+
+    def _capture(self) -> tuple[float | None, float]:
+        radius = self.capture_radius
+        if self.D0 <= radius:
+            return 0.0, 0.0
+        if self.collinear:
+            if self.closing_speed <= 0:
+                return None, -np.inf
+            return (self.D0 - radius) / self.closing_speed, -np.inf
+
+        # D(lam) jest wypukła w lam - szukamy pierwszego (największego) lam z D(lam) = radius
+        k = self.k
+        if k < 1:
+            lo = math.log(radius / self.D0) / (1 - k)
+        elif k == 1:
+            rest = 2 * radius / self.eta0 - 1 / self.exp_s0
+            if rest <= 0:
+                return None, -np.inf
+            lam = 0.5 * math.log(rest / self.exp_s0)
+            return float(self.time(lam)), lam
+        else:
+            lo = (math.log((k - 1) / (k + 1)) - 2 * self.s0) / (2 * k)
+            if lo >= 0 or self.distance(lo) > radius:
+                return None, -np.inf
+        # Newton z zabezpieczeniem bisekcją, D'(lam) = eta0 * e^lam * (cosh(s) + k * sinh(s))
+        hi = 0.0
+        lam = lo
+        for _ in range(BISECTION_ITERS):
+            s = self.s0 + k * lam
+            scale = self.eta0 * math.exp(lam)
+            residual = scale * math.cosh(s) - radius
+            if residual > 0:
+                hi = lam
+            else:
+                lo = lam
+            slope = scale * (math.cosh(s) + k * math.sinh(s))
+            new = lam - residual / slope if slope > 0 else lo
+            if not lo < new <= hi:
+                new = 0.5 * (lo + hi)
+            if abs(new - lam) <= 1e-15 * (1 + abs(lam)):
+                break
+            lam = new
+        return float(self.time(lam)), lam
+
+    def _lam_at(self, t: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Odwrócenie malejącej funkcji t(lam): przybliżenie początkowe z tablicy TABLE_SIZE punktów,
+        potem metoda Newtona (dt/dlam = -D / v) zabezpieczona bisekcją, wektorowo dla wszystkich próbek.
+        """
+        lo = self._capture_lam
+        if not np.isfinite(lo):
+            # Brak złapania - rozszerzamy przedział, aż obejmie najpóźniejszą próbkę
+            lo = -1.0
+            while t.size and self.time(lo) < t.max() and lo > -1e6:
+                lo *= 2
+        grid = np.linspace(0.0, lo, TABLE_SIZE)
+        grid_t = self.time(grid)
+        j = np.clip(np.searchsorted(grid_t, t), 1, TABLE_SIZE - 1)
+        hi_arr, lo_arr = grid[j - 1], grid[j]
+        lam = np.interp(t, grid_t, grid)
+        for _ in range(BISECTION_ITERS):
+            residual = self.time(lam) - t
+            later = residual > 0
+            lo_arr = np.where(later, lam, lo_arr)
+            hi_arr = np.where(later, hi_arr, lam)
+            new = lam + residual * self.v / self.distance(lam)
+            new = np.where((new < lo_arr) | (new > hi_arr), 0.5 * (lo_arr + hi_arr), new)
+            done = np.abs(new - lam).max(initial=0.0) <= 1e-13 * (1 + np.abs(lam).max(initial=0.0))
+            lam = new
+            if done:
+                break
+        return lam
+
+    def states(self, t: NDArray[np.float64]) -> NDArray[np.float64]:
+        target = self.target[:, None] + self.target_velocity[:, None] * t
+        if self.collinear:
+            pursuer = self.pursuer[:, None] + (self.direction * self.v * t) * self.e[:, None]
+            return np.concatenate([pursuer, target])
+
+        lam = self._lam_at(t)
+        eta = self.eta0 * np.exp(lam)
+        xi = self.xi0 + self.eta0 / 2 * (
+            self.exp_s0 * _expm1_ratio(1 + self.k, lam) - _expm1_ratio(1 - self.k, lam) / self.exp_s0
+        )
+        pursuer = self.target[:, None] + xi * self.e[:, None] + eta * self.n[:, None]
+        return np.concatenate([pursuer, target])
+
+
+class LogarithmicSpiral(AnalyticTrajectory):
+    """Stały namiar bearing (rad) przy nieruchomym celu."""
+
+    name = "log_spiral"
+
+    def __init__(
+        self,
+        pursuer: ArrayLike,
+        target: ArrayLike,
+        speed: float,
+        bearing: float,
+        capture_radius: float = CAPTURE_RADIUS,
+    ):
+        self.pursuer = np.asarray(pursuer, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.v = float(speed)
+        self.bearing = float(bearing)
+        self.capture_radius = capture_radius
+
+        rel = self.pursuer - self.target
+        self.r0 = float(np.hypot(*rel))
+        self.theta0 = math.atan2(rel[1], rel[0])
+        # Prędkość zbliżania - cos(beta) z dokładnością do zaokrągleń (cos(pi/2) != 0)
+        self.radial_speed = self.v * math.cos(self.bearing)
+        if abs(self.radial_speed) < 1e-12 * self.v:
+            self.radial_speed = 0.0
+
+        if self.r0 <= capture_radius:
+            self.capture_time = 0.0
+        elif self.radial_speed > 0:
+            self.capture_time = (self.r0 - capture_radius) / self.radial_speed
+        else:
+            self.capture_time = None
+
+    def states(self, t: NDArray[np.float64]) -> NDArray[np.float64]:
+        if self.radial_speed == 0:
+            r = np.full(t.shape, self.r0)
+            theta = self.theta0 - self.v * math.sin(self.bearing) * t / self.r0
+        else:
+            r = self.r0 - self.radial_speed * t
+            theta = self.theta0 + math.tan(self.bearing) * np.log(r / self.r0)
+        pursuer = self.target[:, None] + r * np.array([np.cos(theta), np.sin(theta)])
+        target = np.broadcast_to(self.target[:, None], (2, t.size))
+        return np.concatenate([pursuer, target])
+
+
+def analytic_solution(
+    initial_state: ArrayLike, strategy: Strategy, capture_radius: float | None = None
+) -> AnalyticTrajectory | None:
+    """
+    Rozpoznaje przypadki z rozwiązaniem zamkniętym:
+    - ContinuousDirectPursuit + ContinuousTargetLinearStrategy
+    - ContinuousConstantBearing + nieruchomy ContinuousTargetLinearStrategy
+    Wymagana jest izotropowa prędkość ścigającego (velocity.x == velocity.y) i skalarne parametry.
+    capture_radius: Promień złapania; domyślnie strategy.capture_radius (jak w symulacji numerycznej)
+    Zwraca None, gdy przypadek nie ma rozwiązania analitycznego.
+    """
+    if capture_radius is None:
+        capture_radius = strategy.capture_radius
+    target_strategy = getattr(strategy, "target_strategy", None)
+    if not isinstance(target_strategy, ContinuousTargetLinearStrategy):
+        return None
+    velocity = strategy.pursuer_velocity  # type: ignore [attr-defined]
+    target_velocity = target_strategy.linear_velocity
+    scalars = (velocity.x, velocity.y, target_velocity.x, target_velocity.y)
+    if any(np.ndim(value) != 0 for value in scalars) or velocity.x != velocity.y or velocity.x <= 0:
+        return None
+
+    state = np.asarray(initial_state, dtype=np.float64)
+    if state.shape != (4,):
+        return None
+    pursuer, target = state[:2], state[2:]
+    if isinstance(strategy, ContinuousDirectPursuit):
+        return PurePursuitLinear(pursuer, target, velocity.x, [target_velocity.x, target_velocity.y], capture_radius)
+    if isinstance(strategy, ContinuousConstantBearing):
+        if target_velocity.x != 0 or target_velocity.y != 0 or np.ndim(strategy.bearing_angle) != 0:
+            return None
+        return LogarithmicSpiral(pursuer, target, velocity.x, strategy.bearing_angle, capture_radius)
+    return None
+
+
+def solve_pursuit(
+    initial_state: list[float],
+    strategy: Strategy,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    t_eval: ArrayLike | None = None,
+    compare: bool = False,
+    method: str | None = None,
+) -> OptimizeResult:
+    """
+    Rozwiązanie analityczne, gdy istnieje, w przeciwnym razie run_continuous_simulation().
+
+    t_eval: Chwile, w których zwracane są stany; domyślnie siatka co max_step do złapania / końca t_span
+    compare: Policz też rozwiązanie numeryczne i zapisz rozbieżność w polach discrepancy
+             (maks. różnica stanów w krokach solwera) i capture_time_discrepancy
+    method: Integrator dla ścieżki numerycznej (jak w run_continuous_simulation)
+
+    Wynik ma pola jak OdeResult (t, y, sol, t_events, y_events, status, ...) oraz:
+    solver ("analytic" / "numerical"), case (nazwa przypadku), capture_time, discrepancy,
+    capture_time_discrepancy.
+    """
+    t0, t1 = t_span
+    trajectory = analytic_solution(initial_state, strategy)
+    if trajectory is None:
+        result = run_continuous_simulation(initial_state, strategy, t_span, max_step, method=method)
+        events = result.t_events[0]
+        result.solver = "numerical"
+        result.case = None
+        result.capture_time = float(events[0]) if len(events) else None
+        result.discrepancy = None
+        result.capture_time_discrepancy = None
+        return result
+
+    captured = trajectory.capture_time is not None and t0 + trajectory.capture_time <= t1
+    t_end = t0 + trajectory.capture_time if captured else t1
+    if t_eval is None:
+        t = np.linspace(t0, t_end, max(int(math.ceil((t_end - t0) / max_step)), 1) + 1)
+    else:
+        t = np.asarray(t_eval, dtype=np.float64)
+        t = t[t <= t_end]
+
+    def sol(s: ArrayLike) -> NDArray[np.float64]:
+        return trajectory(np.asarray(s, dtype=np.float64) - t0)
+
+    y = sol(t)
+    result = OptimizeResult(
+        t=t,
+        y=y,
+        sol=sol,
+        t_events=[np.array([t_end]) if captured else np.empty(0)],
+        y_events=[sol(np.array([t_end])).T if captured else np.empty((0, 4))],
+        nfev=0,
+        njev=0,
+        nlu=0,
+        status=1 if captured else 0,
+        message="A termination event occurred." if captured else "Analytic solution evaluated over t_span.",
+        success=True,
+        solver="analytic",
+        case=trajectory.name,
+        capture_time=t_end if captured else None,
+        discrepancy=None,
+        capture_time_discrepancy=None,
+    )
+
+    if compare:
+        numerical = run_continuous_simulation(initial_state, strategy, t_span, max_step, method=method)
+        result.discrepancy = float(np.abs(sol(numerical.t) - numerical.y).max())
+        events = numerical.t_events[0]
+        if captured and len(events):
+            result.capture_time_discrepancy = abs(float(events[0]) - t_end)
+    return result
@@ -1,26 +1,30 @@
-import matplotlib.animation as animation
+from functools import partial
+
 import matplotlib.pyplot as plt
-import numpy as np
+from matplotlib.animation import AbstractMovieWriter
 from matplotlib.lines import Line2D
 from matplotlib.text import Text
 
+from pursuit_curve.rendering import (
+    FrameSource,
+    Scene,
+    TrailBuffer,
+    pixel_size,
+    render_animation,
+    render_raster,
+    trail_capacity,
+)
 
-def animate_continuous_pursuit(solution, num_frames: int = 200) -> None:
-    t_eval = np.linspace(solution.t[0], solution.t[-1], num_frames)
-    y_interp = solution.sol(t_eval)
 
-    pursuer_x = y_interp[0]
-    pursuer_y = y_interp[1]
-    target_x = y_interp[2]
-    target_y = y_interp[3]
+def _continuous_pursuit_scene(solution, num_frames: int, trail_length: int | None) -> Scene:
+    frames = FrameSource(solution, num_frames)
 
     fig, ax = plt.subplots(figsize=(10, 8))
 
-    all_x = np.concatenate([pursuer_x, target_x])
-    all_y = np.concatenate([pursuer_y, target_y])
+    lower, upper = frames.bounds()
     margin = 1.0
-    ax.set_xlim(all_x.min() - margin, all_x.max() + margin)
-    ax.set_ylim(all_y.min() - margin, all_y.max() + margin)
+    ax.set_xlim(lower[0] - margin, upper[0] + margin)
+    ax.set_ylim(lower[1] - margin, upper[1] + margin)
 
     (line_target,) = ax.plot([], [], "r-", label="Target (Cel)", linewidth=2, alpha=0.6)
     (line_pursuer,) = ax.plot([], [], "b-", label="Pursuer (Ścigający)", linewidth=2, alpha=0.6)
@@ -28,10 +32,11 @@ def animate_continuous_pursuit(solution, num_frames: int = 200) -> None:
     (current_target,) = ax.plot([], [], "ro", markersize=15, alpha=0.8)
     (current_pursuer,) = ax.plot([], [], "bo", markersize=15, alpha=0.8)
 
-    ax.plot(target_x[0], target_y[0], "r^", markersize=12, label="Start T")
-    ax.plot(pursuer_x[0], pursuer_y[0], "b^", markersize=12, label="Start P")
-    ax.plot(target_x[-1], target_y[-1], "rx", markersize=12, label="End T")
-    ax.plot(pursuer_x[-1], pursuer_y[-1], "bx", markersize=12, label="End P")
+    (pursuer_start, target_start), (pursuer_end, target_end) = frames[0].copy(), frames[-1].copy()
+    ax.plot(*target_start, "r^", markersize=12, label="Start T")
+    ax.plot(*pursuer_start, "b^", markersize=12, label="Start P")
+    ax.plot(*target_end, "rx", markersize=12, label="End T")
+    ax.plot(*pursuer_end, "bx", markersize=12, label="End P")
 
     time_text = ax.text(
         0.02,
@@ -49,6 +54,8 @@ def animate_continuous_pursuit(solution, num_frames: int = 200) -> None:
     ax.set_title("Continuous Pursuit Simulation", fontsize=14)
     ax.set_aspect("equal")
 
+    trail = TrailBuffer(2, 2, trail_capacity(num_frames, trail_length), min_spacing=pixel_size(ax))
+
     def init() -> tuple[Line2D, Line2D, Line2D, Line2D, Text]:
         line_target.set_data([], [])
         line_pursuer.set_data([], [])
@@ -58,24 +65,50 @@ def animate_continuous_pursuit(solution, num_frames: int = 200) -> None:
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
     def animate_frame(frame: int) -> tuple[Line2D, Line2D, Line2D, Line2D, Text]:
-        line_target.set_data(target_x[: frame + 1], target_y[: frame + 1])
-        line_pursuer.set_data(pursuer_x[: frame + 1], pursuer_y[: frame + 1])
+        if frame == 0:
+            trail.clear()
+        positions = frames[frame]
+        trail.push(positions)
+        pursuer_trail, target_trail = trail.points(0), trail.points(1)
+        line_target.set_data(target_trail[:, 0], target_trail[:, 1])
+        line_pursuer.set_data(pursuer_trail[:, 0], pursuer_trail[:, 1])
 
-        current_target.set_data([target_x[frame]], [target_y[frame]])
-        current_pursuer.set_data([pursuer_x[frame]], [pursuer_y[frame]])
+        current_target.set_data(positions[1:2, 0], positions[1:2, 1])
+        current_pursuer.set_data(positions[0:1, 0], positions[0:1, 1])
 
-        time_text.set_text(f"Time: {t_eval[frame]:.2f}s")
+        time_text.set_text(f"Time: {frames.t[frame]:.2f}s")
 
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
-    anim = animation.FuncAnimation(
-        fig,
-        animate_frame,
-        init_func=init,
-        frames=num_frames,
-        interval=50,
-        blit=True,
-        repeat=True,
-    )
-    anim.save("animation.mp4", writer="ffmpeg", fps=30)
-    plt.close(fig)
+    return Scene(fig, animate_frame, init, frames, trail)
+
+
+def animate_continuous_pursuit(
+    solution,
+    num_frames: int = 200,
+    trail_length: int | None = None,
+    file: str = "animation.mp4",
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> None:
+    """
+    trail_length: Długość śladu w klatkach (None - cała historia, zdecymowana do rozmiaru piksela)
+    workers: Liczba procesów rysujących klatki (rendering.render_parallel); 1 - FuncAnimation
+    backend: "matplotlib" albo "raster" - szybki eksport bez Matplotlib (rendering.render_raster, writer
+             wybierany po rozszerzeniu file: wideo, .png, .npz)
+    Klatki wyliczane są leniwie (rendering.FrameSource), więc pamięć nie rośnie z num_frames.
+    """
+    if backend == "raster":
+        render_raster(FrameSource(solution, num_frames), file, ["blue", "red"], trail_length=trail_length)
+    elif backend == "matplotlib":
+        render_animation(
+            partial(_continuous_pursuit_scene, solution, num_frames, trail_length),
+            num_frames,
+            file,
+            writer,
+            workers=workers,
+            blit=True,
+        )
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
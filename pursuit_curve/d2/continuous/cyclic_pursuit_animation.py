@@ -1,39 +1,39 @@
-import matplotlib.animation as animation
+import logging
+from functools import partial
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.animation import AbstractMovieWriter
 
+from pursuit_curve.rendering import (
+    FrameSource,
+    Scene,
+    TrailBuffer,
+    TrailCollection,
+    pixel_size,
+    render_animation,
+    render_raster,
+    trail_capacity,
+)
 
-def cyclic_pursuit_animation(solution, num_frames: int = 200) -> None:
-    t_eval = np.linspace(solution.t[0], solution.t[-1], num_frames)
-    y_interp = solution.sol(t_eval)
-
-    num_points = y_interp.shape[0] // 2
+logger = logging.getLogger(__name__)
 
-    paths_x = [y_interp[i] for i in range(0, num_points * 2, 2)]
-    paths_y = [y_interp[i] for i in range(1, num_points * 2, 2)]
 
-    all_x = y_interp[::2].flatten()
-    all_y = y_interp[1::2].flatten()
+def _cyclic_pursuit_scene(solution, num_frames: int, trail_length: int | None, fade: bool) -> Scene:
+    frames = FrameSource(solution, num_frames)
+    num_points = frames[0].shape[0]
 
     fig, ax = plt.subplots(figsize=(10, 8))
 
+    lower, upper = frames.bounds()
     margin = 1.0
-    ax.set_xlim(all_x.min() - margin, all_x.max() + margin)
-    ax.set_ylim(all_y.min() - margin, all_y.max() + margin)
-
-    lines_history = []
-    lines_current = []
+    ax.set_xlim(lower[0] - margin, upper[0] + margin)
+    ax.set_ylim(lower[1] - margin, upper[1] + margin)
 
     colors = plt.cm.jet(np.linspace(0, 1, num_points))  # type: ignore
 
-    for i in range(num_points):
-        color = colors[i]
-
-        (line_hist,) = ax.plot([], [], "-", color=color, linewidth=2, alpha=0.6)
-        lines_history.append(line_hist)
-
-        (line_curr,) = ax.plot([], [], "o", color=color, markersize=10, alpha=0.8)
-        lines_current.append(line_curr)
+    lines_history = TrailCollection(ax, colors, fade=fade, linewidth=2, alpha=0.6)
+    points_current = ax.scatter(np.zeros(num_points), np.zeros(num_points), color=colors, s=100, alpha=0.8)
 
     time_text = ax.text(
         0.02,
@@ -51,40 +51,64 @@ def cyclic_pursuit_animation(solution, num_frames: int = 200) -> None:
     ax.set_title("Symulacja Pościgu (Wszystkie Punkty)", fontsize=14)
     ax.set_aspect("equal")
 
+    trail = TrailBuffer(num_points, 2, trail_capacity(num_frames, trail_length), min_spacing=pixel_size(ax))
+
     def init() -> tuple:
-        for line in lines_history:
-            line.set_data([], [])
-        for line in lines_current:
-            line.set_data([], [])
+        trail.clear()
+        lines_history.update(trail)
+        points_current.set_offsets(np.empty((0, 2)))
         time_text.set_text("")
 
-        return (*lines_history, *lines_current, time_text)
+        return lines_history.collection, points_current, time_text
 
     def animate_frame(frame: int) -> tuple:
-        for i in range(num_points):
-            x_path = paths_x[i]
-            y_path = paths_y[i]
-
-            lines_history[i].set_data(x_path[: frame + 1], y_path[: frame + 1])
-
-            lines_current[i].set_data([x_path[frame]], [y_path[frame]])
-
-        time_text.set_text(f"Time: {t_eval[frame]:.2f}s")
-
-        return (*lines_history, *lines_current, time_text)
-
-    anim = animation.FuncAnimation(
-        fig,
-        animate_frame,
-        init_func=init,
-        frames=num_frames,
-        interval=50,
-        blit=True,
-        repeat=True,
-    )
-
-    file = "animation.mp4"
-    anim.save(file, writer="ffmpeg", fps=30)
-    print(f"Animacja zapisana pomyślnie jako '{file}'.")
-
-    plt.close(fig)
+        if frame == 0:
+            trail.clear()
+        positions = frames[frame]
+        trail.push(positions)
+
+        lines_history.update(trail)
+        points_current.set_offsets(positions)
+
+        time_text.set_text(f"Time: {frames.t[frame]:.2f}s")
+
+        return lines_history.collection, points_current, time_text
+
+    return Scene(fig, animate_frame, init, frames, trail)
+
+
+def cyclic_pursuit_animation(
+    solution,
+    num_frames: int = 200,
+    trail_length: int | None = None,
+    fade: bool = False,
+    file: str = "animation.mp4",
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> None:
+    """
+    trail_length: Długość śladów w klatkach (None - cała historia, zdecymowana do rozmiaru piksela)
+    fade: Zanikające ślady - przezroczystość rośnie z wiekiem odcinka
+    workers: Liczba procesów rysujących klatki (rendering.render_parallel); 1 - FuncAnimation
+    backend: "matplotlib" albo "raster" - szybki eksport bez Matplotlib (rendering.render_raster, writer
+             wybierany po rozszerzeniu file: wideo, .png, .npz)
+    Ślady wszystkich punktów rysuje jedna LineCollection, a pozycje jeden scatter, więc koszt klatki
+    nie zależy ani od jej numeru, ani od liczby obiektów Matplotlib.
+    """
+    if backend == "raster":
+        frames = FrameSource(solution, num_frames)
+        colors = plt.cm.jet(np.linspace(0, 1, frames[0].shape[0]))  # type: ignore
+        render_raster(frames, file, colors, trail_length=trail_length, fade=fade, endpoints=False)
+    elif backend == "matplotlib":
+        render_animation(
+            partial(_cyclic_pursuit_scene, solution, num_frames, trail_length, fade),
+            num_frames,
+            file,
+            writer,
+            workers=workers,
+            blit=True,
+        )
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
+    logger.info("Animacja zapisana pomyślnie jako '%s'.", file, extra={"file": str(file)})
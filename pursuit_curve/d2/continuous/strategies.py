@@ -1,51 +1,94 @@
 import math
 
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
 
-from pursuit_curve.common import Point2D, Strategy, TargetStrategy
+from pursuit_curve.common import KernelSpec, Point2D, Strategy, TargetStrategy, kernels, numba_enabled, stack_components
+from pursuit_curve.common.events import CAPTURE_RADIUS
 
 
 class ContinuousDirectPursuit(Strategy):
     """Kierunek wprost na cel - wersja ciągła."""
 
-    def __init__(self, pursuer_velocity: Point2D, target_strategy: TargetStrategy):
+    distance_cached = True
+
+    def __init__(
+        self, pursuer_velocity: Point2D, target_strategy: TargetStrategy, capture_radius: float = CAPTURE_RADIUS
+    ):
         self.pursuer_velocity = pursuer_velocity
         self.target_strategy = target_strategy
+        self.capture_radius = capture_radius
+        self._speed = stack_components(pursuer_velocity.x, pursuer_velocity.y)
+        self._speed_x, self._speed_y = (float(v) for v in self._speed[:, 0])
+        self.kernel_spec = KernelSpec(
+            kernels.direct_pursuit,
+            kernels.direct_pursuit_stop,
+            params=np.concatenate([self._speed[:, 0], target_strategy.calculate_movement(0.0)]),
+            stop_params=np.array([capture_radius]),
+            target_strategy=target_strategy,
+            target_offset=2,
+        )
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
         """
         t - czas
         y = [pursuer_x, pursuer_y, target_x, target_y] w czasie t
+        out - opcjonalny bufor (4,) na wynik
         Zwraca pochodne: [dx_p/dt, dy_p/dt, dx_t/dt, dy_t/dt]
         """
-        pursuer_pos = y[0:2]
-        target_pos = y[2:4]
-
-        target_vel = self.target_strategy.calculate_movement(t)
-
-        direction = target_pos - pursuer_pos
-        distance = np.linalg.norm(direction)
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(4)
+        pursuer_x, pursuer_y, target_x, target_y = y
+
+        dx = target_x - pursuer_x
+        dy = target_y - pursuer_y
+        distance = math.hypot(dx, dy)
+        # Odległość dla zdarzenia złapania w tym samym stanie (cached_distance)
+        self._distance_state, self._distance = y, distance
 
         if distance < 1e-6:
-            pursuer_vel = np.array([0.0, 0.0], dtype=np.float32)
+            out[0] = out[1] = 0.0
         else:
-            pursuer_vel = (direction / distance) * np.array(
-                [self.pursuer_velocity.x, self.pursuer_velocity.y], dtype=np.float32
-            )
+            out[0] = self._speed_x * dx / distance
+            out[1] = self._speed_y * dy / distance
+        out[2:4] = self.target_strategy.calculate_movement(t)
+        return out
 
-        return np.concatenate([pursuer_vel, target_vel])
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """
+        Y - tablica (4, M) stanów [pursuer_x, pursuer_y, target_x, target_y]
+        Prędkość ścigającego może mieć składowe (M,) - po jednej na scenariusz.
+        """
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(2, -1)
+        speed = self._speed
+
+        direction = Y[2:4] - Y[0:2]
+        distance = np.hypot(direction[0], direction[1])
+        safe_distance = np.where(distance < 1e-6, np.inf, distance)
+
+        dY = np.empty(np.broadcast_shapes(Y.shape, (4, speed.shape[1]), (4, target_vel.shape[1])))
+        dY[0:2] = direction / safe_distance * speed
+        dY[2:4] = target_vel
+        return dY
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        """Zatrzymaj gdy odległość < 0.5"""
-        pursuer_pos = np.array(y[0:2], dtype=np.float32)
-        target_pos = np.array(y[2:4], dtype=np.float32)
-        distance = np.linalg.norm(target_pos - pursuer_pos)
-        return distance - 0.5
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        pursuer_x, pursuer_y, target_x, target_y = y.tolist()
+        return math.hypot(target_x - pursuer_x, target_y - pursuer_y)
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        """Zatrzymaj gdy odległość < capture_radius"""
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        return np.hypot(Y[2] - Y[0], Y[3] - Y[1]) - self.capture_radius
+
 
 class ContinuousConstantBearing(Strategy):
     """Constant bearing - wersja ciągła."""
@@ -55,38 +98,50 @@ class ContinuousConstantBearing(Strategy):
         pursuer_velocity: Point2D,
         target_strategy: TargetStrategy,
         bearing_angle_deg: float,
+        capture_radius: float = CAPTURE_RADIUS,
     ):
         self.pursuer_velocity = pursuer_velocity
         self.target_strategy = target_strategy
         self.bearing_angle = np.radians(bearing_angle_deg)
+        self.capture_radius = capture_radius
+        self._speed = stack_components(pursuer_velocity.x, pursuer_velocity.y)
+        self._speed_x, self._speed_y = (float(v) for v in self._speed[:, 0])
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        pursuer_pos = y[0:2]
-        target_pos = y[2:4]
-
-        target_vel = self.target_strategy.calculate_movement(t)
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if out is None:
+            out = np.empty(4)
+        pursuer_x, pursuer_y, target_x, target_y = y
 
-        direction = target_pos - pursuer_pos
-        angle_to_target = np.arctan2(direction[1], direction[0])
+        angle_to_target = math.atan2(target_y - pursuer_y, target_x - pursuer_x)
         movement_angle = angle_to_target + self.bearing_angle
 
-        pursuer_vel = np.array(
-            [
-                self.pursuer_velocity.x * np.cos(movement_angle),
-                self.pursuer_velocity.y * np.sin(movement_angle),
-            ]
-        )
+        out[0] = self._speed_x * math.cos(movement_angle)
+        out[1] = self._speed_y * math.sin(movement_angle)
+        out[2:4] = self.target_strategy.calculate_movement(t)
+        return out
 
-        return np.concatenate([pursuer_vel, target_vel])
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """
+        Y - tablica (4, M)
+        Prędkość i kąt namiaru mogą być tablicami (M,) - po jednej wartości na scenariusz.
+        """
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(2, -1)
+        speed = self._speed
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0:2], dtype=np.float32)
-        target_pos = np.array(y[2:4], dtype=np.float32)
-        distance = np.linalg.norm(target_pos - pursuer_pos)
-        return distance - 0.5
+        movement_angle = np.arctan2(Y[3] - Y[1], Y[2] - Y[0]) + self.bearing_angle
 
-    stop_condition.terminal = True
-    stop_condition.direction = -1
+        dY = np.empty(np.broadcast_shapes(Y.shape, (4, speed.shape[1]), (4, target_vel.shape[1])))
+        dY[0] = speed[0] * np.cos(movement_angle)
+        dY[1] = speed[1] * np.sin(movement_angle)
+        dY[2:4] = target_vel
+        return dY
+
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        pursuer_x, pursuer_y, target_x, target_y = y.tolist()
+        return math.hypot(target_x - pursuer_x, target_y - pursuer_y)
+
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        return np.hypot(Y[2] - Y[0], Y[3] - Y[1]) - self.capture_radius
 
 
 class ContinuousProportionalNavigation(Strategy):
@@ -95,124 +150,185 @@ class ContinuousProportionalNavigation(Strategy):
     Używana w rakietach i pociskach.
     Prędkość kątowa ścigającego jest proporcjonalna do prędkości kątowej linii namiarowania (LOS).
     https://en.wikipedia.org/wiki/Proportional_navigation
+
+    Kurs ścigającego psi jest zmienną stanu: y = [pursuer_x, pursuer_y, target_x, target_y, psi],
+    dpsi/dt = N * dlambda/dt, gdzie lambda to kąt LOS. dynamics() jest czystą funkcją (t, y), więc
+    strategia działa z solwerami adaptacyjnymi, dynamics_batch() i pulą procesów. Stan początkowy
+    [pursuer_x, pursuer_y, target_x, target_y] jest uzupełniany kursem wzdłuż LOS (augment_state).
     """
 
-    def __init__(self, pursuer_velocity: Point2D, target_strategy: TargetStrategy, N: float = 3.0):
+    distance_cached = True
+
+    def __init__(
+        self,
+        pursuer_velocity: Point2D,
+        target_strategy: TargetStrategy,
+        N: float = 3.0,
+        capture_radius: float = CAPTURE_RADIUS,
+    ):
         self.pursuer_velocity = pursuer_velocity
         self.target_strategy = target_strategy
         self.N = N
-        self.previous_los_angle: float | None = None
-        self.previous_pursuer_vel: NDArray[np.float32] | None = None
-
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        pursuer_pos = y[0:2]
-        target_pos = y[2:4]
-
-        target_vel = self.target_strategy.calculate_movement(t)
-
-        direction = target_pos - pursuer_pos
-        los_angle = np.arctan2(direction[1], direction[0])
-        if self.previous_los_angle is None:
-            self.previous_los_angle = los_angle
-            self.previous_pursuer_vel = np.array(
-                [
-                    self.pursuer_velocity.x * np.cos(los_angle),
-                    self.pursuer_velocity.y * np.sin(los_angle),
-                ],
-                dtype=np.float32,
-            )
-            return np.concatenate([self.previous_pursuer_vel, target_vel])
-
-        delta_los_angle = los_angle - self.previous_los_angle
-        while delta_los_angle > np.pi:
-            delta_los_angle -= 2 * np.pi
-        while delta_los_angle < -np.pi:
-            delta_los_angle += 2 * np.pi
-
-        if self.previous_pursuer_vel is None:
-            pursuer_angle = los_angle
+        self.capture_radius = capture_radius
+        self._speed = stack_components(pursuer_velocity.x, pursuer_velocity.y)
+        self._speed_x, self._speed_y = (float(v) for v in self._speed[:, 0])
+
+    def augment_state(self, state: ArrayLike) -> np.ndarray:
+        """Dopisuje kurs początkowy wzdłuż LOS do stanu bez niego (4 lub (M, 4) wartości)."""
+        state = np.asarray(state, dtype=np.float64)
+        if state.shape[-1] == 5:
+            return state
+        los_angle = np.arctan2(state[..., 3] - state[..., 1], state[..., 2] - state[..., 0])
+        return np.concatenate([state, los_angle[..., np.newaxis]], axis=-1)
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        """
+        y = [pursuer_x, pursuer_y, target_x, target_y, psi]
+        Zwraca pochodne: [dx_p/dt, dy_p/dt, dx_t/dt, dy_t/dt, dpsi/dt]
+        """
+        if out is None:
+            out = np.empty(5)
+        pursuer_x, pursuer_y, target_x, target_y, heading = y
+
+        out[0] = pursuer_vx = self._speed_x * math.cos(heading)
+        out[1] = pursuer_vy = self._speed_y * math.sin(heading)
+        out[2:4] = target_vel = self.target_strategy.calculate_movement(t)
+
+        dx = target_x - pursuer_x
+        dy = target_y - pursuer_y
+        distance_sq = dx * dx + dy * dy
+        self._distance_state, self._distance = y, math.sqrt(distance_sq)
+        if distance_sq < 1e-12:
+            out[4] = 0.0
         else:
-            pursuer_angle = np.arctan2(self.previous_pursuer_vel[1], self.previous_pursuer_vel[0])
-
-        new_pursuer_angle = pursuer_angle + self.N * delta_los_angle
-        new_vel = np.array(
-            [
-                self.pursuer_velocity.x * np.cos(new_pursuer_angle),
-                self.pursuer_velocity.y * np.sin(new_pursuer_angle),
-            ],
-            dtype=np.float32,
-        )
+            # dlambda/dt = (r x v_rel) / |r|^2, r - wektor LOS, v_rel - prędkość celu względem ścigającego
+            los_rate = (dx * (target_vel[1] - pursuer_vy) - dy * (target_vel[0] - pursuer_vx)) / distance_sq
+            out[4] = self.N * los_rate
+        return out
 
-        self.previous_los_angle = los_angle
-        self.previous_pursuer_vel = new_vel
-        return np.concatenate([new_vel, target_vel])
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """
+        Y - tablica (5, M)
+        Prędkość i N mogą być tablicami (M,) - po jednej wartości na scenariusz.
+        """
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(2, -1)
+        speed = self._speed
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0:2], dtype=np.float32)
-        target_pos = np.array(y[2:4], dtype=np.float32)
-        distance = np.linalg.norm(target_pos - pursuer_pos)
-        return distance - 0.5
+        dY = np.empty(np.broadcast_shapes(Y.shape, (5, speed.shape[1]), (5, target_vel.shape[1])))
+        dY[0] = speed[0] * np.cos(Y[4])
+        dY[1] = speed[1] * np.sin(Y[4])
+        dY[2:4] = target_vel
 
-    stop_condition.terminal = True
-    stop_condition.direction = -1
+        los = Y[2:4] - Y[0:2]
+        rel_vel = target_vel - dY[0:2]
+        distance_sq = los[0] ** 2 + los[1] ** 2
+        safe_distance_sq = np.where(distance_sq < 1e-12, np.inf, distance_sq)
+        dY[4] = self.N * (los[0] * rel_vel[1] - los[1] * rel_vel[0]) / safe_distance_sq
+        return dY
+
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        pursuer_x, pursuer_y, target_x, target_y = y[:4].tolist()
+        return math.hypot(target_x - pursuer_x, target_y - pursuer_y)
+
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        return np.hypot(Y[2] - Y[0], Y[3] - Y[1]) - self.capture_radius
 
 
 class ContinuousCyclicPursuit(Strategy):
-    def __init__(self, velocity: Point2D, n: int):
+    """
+    Pościg cykliczny n agentów - agent i goni agenta i+1 (mod n).
+    capture_distance to najmniejsza odległość agenta od jego celu.
+    """
+
+    distance_cached = True
+
+    def __init__(self, velocity: Point2D, n: int, capture_radius: float = CAPTURE_RADIUS):
         self.velocity = velocity
         self.n = n
+        self.capture_radius = capture_radius
         self.dim = 2
+        self._speed = np.array([velocity.x, velocity.y], dtype=np.float64)
+        self._directions = np.empty((n, self.dim))
+        self._dists = np.empty(n)
+        self.kernel_spec = KernelSpec(
+            kernels.cyclic_pursuit,
+            kernels.cyclic_pursuit_stop,
+            params=self._speed.copy(),
+            stop_params=np.array([capture_radius]),
+        )
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
+    def _update_directions(self, y: NDArray[np.float64]) -> None:
+        """Wektory do następnika (i -> i+1 mod n) i ich długości, liczone w buforach roboczych."""
         positions = y.reshape((self.n, self.dim))
-        shifted_positions = np.roll(positions, -1, axis=0)
-        directions = shifted_positions - positions
-        dists = np.linalg.norm(directions, axis=1)
-        if np.any(dists < 1e-6):
-            vel = np.zeros(self.n * self.dim, dtype=np.float32)
+        np.subtract(positions[1:], positions[:-1], out=self._directions[:-1])
+        np.subtract(positions[0], positions[-1], out=self._directions[-1])
+        np.hypot(self._directions[:, 0], self._directions[:, 1], out=self._dists)
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(self.n * self.dim)
+        self._update_directions(y)
+        vel = out.reshape((self.n, self.dim))
+        self._distance_state, self._distance = y, float(self._dists.min())
+        if self._distance < 1e-6:
+            vel.fill(0.0)
         else:
-            unit_vectors = directions / dists[:, np.newaxis]
-            v_scale = np.array([self.velocity.x, self.velocity.y], dtype=np.float32)
-            vel = unit_vectors * v_scale
-            vel = vel.flatten()
-        return vel
-
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        positions = np.array(y, dtype=np.float32).reshape((self.n, self.dim))
-        shifted_positions = np.roll(positions, -1, axis=0)
-        directions = shifted_positions - positions
-        dists = np.linalg.norm(directions, axis=1)
-        return np.min(dists) - 0.5
+            np.divide(self._directions, self._dists[:, np.newaxis], out=vel)
+            vel *= self._speed
+        return out
+
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        self._update_directions(np.asarray(y, dtype=np.float64))
+        return float(self._dists.min())
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
 
 class ContinuousTargetCircleStrategy(TargetStrategy):
-    """Strategia dla celu poruszającego się po okręgu."""
+    """
+    Strategia dla celu poruszającego się po okręgu o promieniu r, przeciwnie do ruchu wskazówek zegara.
+    Środek okręgu leży o r w kierunku -x od pozycji celu w chwili 0.
+    """
+
+    # x(t) = x_s + r*cos(ωt)
+    # y(t) = y_s + r*sin(ωt)
 
     def __init__(self, angular_velocity: float, r: float):
         self.angular_velocity = angular_velocity
         self.r = r
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array(
-            [
-                self.r * math.cos(self.angular_velocity * t),
-                self.r * math.sin(self.angular_velocity * t),
-            ],
-            dtype=np.float32,
-        )
+        phase = self.angular_velocity * t
+        speed = self.r * self.angular_velocity
+        return np.array([-speed * math.sin(phase), speed * math.cos(phase)])
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply(self.angular_velocity, t)
+        speed = self.r * self.angular_velocity
+        return np.array([-speed * np.sin(phase), speed * np.cos(phase)])
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply(self.angular_velocity, t)
+        return np.array([self.r * (np.cos(phase) - 1.0), self.r * np.sin(phase)])
 
 
 class ContinuousTargetLinearStrategy(TargetStrategy):
     """Strategia dla celu poruszającego się liniowo."""
 
+    constant_velocity = True
+
     def __init__(self, velocity: Point2D):
-        self.velocity = velocity
+        self.linear_velocity = velocity
+        self._velocity = np.array([velocity.x, velocity.y], dtype=np.float64)
+        self._velocity.flags.writeable = False
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array(
-            [self.velocity.x, self.velocity.y],
-            dtype=np.float32,
-        )
+        return self._velocity
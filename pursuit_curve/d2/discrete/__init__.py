@@ -6,11 +6,13 @@ from .strategies import (
     ProportionalNavigation,
     TargetCircleStrategy,
 )
+from .types import Point2DView
 
 __all__ = [
     "DirectPursuit",
     "ConstantBearing",
     "ProportionalNavigation",
+    "Point2DView",
     "Simulation",
     "animate_pursuit",
     "TargetCircleStrategy",
@@ -1,5 +1,6 @@
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.lines import Line2D
 
 from .simulation import Simulation
@@ -7,15 +8,15 @@ from .simulation import Simulation
 
 def animate_pursuit(simulation: Simulation) -> None:
     """Animuj wyniki symulacji dyskretnej."""
-    tps = simulation.target_positions
-    pps = simulation.pursuer_positions
+    tps = simulation.target_trajectory
+    pps = simulation.pursuer_trajectory
 
     fig, ax = plt.subplots(figsize=(8, 8))
 
-    all_x = [point.x for point in tps] + [point.x for point in pps]
-    all_y = [point.y for point in tps] + [point.y for point in pps]
-    ax.set_xlim(min(all_x) - 1, max(all_x) + 1)
-    ax.set_ylim(min(all_y) - 1, max(all_y) + 1)
+    lower = np.minimum(tps.min(axis=0), pps.min(axis=0))
+    upper = np.maximum(tps.max(axis=0), pps.max(axis=0))
+    ax.set_xlim(lower[0] - 1, upper[0] + 1)
+    ax.set_ylim(lower[1] - 1, upper[1] + 1)
 
     (line_target,) = ax.plot([], [], "ro-", label="Target (Cel)", linewidth=2, markersize=8)
     (line_pursuer,) = ax.plot([], [], "bo-", label="Pursuer (Ścigający)", linewidth=2, markersize=8)
@@ -37,16 +38,12 @@ def animate_pursuit(simulation: Simulation) -> None:
         return line_target, line_pursuer, current_target, current_pursuer
 
     def animate_frame(frame: int) -> tuple[Line2D, Line2D, Line2D, Line2D]:
-        x_coords_target = [tps[i].x for i in range(frame + 1)]
-        y_coords_target = [tps[i].y for i in range(frame + 1)]
-        line_target.set_data(x_coords_target, y_coords_target)
+        # Wycinki tablic są widokami - bez kopiowania współrzędnych w każdej klatce
+        line_target.set_data(tps[: frame + 1, 0], tps[: frame + 1, 1])
+        line_pursuer.set_data(pps[: frame + 1, 0], pps[: frame + 1, 1])
 
-        x_coords_pursuer = [pps[i].x for i in range(frame + 1)]
-        y_coords_pursuer = [pps[i].y for i in range(frame + 1)]
-        line_pursuer.set_data(x_coords_pursuer, y_coords_pursuer)
-
-        current_target.set_data([tps[frame].x], [tps[frame].y])
-        current_pursuer.set_data([pps[frame].x], [pps[frame].y])
+        current_target.set_data(tps[frame : frame + 1, 0], tps[frame : frame + 1, 1])
+        current_pursuer.set_data(pps[frame : frame + 1, 0], pps[frame : frame + 1, 1])
 
         return line_target, line_pursuer, current_target, current_pursuer
 
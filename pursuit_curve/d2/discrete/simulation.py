@@ -1,6 +1,13 @@
+import logging
+
+import numpy as np
+from numpy.typing import NDArray
+
 from pursuit_curve.common import Point2D
 
-from .types import Strategy, TargetStrategy
+from .types import Point2DView, Strategy, TargetStrategy
+
+logger = logging.getLogger(__name__)
 
 
 class Simulation:
@@ -12,39 +19,78 @@ class Simulation:
         strategy: Strategy,
         target_strategy: TargetStrategy,
         max_iters: int = 1000,
+        capture_radius: float = 0.45,
     ):
-        self.pursuer_positions = [pursuer_start]
-        self.target_positions = [target_start]
         self.pursuer_velocity = pursuer_velocity
         self.strategy = strategy
         self.target_strategy = target_strategy
         self.max_iters = max_iters
+        self.capture_radius = capture_radius
+        self._pursuer = np.array([[pursuer_start.x, pursuer_start.y]], dtype=np.float64)
+        self._target = np.array([[target_start.x, target_start.y]], dtype=np.float64)
+        self.caught = False
 
-    def _step(self) -> tuple[Point2D, Point2D]:
-        target = self.target_positions[-1]
-        target = self.target_strategy.calculate_movement(target)
-        self.target_positions.append(target)
+    @property
+    def pursuer_trajectory(self) -> NDArray[np.float64]:
+        """Pozycje ścigającego (n, 2)"""
+        return self._pursuer
 
-        pursuer = self.pursuer_positions[-1]
-        movement = self.strategy.calculate_movement(pursuer, target, self.pursuer_velocity)
-        pursuer += movement
-        self.pursuer_positions.append(pursuer)
+    @property
+    def target_trajectory(self) -> NDArray[np.float64]:
+        """Pozycje celu (n, 2)"""
+        return self._target
 
-        return pursuer, target
+    @property
+    def pursuer_positions(self) -> Point2DView:
+        return Point2DView(self.pursuer_trajectory)
 
-    def _should_stop(self, pursuer: Point2D, target: Point2D) -> bool:
-        dx = target.x - pursuer.x
-        dy = target.y - pursuer.y
-        dist = (dx * dx + dy * dy) ** 0.5
-        return dist < 0.45
+    @property
+    def target_positions(self) -> Point2DView:
+        return Point2DView(self.target_trajectory)
 
     def run(self) -> None:
-        caught = False
-        for i in range(self.max_iters):
-            p, t = self._step()
-            if self._should_stop(p, t):
-                print(f"Złapano cel po {i} krokach.")
-                caught = True
+        # Bufory na max_iters kolejnych kroków, przycinane do kroku złapania po zakończeniu pętli
+        start = len(self._pursuer)
+        pursuer = np.empty((start + self.max_iters, 2))
+        target = np.empty((start + self.max_iters, 2))
+        pursuer[:start] = self._pursuer
+        target[:start] = self._target
+
+        vx, vy = self.pursuer_velocity.x, self.pursuer_velocity.y
+        px, py = pursuer[start - 1].tolist()
+        tx, ty = target[start - 1].tolist()
+        move_target = self.target_strategy.calculate_movement_xy
+        move_pursuer = self.strategy.calculate_movement_xy
+        radius2 = self.capture_radius * self.capture_radius
+
+        # Zapis przez memoryview płaskich buforów jest wielokrotnie szybszy niż przypisanie wiersza tablicy
+        pursuer_flat = memoryview(pursuer.reshape(-1))
+        target_flat = memoryview(target.reshape(-1))
+
+        self.caught = False
+        size = start
+        for _ in range(self.max_iters):
+            tx, ty = move_target(tx, ty)
+            mx, my = move_pursuer(px, py, tx, ty, vx, vy)
+            px += mx
+            py += my
+            pursuer_flat[2 * size] = px
+            pursuer_flat[2 * size + 1] = py
+            target_flat[2 * size] = tx
+            target_flat[2 * size + 1] = ty
+            size += 1
+            dx = tx - px
+            dy = ty - py
+            if dx * dx + dy * dy < radius2:
+                self.caught = True
                 break
-        if not caught:
-            print(f"Nie udało się złapać celu po {self.max_iters} krokach.")
+
+        # Kopia zwalnia niewykorzystaną część bufora
+        if size < len(pursuer):
+            pursuer, target = pursuer[:size].copy(), target[:size].copy()
+        self._pursuer, self._target = pursuer, target
+
+        if self.caught:
+            logger.info("Złapano cel po %d krokach.", size - start - 1, extra={"n_steps": size - start - 1})
+        else:
+            logger.info("Nie udało się złapać celu po %d krokach.", self.max_iters, extra={"n_steps": self.max_iters})
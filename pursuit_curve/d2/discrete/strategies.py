@@ -9,9 +9,16 @@ class DirectPursuit(Strategy):
     """Kierunek wprost na cel."""
 
     def calculate_movement(self, pursuer: Point2D, target: Point2D, pursuer_velocity: Point2D) -> Point2D:
-        w = target - pursuer
-        norm = (w.x * w.x + w.y * w.y) ** 0.5
-        return Point2D(pursuer_velocity.x * w.x / norm, pursuer_velocity.y * w.y / norm)
+        v = pursuer_velocity
+        return Point2D(*self.calculate_movement_xy(pursuer.x, pursuer.y, target.x, target.y, v.x, v.y))
+
+    def calculate_movement_xy(
+        self, px: float, py: float, tx: float, ty: float, vx: float, vy: float
+    ) -> tuple[float, float]:
+        wx = tx - px
+        wy = ty - py
+        norm = (wx * wx + wy * wy) ** 0.5
+        return vx * wx / norm, vy * wy / norm
 
 
 class ConstantBearing(Strategy):
@@ -21,13 +28,15 @@ class ConstantBearing(Strategy):
         self.bearing_angle = math.radians(bearing_angle_deg)
 
     def calculate_movement(self, pursuer: Point2D, target: Point2D, pursuer_velocity: Point2D) -> Point2D:
-        w = target - pursuer
-        angle_to_target = math.atan2(w.y, w.x)
+        v = pursuer_velocity
+        return Point2D(*self.calculate_movement_xy(pursuer.x, pursuer.y, target.x, target.y, v.x, v.y))
+
+    def calculate_movement_xy(
+        self, px: float, py: float, tx: float, ty: float, vx: float, vy: float
+    ) -> tuple[float, float]:
+        angle_to_target = math.atan2(ty - py, tx - px)
         movement_angle = angle_to_target + self.bearing_angle
-        return Point2D(
-            pursuer_velocity.x * math.cos(movement_angle),
-            pursuer_velocity.y * math.sin(movement_angle),
-        )
+        return vx * math.cos(movement_angle), vy * math.sin(movement_angle)
 
 
 class ProportionalNavigation(Strategy):
@@ -40,18 +49,19 @@ class ProportionalNavigation(Strategy):
     def __init__(self, N: float = 3.0):
         self.N = N
         self.previous_los_angle: float | None = None
-        self.previous_pursuer_vel: Point2D | None = None
+        self.previous_pursuer_vel: tuple[float, float] | None = None
 
     def calculate_movement(self, pursuer: Point2D, target: Point2D, pursuer_velocity: Point2D) -> Point2D:
-        w = target - pursuer
+        v = pursuer_velocity
+        return Point2D(*self.calculate_movement_xy(pursuer.x, pursuer.y, target.x, target.y, v.x, v.y))
 
-        los_angle = math.atan2(w.y, w.x)
+    def calculate_movement_xy(
+        self, px: float, py: float, tx: float, ty: float, vx: float, vy: float
+    ) -> tuple[float, float]:
+        los_angle = math.atan2(ty - py, tx - px)
         if self.previous_los_angle is None:
             self.previous_los_angle = los_angle
-            self.previous_pursuer_vel = Point2D(
-                pursuer_velocity.x * math.cos(los_angle),
-                pursuer_velocity.y * math.sin(los_angle),
-            )
+            self.previous_pursuer_vel = (vx * math.cos(los_angle), vy * math.sin(los_angle))
             return self.previous_pursuer_vel
 
         delta_los_angle = los_angle - self.previous_los_angle
@@ -63,13 +73,10 @@ class ProportionalNavigation(Strategy):
         if self.previous_pursuer_vel is None:
             pursuer_angle = los_angle
         else:
-            pursuer_angle = math.atan2(self.previous_pursuer_vel.y, self.previous_pursuer_vel.x)
+            pursuer_angle = math.atan2(self.previous_pursuer_vel[1], self.previous_pursuer_vel[0])
 
         new_pursuer_angle = pursuer_angle + self.N * delta_los_angle
-        new_vel = Point2D(
-            pursuer_velocity.x * math.cos(new_pursuer_angle),
-            pursuer_velocity.y * math.sin(new_pursuer_angle),
-        )
+        new_vel = (vx * math.cos(new_pursuer_angle), vy * math.sin(new_pursuer_angle))
 
         self.previous_los_angle = los_angle
         self.previous_pursuer_vel = new_vel
@@ -82,9 +89,11 @@ class TargetCircleStrategy(TargetStrategy):
     def __init__(self, angular_velocity: float, dt: float):
         self.angular_velocity = angular_velocity
         self.dt = dt
+        self._cos = math.cos(angular_velocity * dt)
+        self._sin = math.sin(angular_velocity * dt)
 
     def calculate_movement(self, target: Point2D) -> Point2D:
-        return Point2D(
-            target.x * math.cos(self.angular_velocity * self.dt) - target.y * math.sin(self.angular_velocity * self.dt),
-            target.x * math.sin(self.angular_velocity * self.dt) + target.y * math.cos(self.angular_velocity * self.dt),
-        )
+        return Point2D(*self.calculate_movement_xy(target.x, target.y))
+
+    def calculate_movement_xy(self, x: float, y: float) -> tuple[float, float]:
+        return x * self._cos - y * self._sin, x * self._sin + y * self._cos
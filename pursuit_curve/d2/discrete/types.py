@@ -1,4 +1,9 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from typing import overload
+
+import numpy as np
+from numpy.typing import NDArray
 
 from pursuit_curve.common import Point2D
 
@@ -7,7 +12,51 @@ class Strategy(ABC):
     @abstractmethod
     def calculate_movement(self, pursuer: Point2D, target: Point2D, pursuer_velocity: Point2D) -> Point2D: ...
 
+    def calculate_movement_xy(
+        self, px: float, py: float, tx: float, ty: float, vx: float, vy: float
+    ) -> tuple[float, float]:
+        """
+        To samo co calculate_movement(), ale na liczbach - bez tworzenia obiektów Point2D.
+        Domyślnie deleguje do calculate_movement(), strategie wbudowane nadpisują ją wersją skalarną.
+        """
+        movement = self.calculate_movement(Point2D(px, py), Point2D(tx, ty), Point2D(vx, vy))
+        return movement.x, movement.y
+
 
 class TargetStrategy(ABC):
     @abstractmethod
     def calculate_movement(self, target: Point2D) -> Point2D: ...
+
+    def calculate_movement_xy(self, x: float, y: float) -> tuple[float, float]:
+        """Nowa pozycja celu na liczbach, domyślnie przez calculate_movement()."""
+        target = self.calculate_movement(Point2D(x, y))
+        return target.x, target.y
+
+
+class Point2DView(Sequence[Point2D]):
+    """Widok tablicy (n, 2) jako sekwencji Point2D - obiekty tworzone są dopiero przy odczycie."""
+
+    def __init__(self, data: NDArray[np.float64]):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> Point2D: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Point2DView": ...
+
+    def __getitem__(self, index: int | slice) -> "Point2D | Point2DView":
+        if isinstance(index, slice):
+            return Point2DView(self.data[index])
+        x, y = self.data[index]
+        return Point2D(float(x), float(y))
+
+    def __iter__(self) -> Iterator[Point2D]:
+        for x, y in self.data.tolist():
+            yield Point2D(x, y)
+
+    def __repr__(self) -> str:
+        return f"Point2DView(n={len(self)})"
@@ -1,34 +1,37 @@
-import matplotlib.animation as animation
+import logging
+from functools import partial
+
 import matplotlib.pyplot as plt
-import numpy as np
+from matplotlib.animation import AbstractMovieWriter
 from matplotlib.lines import Line2D
 from matplotlib.text import Text
 
+from pursuit_curve.rendering import (
+    FrameSource,
+    Scene,
+    TrailBuffer,
+    pixel_size,
+    render_animation,
+    render_raster,
+    trail_capacity,
+)
+
+logger = logging.getLogger(__name__)
 
-def animate_continuous_pursuit_3d(solution, num_frames: int = 200) -> None:
-    """Animacja 3D dla symulacji ciągłej pościgu."""
-    t_eval = np.linspace(solution.t[0], solution.t[-1], num_frames)
-    y_interp = solution.sol(t_eval)
 
-    pursuer_x = y_interp[0]
-    pursuer_y = y_interp[1]
-    pursuer_z = y_interp[2]
-    target_x = y_interp[3]
-    target_y = y_interp[4]
-    target_z = y_interp[5]
+def _continuous_pursuit_3d_scene(solution, num_frames: int, trail_length: int | None) -> Scene:
+    frames = FrameSource(solution, num_frames, dim=3)
 
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection="3d")
 
     # Zakres osi
-    all_x = np.concatenate([pursuer_x, target_x])
-    all_y = np.concatenate([pursuer_y, target_y])
-    all_z = np.concatenate([pursuer_z, target_z])
+    lower, upper = frames.bounds()
     margin = 1.0
 
-    ax.set_xlim(all_x.min() - margin, all_x.max() + margin)
-    ax.set_ylim(all_y.min() - margin, all_y.max() + margin)
-    ax.set_zlim(all_z.min() - margin, all_z.max() + margin)
+    ax.set_xlim(lower[0] - margin, upper[0] + margin)
+    ax.set_ylim(lower[1] - margin, upper[1] + margin)
+    ax.set_zlim(lower[2] - margin, upper[2] + margin)
 
     # Linie trajektorii
     (line_target,) = ax.plot([], [], [], "r-", label="Target (Cel)", linewidth=2, alpha=0.6)
@@ -39,38 +42,11 @@ def animate_continuous_pursuit_3d(solution, num_frames: int = 200) -> None:
     (current_pursuer,) = ax.plot([], [], [], "bo", markersize=10, alpha=0.8)
 
     # Start i koniec
-    ax.plot(
-        [target_x[0]],
-        [target_y[0]],
-        [target_z[0]],
-        "r^",
-        markersize=12,
-        label="Start T",
-    )
-    ax.plot(
-        [pursuer_x[0]],
-        [pursuer_y[0]],
-        [pursuer_z[0]],
-        "b^",
-        markersize=12,
-        label="Start P",
-    )
-    ax.plot(
-        [target_x[-1]],
-        [target_y[-1]],
-        [target_z[-1]],
-        "rx",
-        markersize=12,
-        label="End T",
-    )
-    ax.plot(
-        [pursuer_x[-1]],
-        [pursuer_y[-1]],
-        [pursuer_z[-1]],
-        "bx",
-        markersize=12,
-        label="End P",
-    )
+    (pursuer_start, target_start), (pursuer_end, target_end) = frames[0].copy(), frames[-1].copy()
+    ax.plot(*target_start[:, None], "r^", markersize=12, label="Start T")
+    ax.plot(*pursuer_start[:, None], "b^", markersize=12, label="Start P")
+    ax.plot(*target_end[:, None], "rx", markersize=12, label="End T")
+    ax.plot(*pursuer_end[:, None], "bx", markersize=12, label="End P")
 
     # Tekst czasu
     time_text = ax.text2D(
@@ -89,6 +65,8 @@ def animate_continuous_pursuit_3d(solution, num_frames: int = 200) -> None:
     ax.set_zlabel("Z", fontsize=12)
     ax.set_title("3D Continuous Pursuit Simulation", fontsize=14)
 
+    trail = TrailBuffer(2, 3, trail_capacity(num_frames, trail_length), min_spacing=pixel_size(ax))
+
     def init() -> tuple[Line2D, Line2D, Line2D, Line2D, Text]:
         line_target.set_data([], [])
         line_target.set_3d_properties([])  # type: ignore [attr-defined]
@@ -106,39 +84,70 @@ def animate_continuous_pursuit_3d(solution, num_frames: int = 200) -> None:
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
     def animate_frame(frame: int) -> tuple[Line2D, Line2D, Line2D, Line2D, Text]:
+        if frame == 0:
+            trail.clear()
+        positions = frames[frame]
+        trail.push(positions)
+
         # Trajektorie
-        line_target.set_data(target_x[: frame + 1], target_y[: frame + 1])
-        line_target.set_3d_properties(target_z[: frame + 1])  # type: ignore [attr-defined]
+        pursuer_trail, target_trail = trail.points(0), trail.points(1)
+        line_target.set_data(target_trail[:, 0], target_trail[:, 1])
+        line_target.set_3d_properties(target_trail[:, 2])  # type: ignore [attr-defined]
 
-        line_pursuer.set_data(pursuer_x[: frame + 1], pursuer_y[: frame + 1])
-        line_pursuer.set_3d_properties(pursuer_z[: frame + 1])  # type: ignore [attr-defined]
+        line_pursuer.set_data(pursuer_trail[:, 0], pursuer_trail[:, 1])
+        line_pursuer.set_3d_properties(pursuer_trail[:, 2])  # type: ignore [attr-defined]
 
         # Aktualna pozycja
-        current_target.set_data([target_x[frame]], [target_y[frame]])
-        current_target.set_3d_properties([target_z[frame]])  # type: ignore [attr-defined]
+        current_target.set_data(positions[1:2, 0], positions[1:2, 1])
+        current_target.set_3d_properties(positions[1:2, 2])  # type: ignore [attr-defined]
 
-        current_pursuer.set_data([pursuer_x[frame]], [pursuer_y[frame]])
-        current_pursuer.set_3d_properties([pursuer_z[frame]])  # type: ignore [attr-defined]
+        current_pursuer.set_data(positions[0:1, 0], positions[0:1, 1])
+        current_pursuer.set_3d_properties(positions[0:1, 2])  # type: ignore [attr-defined]
 
         # Czas
-        time_text.set_text(f"Time: {t_eval[frame]:.2f}s")
+        time_text.set_text(f"Time: {frames.t[frame]:.2f}s")
 
         # Obróć kamerę dla lepszego efektu
         ax.view_init(elev=20, azim=frame * 0.3)
 
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
-    anim = animation.FuncAnimation(
-        fig,
-        animate_frame,
-        init_func=init,
-        frames=num_frames,
-        interval=50,
-        blit=False,  # blit musi być False dla 3D
-        repeat=True,
-    )
-
-    filename = "animation_3d.mp4"
-    anim.save(filename, writer="ffmpeg", fps=30)
-    plt.close(fig)
-    print(f"Animacja 3D zapisana do: {filename}")
+    return Scene(fig, animate_frame, init, frames, trail)
+
+
+def animate_continuous_pursuit_3d(
+    solution,
+    num_frames: int = 200,
+    trail_length: int | None = None,
+    file: str = "animation_3d.mp4",
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> None:
+    """
+    Animacja 3D dla symulacji ciągłej pościgu.
+    trail_length: Długość śladu w klatkach (None - cała historia, zdecymowana do rozmiaru piksela)
+    workers: Liczba procesów rysujących klatki (rendering.render_parallel); 1 - FuncAnimation
+    backend: "matplotlib" albo "raster" - szybki eksport bez Matplotlib (rendering.render_raster, writer
+             wybierany po rozszerzeniu file: wideo, .png, .npz)
+    """
+    if backend == "raster":
+        render_raster(
+            FrameSource(solution, num_frames, dim=3),
+            file,
+            ["blue", "red"],
+            trail_length=trail_length,
+            rotation=0.3,
+        )
+    elif backend == "matplotlib":
+        render_animation(
+            partial(_continuous_pursuit_3d_scene, solution, num_frames, trail_length),
+            num_frames,
+            file,
+            writer,
+            workers=workers,
+            blit=False,
+        )
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
+    logger.info("Animacja 3D zapisana do: %s", file, extra={"file": str(file)})
@@ -3,65 +3,104 @@ import math
 import numpy as np
 from numpy.typing import NDArray
 
-from pursuit_curve.common import Point3D, Strategy, TargetStrategy
+from pursuit_curve.common import KernelSpec, Point3D, Strategy, TargetStrategy, kernels, numba_enabled, stack_components
+from pursuit_curve.common.events import CAPTURE_RADIUS
 
 
 class ContinuousDirectPursuit3D(Strategy):
-    def __init__(self, pursuer_velocity: Point3D, target_strategy: TargetStrategy):
+    distance_cached = True
+
+    def __init__(
+        self, pursuer_velocity: Point3D, target_strategy: TargetStrategy, capture_radius: float = CAPTURE_RADIUS
+    ):
         self.pursuer_velocity = pursuer_velocity
         self.target_strategy = target_strategy
+        self.capture_radius = capture_radius
+        self._speed = stack_components(pursuer_velocity.x, pursuer_velocity.y, pursuer_velocity.z)
+        self._speed_x, self._speed_y, self._speed_z = (float(v) for v in self._speed[:, 0])
+        self.kernel_spec = KernelSpec(
+            kernels.direct_pursuit,
+            kernels.direct_pursuit_stop,
+            params=np.concatenate([self._speed[:, 0], target_strategy.calculate_movement(0.0)]),
+            stop_params=np.array([capture_radius]),
+            target_strategy=target_strategy,
+            target_offset=3,
+        )
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        pursuer_pos = y[0:3]
-        target_pos = y[3:6]
-
-        target_vel = self.target_strategy.calculate_movement(t)
-
-        direction = target_pos - pursuer_pos
-        distance = np.linalg.norm(direction)
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(6)
+        pursuer_x, pursuer_y, pursuer_z, target_x, target_y, target_z = y
+
+        dx = target_x - pursuer_x
+        dy = target_y - pursuer_y
+        dz = target_z - pursuer_z
+        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+        self._distance_state, self._distance = y, distance
         if distance < 1e-6:
-            pursuer_vel = np.array([0.0, 0.0, 0.0], dtype=np.float32)
+            out[0] = out[1] = out[2] = 0.0
         else:
-            pursuer_vel = (direction / distance) * np.array(
-                [
-                    self.pursuer_velocity.x,
-                    self.pursuer_velocity.y,
-                    self.pursuer_velocity.z,
-                ],
-                dtype=np.float32,
-            )
-
-        return np.concatenate([pursuer_vel, target_vel])
-
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0:3], dtype=np.float32)
-        target_pos = np.array(y[3:6], dtype=np.float32)
-        distance = np.linalg.norm(target_pos - pursuer_pos)
-        return distance - 0.5
+            out[0] = self._speed_x * dx / distance
+            out[1] = self._speed_y * dy / distance
+            out[2] = self._speed_z * dz / distance
+        out[3:6] = self.target_strategy.calculate_movement(t)
+        return out
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """Y - tablica (6, M). Składowe prędkości mogą być tablicami (M,)."""
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(3, -1)
+        speed = self._speed
+
+        direction = Y[3:6] - Y[0:3]
+        distance = np.linalg.norm(direction, axis=0)
+        safe_distance = np.where(distance < 1e-6, np.inf, distance)
+
+        dY = np.empty(np.broadcast_shapes(Y.shape, (6, speed.shape[1]), (6, target_vel.shape[1])))
+        dY[0:3] = direction / safe_distance * speed
+        dY[3:6] = target_vel
+        return dY
+
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        state = y.tolist()
+        return math.dist(state[0:3], state[3:6])
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        return np.linalg.norm(Y[3:6] - Y[0:3], axis=0) - self.capture_radius
+
 
 class ContinuousTargetLinearStrategy3D(TargetStrategy):
     """Strategia dla celu poruszającego się liniowo."""
 
+    constant_velocity = True
+
     def __init__(self, velocity: Point3D):
-        self.velocity = velocity
+        self.linear_velocity = velocity
+        self._velocity = np.array([velocity.x, velocity.y, velocity.z], dtype=np.float64)
+        self._velocity.flags.writeable = False
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array(
-            [self.velocity.x, self.velocity.y, self.velocity.z],
-            dtype=np.float32,
-        )
+        return self._velocity
 
 
 class ContinuousTargetHelixStrategy(TargetStrategy):
-    """Strategia dla celu poruszającego się po helisie."""
+    """
+    Strategia dla celu poruszającego się po helisie.
+    Oś helisy leży o r w kierunku -x od pozycji celu w chwili 0.
+    """
 
-    # x(t) = rcos(ωt)
-    # y(t) = rsin(ωt)
-    # z(t) = v_z*t
+    # x(t) = x_s + rcos(ωt)
+    # y(t) = y_s + rsin(ωt)
+    # z(t) = z_s + v_z*t
 
     def __init__(self, r: float, angular_velocity: float, vertical_velocity: float):
         self.r = r
@@ -69,33 +108,48 @@ class ContinuousTargetHelixStrategy(TargetStrategy):
         self.vertical_velocity = vertical_velocity
 
     def calculate_movement(self, t: float) -> np.ndarray:
+        phase = self.angular_velocity * t
+        speed = self.r * self.angular_velocity
+        return np.array([-speed * math.sin(phase), speed * math.cos(phase), self.vertical_velocity])
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply(self.angular_velocity, t)
+        speed = self.r * self.angular_velocity
+        return np.array([-speed * np.sin(phase), speed * np.cos(phase), np.full_like(phase, self.vertical_velocity)])
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply(self.angular_velocity, t)
         return np.array(
-            [
-                self.r * math.cos(self.angular_velocity * t),
-                self.r * math.sin(self.angular_velocity * t),
-                self.vertical_velocity * t,
-            ],
-            dtype=np.float32,
+            [self.r * (np.cos(phase) - 1.0), self.r * np.sin(phase), np.multiply(self.vertical_velocity, t)]
         )
 
 
 class ContinuousTargetLissajousStrategy(TargetStrategy):
-    """Strategia dla celu poruszającego się po krzywej Lissajous."""
+    """Strategia dla celu poruszającego się po krzywej Lissajous wokół pozycji celu w chwili 0."""
 
-    # x(t) = A_x*sin(ω_x*t)
-    # y(t) = A_y*sin(ω_y*t)
-    # z(t) = A_z*sin(ω_z*t)
+    # x(t) = x_s + A_x*sin(ω_x*t)
+    # y(t) = y_s + A_y*sin(ω_y*t)
+    # z(t) = z_s + A_z*sin(ω_z*t)
 
     def __init__(self, A: Point3D, angular_velocity: Point3D):
         self.A = A
         self.angular_velocity = angular_velocity
+        self._amplitude = np.array([A.x, A.y, A.z], dtype=np.float64)
+        self._omega = np.array([angular_velocity.x, angular_velocity.y, angular_velocity.z], dtype=np.float64)
 
     def calculate_movement(self, t: float) -> np.ndarray:
         return np.array(
             [
-                self.A.x * math.sin(self.angular_velocity.x * t),
-                self.A.y * math.sin(self.angular_velocity.y * t),
-                self.A.z * math.sin(self.angular_velocity.z * t),
-            ],
-            dtype=np.float32,
+                self.A.x * self.angular_velocity.x * math.cos(self.angular_velocity.x * t),
+                self.A.y * self.angular_velocity.y * math.cos(self.angular_velocity.y * t),
+                self.A.z * self.angular_velocity.z * math.cos(self.angular_velocity.z * t),
+            ]
         )
+
+    def velocity(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply.outer(self._omega, t)
+        return (np.cos(phase).T * (self._amplitude * self._omega)).T
+
+    def displacement(self, t: float | np.ndarray) -> np.ndarray:
+        phase = np.multiply.outer(self._omega, t)
+        return (np.sin(phase).T * self._amplitude).T
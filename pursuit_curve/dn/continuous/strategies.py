@@ -1,48 +1,92 @@
+import math
+
 import numpy as np
 from numpy.typing import NDArray
 
-from pursuit_curve.common import PointND, Strategy, TargetStrategy
+from pursuit_curve.common import KernelSpec, PointND, Strategy, TargetStrategy, kernels, numba_enabled, stack_components
+from pursuit_curve.common.events import CAPTURE_RADIUS
 
 
 class ContinuousDirectPursuitND(Strategy):
-    def __init__(self, pursuer_velocity: PointND, target_strategy: TargetStrategy):
+    distance_cached = True
+
+    def __init__(
+        self, pursuer_velocity: PointND, target_strategy: TargetStrategy, capture_radius: float = CAPTURE_RADIUS
+    ):
         self.n = pursuer_velocity.dim
         self.pursuer_velocity = pursuer_velocity
         self.target_strategy = target_strategy
+        self.capture_radius = capture_radius
+        self._speed = stack_components(*pursuer_velocity.to_list())
+        self._speed_1d = np.ascontiguousarray(self._speed[:, 0])
+        self._direction = np.empty(self.n)
+        self.kernel_spec = KernelSpec(
+            kernels.direct_pursuit,
+            kernels.direct_pursuit_stop,
+            params=np.concatenate([self._speed_1d, target_strategy.calculate_movement(0.0)]),
+            stop_params=np.array([capture_radius]),
+            target_strategy=target_strategy,
+            target_offset=self.n,
+        )
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        pursuer_pos = y[0 : self.n]
-        target_pos = y[self.n : 2 * self.n]
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(2 * self.n)
+        pursuer_vel = out[0 : self.n]
 
-        target_vel = self.target_strategy.calculate_movement(t)
-
-        direction = target_pos - pursuer_pos
-        distance = np.linalg.norm(direction)
+        np.subtract(y[self.n : 2 * self.n], y[0 : self.n], out=self._direction)
+        distance = math.sqrt(np.dot(self._direction, self._direction))
+        self._distance_state, self._distance = y, distance
         if distance < 1e-6:
-            pursuer_vel = np.zeros(self.n, dtype=np.float32)
+            pursuer_vel.fill(0.0)
         else:
-            pursuer_vel = (direction / distance) * np.array(
-                self.pursuer_velocity.to_list(),
-                dtype=np.float32,
-            )
+            np.multiply(self._direction, self._speed_1d, out=pursuer_vel)
+            pursuer_vel *= 1.0 / distance
+        out[self.n : 2 * self.n] = self.target_strategy.calculate_movement(t)
+        return out
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """Y - tablica (2n, M). Składowe prędkości mogą być tablicami (M,)."""
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(self.n, -1)
+        speed = self._speed
 
-        return np.concatenate([pursuer_vel, target_vel])
+        direction = Y[self.n : 2 * self.n] - Y[0 : self.n]
+        distance = np.linalg.norm(direction, axis=0)
+        safe_distance = np.where(distance < 1e-6, np.inf, distance)
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0 : self.n], dtype=np.float32)
-        target_pos = np.array(y[self.n : 2 * self.n], dtype=np.float32)
-        distance = np.linalg.norm(target_pos - pursuer_pos)
-        return distance - 0.5
+        shape = np.broadcast_shapes(Y.shape, (2 * self.n, speed.shape[1]), (2 * self.n, target_vel.shape[1]))
+        dY = np.empty(shape)
+        dY[0 : self.n] = direction / safe_distance * speed
+        dY[self.n : 2 * self.n] = target_vel
+        return dY
+
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        np.subtract(y[self.n : 2 * self.n], y[0 : self.n], out=self._direction)
+        return math.sqrt(np.dot(self._direction, self._direction))
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        return np.linalg.norm(Y[self.n : 2 * self.n] - Y[0 : self.n], axis=0) - self.capture_radius
+
 
 class ContinuousTargetLinearStrategyND(TargetStrategy):
     """Strategia dla celu poruszającego się liniowo w przestrzeni N-wymiarowej."""
 
+    constant_velocity = True
+
     def __init__(self, velocity: PointND):
-        self.velocity = velocity
+        self.linear_velocity = velocity
+        self._velocity = np.array(velocity.to_list(), dtype=np.float64)
+        self._velocity.flags.writeable = False
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array(self.velocity.to_list(), dtype=np.float32)
+        return self._velocity
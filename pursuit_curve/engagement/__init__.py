@@ -0,0 +1,7 @@
+from .engine import EngagementResult, MultiPursuit, run_engagement
+
+__all__ = [
+    "EngagementResult",
+    "MultiPursuit",
+    "run_engagement",
+]
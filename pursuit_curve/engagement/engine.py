@@ -0,0 +1,263 @@
+"""
+Starcie M ścigających z K uciekającymi w przestrzeni dim-wymiarowej.
+
+Stan to płaska tablica [pozycje ścigających (M * dim), pozycje uciekających (K * dim)]. Każdy aktywny
+ścigający kieruje się na najbliższego niezłapanego uciekającego - przypisanie liczone jest przy każdym
+wywołaniu dynamiki przez KD-drzewo (scipy.spatial.cKDTree) zbudowane na pozycjach żywych uciekających,
+czyli O((M + K) log K) zamiast O(M * K). Drzewo budowane jest od nowa przy każdym wywołaniu, bo
+uciekający poruszają się między wywołaniami; złapani uciekający po prostu do niego nie trafiają.
+
+Strategia działa z run_continuous_simulation - stop_condition to wtedy pierwsze złapanie. Całe starcie
+liczy run_engagement: po każdym kroku integratora usuwa złapane pary (uciekającego, a z consume_pursuer
+także ścigającego), a pozostali ścigający w kolejnym wywołaniu dynamiki wybierają nowe cele.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy.spatial import cKDTree
+
+from pursuit_curve.common import Strategy, TargetStrategy
+from pursuit_curve.common.events import CAPTURE_RADIUS
+from pursuit_curve.common.integrators import STEPPERS, HermiteDenseOutput, TrajectoryBuffer, step_factor
+
+INITIAL_CAPACITY = 256
+"""Początkowa liczba kroków w buforze trajektorii (bufor rośnie przez podwajanie)"""
+
+Sink = Callable[[float, NDArray[np.float64], NDArray[np.float64]], None]
+
+
+class MultiPursuit(Strategy):
+    """
+    n_pursuers: Liczba ścigających M
+    n_evaders: Liczba uciekających K
+    evader_strategy: Ruch uciekających - calculate_movement(t) zwraca prędkość (dim,) wspólną dla
+                     wszystkich albo (K * dim,) / (K, dim) osobno dla każdego
+    speed: Prędkość ścigających - skalar albo tablica (M,)
+    dim: Wymiar przestrzeni
+    capture_radius: Odległość złapania
+    consume_pursuer: Czy ścigający po złapaniu kończy udział (np. pocisk); domyślnie szuka kolejnego celu
+    """
+
+    runtime_state = ("active", "alive", "capture_times", "captured_by")
+
+    def __init__(
+        self,
+        n_pursuers: int,
+        n_evaders: int,
+        evader_strategy: TargetStrategy,
+        speed: float | ArrayLike = 1.0,
+        dim: int = 2,
+        capture_radius: float = CAPTURE_RADIUS,
+        consume_pursuer: bool = False,
+    ):
+        self.n_pursuers = n_pursuers
+        self.n_evaders = n_evaders
+        self.evader_strategy = evader_strategy
+        self.dim = dim
+        self.capture_radius = capture_radius
+        self.consume_pursuer = consume_pursuer
+        speed_arr = np.asarray(speed, dtype=np.float64)
+        self.speed = speed_arr if speed_arr.ndim == 0 else speed_arr[:, np.newaxis]
+        self.n_states = (n_pursuers + n_evaders) * dim
+        self.reset()
+
+    def reset(self) -> None:
+        """Wszyscy ścigający aktywni, wszyscy uciekający żywi, bez złapań."""
+        self.active = np.ones(self.n_pursuers, dtype=bool)
+        self.alive = np.ones(self.n_evaders, dtype=bool)
+        self.capture_times = np.full(self.n_evaders, np.nan)
+        self.captured_by = np.full(self.n_evaders, -1, dtype=np.intp)
+        self._update_sets()
+
+    def _update_sets(self) -> None:
+        self._active_index = np.flatnonzero(self.active)
+        self._alive_index = np.flatnonzero(self.alive)
+
+    def split(self, y: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Widoki (M, dim) pozycji ścigających i (K, dim) pozycji uciekających."""
+        cut = self.n_pursuers * self.dim
+        return y[:cut].reshape(self.n_pursuers, self.dim), y[cut:].reshape(self.n_evaders, self.dim)
+
+    def assign(self, y: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.intp]]:
+        """
+        Najbliższy żywy uciekający dla każdego aktywnego ścigającego.
+        Zwraca (odległości, indeksy uciekających) - tablice długości liczby aktywnych ścigających.
+        """
+        pursuers, evaders = self.split(np.asarray(y, dtype=np.float64))
+        if not len(self._alive_index) or not len(self._active_index):
+            return np.empty(0), np.empty(0, dtype=np.intp)
+        tree = cKDTree(evaders[self._alive_index])
+        dists, nearest = tree.query(pursuers[self._active_index])
+        return dists, self._alive_index[nearest]
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if out is None:
+            out = np.empty(self.n_states)
+        pursuers, evaders = self.split(y)
+        pursuer_vel, evader_vel = self.split(out)
+
+        pursuer_vel.fill(0.0)
+        dists, targets = self.assign(y)
+        if len(targets):
+            active = self._active_index
+            direction = evaders[targets] - pursuers[active]
+            speed = self.speed if self.speed.ndim == 0 else self.speed[active]
+            pursuer_vel[active] = direction * (speed / np.maximum(dists, 1e-12)[:, np.newaxis])
+
+        movement = np.asarray(self.evader_strategy.calculate_movement(t), dtype=np.float64)
+        evader_vel[:] = movement.reshape(-1, self.dim)
+        evader_vel[~self.alive] = 0.0
+        return out
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        """Najmniejsza nadwyżka odległości ścigającego od jego celu nad capture_radius."""
+        dists, _ = self.assign(np.asarray(y, dtype=np.float64))
+        if not len(dists):
+            return np.inf
+        return float(dists.min()) - self.capture_radius
+
+    stop_condition.terminal = True
+    stop_condition.direction = -1
+
+    def apply_captures(self, t_prev: float, t: float, y_prev: NDArray[np.float64], y: NDArray[np.float64]) -> int:
+        """
+        Usuwa pary złapane w kroku [t_prev, t]: ścigający w stanie y bliżej swojego celu niż capture_radius.
+        Czas złapania interpolowany jest liniowo po odległości pary między y_prev i y. Przypisanie
+        powtarzane jest, dopóki ktoś jest w zasięgu. Zwraca liczbę złapanych uciekających.
+        """
+        total = 0
+        while True:
+            dists, targets = self.assign(y)
+            hit = dists <= self.capture_radius
+            if not hit.any():
+                return total
+
+            # Uciekający złapany przez kilku ścigających naraz przypada pierwszemu z nich
+            evaders, first = np.unique(targets[hit], return_index=True)
+            pursuers = self._active_index[hit][first]
+            after = dists[hit][first]
+            pursuers_prev, evaders_prev = self.split(np.asarray(y_prev, dtype=np.float64))
+            before = np.linalg.norm(evaders_prev[evaders] - pursuers_prev[pursuers], axis=1)
+            span = before - after
+            theta = np.where(span > 0, (before - self.capture_radius) / np.where(span > 0, span, 1.0), 1.0)
+
+            self.alive[evaders] = False
+            self.capture_times[evaders] = t_prev + np.clip(theta, 0.0, 1.0) * (t - t_prev)
+            self.captured_by[evaders] = pursuers
+            if self.consume_pursuer:
+                self.active[pursuers] = False
+            self._update_sets()
+            total += len(evaders)
+
+
+@dataclass
+class EngagementResult:
+    t: NDArray[np.float64]
+    """Czasy kroków (N,)"""
+    y: NDArray[np.float64]
+    """Stany (n_states, N) - jak OdeResult.y"""
+    sol: HermiteDenseOutput
+    """Interpolacja ciągła - jak OdeResult.sol"""
+    capture_times: NDArray[np.float64]
+    """Czas złapania każdego uciekającego (K,), NaN gdy przeżył"""
+    captured_by: NDArray[np.intp]
+    """Indeks ścigającego, który złapał uciekającego (K,), -1 gdy przeżył"""
+    n_steps: int
+    n_rejected: int
+
+    @property
+    def captured(self) -> NDArray[np.bool_]:
+        return self.captured_by >= 0
+
+    @property
+    def t_events(self) -> list[NDArray[np.float64]]:
+        return [np.unique(self.capture_times[self.captured])]
+
+
+def run_engagement(
+    pursuer_positions: ArrayLike,
+    evader_positions: ArrayLike,
+    strategy: MultiPursuit,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str = "rk4",
+    rtol: float = 1e-3,
+    atol: float = 1e-6,
+    sink: Sink | None = None,
+) -> EngagementResult:
+    """
+    Całkuje MultiPursuit integratorem z integrators.STEPPERS, usuwając złapane pary między krokami.
+
+    pursuer_positions: Pozycje początkowe ścigających (M, dim)
+    evader_positions: Pozycje początkowe uciekających (K, dim)
+    sink: Funkcja sink(t, y, f) wywoływana po każdym kroku, np. TrajectoryWriter.append
+    Całkowanie kończy się po t_span[1], po złapaniu wszystkich uciekających albo gdy nie zostanie
+    żaden aktywny ścigający. Stan strategii (active, alive, capture_times) jest resetowany na początku.
+    """
+    if method not in STEPPERS:
+        raise ValueError(f"Nieznany integrator: {method}")
+    y = np.concatenate(
+        [
+            np.asarray(pursuer_positions, dtype=np.float64).ravel(),
+            np.asarray(evader_positions, dtype=np.float64).ravel(),
+        ]
+    )
+    n = strategy.n_states
+    if y.size != n:
+        raise ValueError("Pozycje nie pasują do n_pursuers, n_evaders i dim strategii")
+    stepper = STEPPERS[method](strategy.dynamics, n)
+    if stepper.adaptive:
+        stepper.rtol, stepper.atol = rtol, atol
+
+    t0, t1 = t_span
+    t = t0
+    strategy.reset()
+    strategy.apply_captures(t, t, y, y)
+    f = strategy.dynamics(t, y, out=np.empty(n))
+    y_new = np.empty(n)
+    f_new = np.empty(n)
+    buffer = TrajectoryBuffer(n, min(int(math.ceil((t1 - t0) / max_step)) + 2, INITIAL_CAPACITY))
+    buffer.append(t, y, f)
+    if sink is not None:
+        sink(t, y, f)
+
+    h = max_step
+    n_steps = 0
+    n_rejected = 0
+    while t < t1 and strategy.alive.any() and strategy.active.any():
+        h = min(h, max_step, t1 - t)
+        err = stepper.step(t, y, f, h, y_new, f_new)
+        if err > 1:
+            h *= step_factor(err)
+            n_rejected += 1
+            continue
+
+        t_new = t + h if stepper.adaptive else min(t0 + (n_steps + 1) * max_step, t1)
+        if strategy.apply_captures(t, t_new, y, y_new):
+            strategy.dynamics(t_new, y_new, out=f_new)
+
+        t = t_new
+        y, y_new = y_new, y
+        f, f_new = f_new, f
+        n_steps += 1
+        buffer.append(t, y, f)
+        if sink is not None:
+            sink(t, y, f)
+        if stepper.adaptive:
+            h *= step_factor(err)
+
+    size = buffer.size
+    ts, ys, fs = buffer.t[:size], buffer.y[:size], buffer.f[:size]
+    return EngagementResult(
+        t=ts,
+        y=ys.T,
+        sol=HermiteDenseOutput(ts, ys, fs),
+        capture_times=strategy.capture_times.copy(),
+        captured_by=strategy.captured_by.copy(),
+        n_steps=n_steps,
+        n_rejected=n_rejected,
+    )
@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -9,7 +10,9 @@ from pursuit_curve.d3.continuous import (
     animate_continuous_pursuit_3d,
 )
 
-initial_state = [12.0, 12.0, 12.0, 5.0, 0.0, 0.0]
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+initial_state = [8.0, 8.0, 8.0, 5.0, 0.0, 0.0]
 strategy = ContinuousDirectPursuit3D(
     pursuer_velocity=Point3D(2.5, 2.5, 2.5),
     target_strategy=ContinuousTargetLissajousStrategy(
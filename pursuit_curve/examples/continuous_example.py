@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -9,6 +10,8 @@ from pursuit_curve.d2.continuous import (
     animate_continuous_pursuit,
 )
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 initial_state = [15.0, 0.0, 5.0, 0.0]
 strategy = ContinuousConstantBearing(
     pursuer_velocity=Point2D(1.5, 1.5),
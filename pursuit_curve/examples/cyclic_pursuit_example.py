@@ -2,7 +2,7 @@
 # Punkt i ściga punkt i+1 (mod N)
 # Każdy punkt ma tę samą wartość prędkości, która jest stała w czasie
 # Kąt początkowy punktu i na okręgu θ_i = 2πi/N
-
+import logging
 import sys
 from itertools import chain
 from pathlib import Path
@@ -13,6 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from pursuit_curve.common import Point2D, run_continuous_simulation
 from pursuit_curve.d2.continuous import ContinuousCyclicPursuit, cyclic_pursuit_animation
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 n = 18
 r = 150.0
 initial_state = list(
@@ -23,6 +25,7 @@ solution = run_continuous_simulation(
     initial_state,
     strategy,
     t_span=(0, 1200),
+    method="rk4",
 )
 
 
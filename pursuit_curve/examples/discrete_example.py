@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -10,6 +11,8 @@ from pursuit_curve.d2.discrete import (
     animate_pursuit,
 )
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 sim = Simulation(
     pursuer_start=Point2D(0.0, 0.0),
     target_start=Point2D(0.0, 1.0),
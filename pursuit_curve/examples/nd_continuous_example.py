@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -8,6 +9,8 @@ from pursuit_curve.dn.continuous import (
     ContinuousTargetLinearStrategyND,
 )
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 initial_state = [12.0, 12.0, 12.0, 12.0, 12.0, 5.0, 0.0, 0.0, 0.0, 0.0]
 strategy = ContinuousDirectPursuitND(
     pursuer_velocity=PointND((2.5, 2.5, 2.5, 2.5, 2.5)),
@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -11,6 +12,8 @@ from pursuit_curve.sphere.continuous import (
     animate_sphere_pursuit_3d,
 )
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 initial_state = [5.0, np.pi / 4, 2.0, 5.0, 0.0, 0.0]
 strategy = ContinuousDirectPursuitSphere(
     vel=1.5,
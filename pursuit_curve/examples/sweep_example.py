@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
+
+from pursuit_curve.common import Point2D
+from pursuit_curve.d2.continuous import (
+    ContinuousConstantBearing,
+    ContinuousDirectPursuit,
+    ContinuousTargetCircleStrategy,
+)
+from pursuit_curve.metrics import Euclidean
+
+
+def build(strategy: str, speed: float, omega: float, start: tuple[float, float]):
+    target_strategy = ContinuousTargetCircleStrategy(angular_velocity=omega, r=5.0)
+    if strategy == "direct":
+        pursuit = ContinuousDirectPursuit(Point2D(speed, speed), target_strategy)
+    else:
+        pursuit = ContinuousConstantBearing(Point2D(speed, speed), target_strategy, bearing_angle_deg=30.0)
+    return [*start, 5.0, 0.0], pursuit
+
+
+if __name__ == "__main__":
+    from pursuit_curve.sweep import run_sweep
+
+    table = run_sweep(
+        build,
+        grid={
+            "strategy": ["direct", "bearing"],
+            "speed": list(np.linspace(1.0, 3.0, 5)),
+            "omega": [0.1, 0.3],
+            "start": [(15.0, 0.0), (0.0, 15.0), (-10.0, -10.0)],
+        },
+        output_dir="sweep_results",
+        t_span=(0, 120),
+        geometry=Euclidean(2),
+    )
+    for params, capture_time, path_length in zip(table["params"], table["capture_time"], table["path_length"]):
+        print(params, capture_time, path_length)
@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -11,6 +12,8 @@ from pursuit_curve.torus.continuous import (
     animate_torus_pursuit_3d,
 )
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 R = 2.0
 r = 1.0
 initial_state = [0.0, 0.0, np.pi / 2, np.pi / 2]
@@ -0,0 +1,8 @@
+from .engine import GraphPursuit, GraphPursuitResult, cyclic_targets, run_graph_pursuit
+
+__all__ = [
+    "GraphPursuit",
+    "GraphPursuitResult",
+    "cyclic_targets",
+    "run_graph_pursuit",
+]
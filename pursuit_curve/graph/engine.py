@@ -0,0 +1,280 @@
+"""
+Pościg na dowolnym grafie: agent i ściga agenta targets[i] (targets[i] = -1 - agent bez celu).
+
+Pościg cykliczny to szczególny przypadek targets = [1, 2, ..., n-1, 0]. Stan to płaska tablica
+(n * dim,) pozycji, dynamika liczona jest jednym zbiorczym odczytem pozycji celów (np.take), a cała
+pamięć robocza jest O(n). Agent, który zbliży się do swojego celu na capture_radius, kończy pościg
+indywidualnie - reszta roju porusza się dalej:
+    "freeze" - agent zatrzymuje się w miejscu złapania,
+    "merge"  - agent dołącza do grupy swojego celu i dalej porusza się razem z nią; ścigający go
+               agenci przełączają się na reprezentanta tej grupy (spójne składowe liczone przez
+               scipy.sparse.csgraph, O(n) na każde zdarzenie połączenia).
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from pursuit_curve.common import Strategy
+from pursuit_curve.common.events import CAPTURE_RADIUS
+from pursuit_curve.common.integrators import STEPPERS, step_factor
+
+CAPTURE_MODES = ("freeze", "merge")
+
+Sink = Callable[[float, NDArray[np.float64], NDArray[np.float64]], None]
+
+
+def _representatives(leader: NDArray[np.intp]) -> NDArray[np.intp]:
+    """
+    Reprezentant grupy dla każdego agenta. Grupy to spójne składowe grafu krawędzi i -> leader[i];
+    reprezentantem jest agent, który do nikogo nie dołączył (leader[i] == i), a gdy grupa zamknęła
+    się w cykl (jednoczesne złapania) - agent o najmniejszym indeksie.
+    """
+    n = len(leader)
+    agents = np.arange(n)
+    merged = np.flatnonzero(leader != agents)
+    if not len(merged):
+        return agents
+    graph = csr_matrix((np.ones(len(merged), dtype=np.int8), (merged, leader[merged])), shape=(n, n))
+    n_groups, labels = connected_components(graph, directed=False)
+
+    # Drzewo ma dokładnie jeden korzeń, a składowa z cyklem żadnego
+    head = np.full(n_groups, n)
+    roots = leader == agents
+    head[labels[roots]] = agents[roots]
+    if (head == n).any():
+        smallest = np.full(n_groups, n)
+        np.minimum.at(smallest, labels, agents)
+        head = np.where(head < n, head, smallest)
+    return head[labels]
+
+
+class GraphPursuit(Strategy):
+    """
+    targets: Indeks celu dla każdego agenta (n,), -1 gdy agent nie ma celu
+    speed: Prędkość - skalar albo tablica (n,)
+    dim: Wymiar przestrzeni
+    capture_radius: Odległość, przy której agent kończy pościg
+    on_capture: "freeze" albo "merge"
+    """
+
+    runtime_state = ("active", "leader", "capture_times")
+
+    def __init__(
+        self,
+        targets: ArrayLike,
+        speed: float | ArrayLike = 1.0,
+        dim: int = 2,
+        capture_radius: float = CAPTURE_RADIUS,
+        on_capture: str = "freeze",
+    ):
+        if on_capture not in CAPTURE_MODES:
+            raise ValueError(f"Nieznany tryb złapania: {on_capture}")
+        self.targets = np.asarray(targets, dtype=np.intp)
+        self.n = len(self.targets)
+        if ((self.targets < -1) | (self.targets >= self.n)).any():
+            raise ValueError("Indeksy celów muszą być w zakresie [-1, n)")
+        self.dim = dim
+        self.capture_radius = capture_radius
+        self.on_capture = on_capture
+        speed_arr = np.asarray(speed, dtype=np.float64)
+        self.speed = speed_arr if speed_arr.ndim == 0 else speed_arr[:, np.newaxis]
+
+        self._agents = np.arange(self.n)
+        self._direction = np.empty((self.n, dim))
+        self._dists = np.empty(self.n)
+        self.reset()
+
+    def reset(self) -> None:
+        """Przywraca graf sprzed symulacji - wszyscy agenci z celem aktywni, bez połączeń i złapań."""
+        self.active = self.targets >= 0
+        self.leader = self._agents.copy()
+        self.capture_times = np.full(self.n, np.nan)
+        self._update_graph()
+
+    def _update_graph(self) -> None:
+        """Cele efektywne po połączeniach; agent ścigający własną grupę przestaje być aktywny."""
+        self._rep = _representatives(self.leader)
+        self._target = np.where(self.targets >= 0, self._rep[np.maximum(self.targets, 0)], -1)
+        self.active &= self._target != self._rep
+        self._gather = np.where(self.active, self._target, self._agents)
+        self._merged = np.flatnonzero(self._rep != self._agents)
+
+    def _update_directions(self, positions: NDArray[np.float64]) -> None:
+        np.take(positions, self._gather, axis=0, out=self._direction)
+        self._direction -= positions
+        np.einsum("ij,ij->i", self._direction, self._direction, out=self._dists)
+        np.sqrt(self._dists, out=self._dists)
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        if out is None:
+            out = np.empty(self.n * self.dim)
+        positions = y.reshape((self.n, self.dim))
+        vel = out.reshape((self.n, self.dim))
+        self._update_directions(positions)
+
+        # Agenci nieaktywni mają _gather = i, więc kierunek zerowy; dzielimy tylko przez niezerowe odległości
+        np.maximum(self._dists, 1e-12, out=self._dists)
+        np.divide(self._direction, self._dists[:, np.newaxis], out=vel)
+        vel *= self.speed
+        if len(self._merged):
+            # Połączeni agenci poruszają się razem z reprezentantem swojej grupy
+            vel[self._merged] = vel[self._rep[self._merged]]
+        return out
+
+    def distances(self, y: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Odległości agentów od ich celów (n,); dla nieaktywnych 0. Zwraca bufor roboczy."""
+        self._update_directions(np.asarray(y, dtype=np.float64).reshape((self.n, self.dim)))
+        return self._dists
+
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        """Największa nadwyżka odległości nad capture_radius wśród aktywnych - zero, gdy wszyscy złapali."""
+        dists = self.distances(np.asarray(y, dtype=np.float64))
+        if not self.active.any():
+            return -self.capture_radius
+        return float(dists[self.active].max()) - self.capture_radius
+
+    stop_condition.terminal = True
+    stop_condition.direction = -1
+
+    def apply_captures(
+        self, t_prev: float, t: float, y: NDArray[np.float64], previous_dists: NDArray[np.float64]
+    ) -> int:
+        """
+        Kończy pościg agentów, którzy w kroku [t_prev, t] zbliżyli się do celu na capture_radius.
+        Czas złapania interpolowany jest liniowo po odległości. W trybie "merge" pozycja agenta
+        jest ustawiana na pozycję celu. Zwraca liczbę złapań.
+        """
+        dists = self.distances(y)
+        hit = self.active & (dists <= self.capture_radius)
+        count = int(np.count_nonzero(hit))
+        if not count:
+            return 0
+
+        index = np.flatnonzero(hit)
+        before = previous_dists[index]
+        span = before - dists[index]
+        theta = np.where(span > 0, (before - self.capture_radius) / np.where(span > 0, span, 1.0), 1.0)
+        self.capture_times[index] = t_prev + np.clip(theta, 0.0, 1.0) * (t - t_prev)
+        self.active[index] = False
+
+        if self.on_capture == "merge":
+            positions = y.reshape((self.n, self.dim))
+            self.leader[index] = self._target[index]
+            self._update_graph()
+            positions[self._merged] = positions[self._rep[self._merged]]
+        else:
+            self._update_graph()
+        return count
+
+
+@dataclass
+class GraphPursuitResult:
+    t: float
+    """Czas końcowy"""
+    positions: NDArray[np.float64]
+    """Pozycje końcowe (n, dim)"""
+    capture_times: NDArray[np.float64]
+    """Czas zakończenia pościgu przez agenta (n,), NaN gdy nie złapał celu"""
+    n_steps: int
+    n_rejected: int
+    snapshots_t: NDArray[np.float64]
+    """Chwile zapisanych migawek (K,)"""
+    snapshots: NDArray[np.float64] | None
+    """Pozycje co record_every kroków (K, n, dim) albo None"""
+
+    @property
+    def captured(self) -> NDArray[np.bool_]:
+        return ~np.isnan(self.capture_times)
+
+
+def run_graph_pursuit(
+    initial_positions: ArrayLike,
+    strategy: GraphPursuit,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    method: str = "rk4",
+    rtol: float = 1e-3,
+    atol: float = 1e-6,
+    record_every: int | None = None,
+    sink: Sink | None = None,
+) -> GraphPursuitResult:
+    """
+    Całkuje GraphPursuit integratorem z integrators.STEPPERS, stosując złapania między krokami.
+
+    initial_positions: Pozycje początkowe (n, dim)
+    record_every: Co ile kroków zapisywać migawkę pozycji w pamięci (None - bez migawek)
+    sink: Funkcja sink(t, y, f) wywoływana po każdym kroku, np. TrajectoryWriter.append
+    Całkowanie kończy się po t_span[1] albo gdy żaden agent nie ma już aktywnego pościgu.
+    Stan grafu (strategy.active, leader, capture_times) jest resetowany na początku.
+    """
+    if method not in STEPPERS:
+        raise ValueError(f"Nieznany integrator: {method}")
+    y = np.array(initial_positions, dtype=np.float64).reshape(-1)
+    if y.size != strategy.n * strategy.dim:
+        raise ValueError("initial_positions musi mieć kształt (n, dim)")
+    n = y.size
+    stepper = STEPPERS[method](strategy.dynamics, n)
+    if stepper.adaptive:
+        stepper.rtol, stepper.atol = rtol, atol
+
+    t0, t1 = t_span
+    t = t0
+    strategy.reset()
+    dists = strategy.distances(y).copy()
+    strategy.apply_captures(t, t, y, dists)
+    y_new = np.empty(n)
+    f = strategy.dynamics(t, y, out=np.empty(n))
+    f_new = np.empty(n)
+
+    snapshots_t = [t]
+    snapshots = [y.reshape(strategy.n, strategy.dim).copy()] if record_every else []
+    if sink is not None:
+        sink(t, y, f)
+
+    h = max_step
+    n_steps = 0
+    n_rejected = 0
+    while t < t1 and strategy.active.any():
+        h = min(h, max_step, t1 - t)
+        err = stepper.step(t, y, f, h, y_new, f_new)
+        if err > 1:
+            h *= step_factor(err)
+            n_rejected += 1
+            continue
+
+        t_new = t + h if stepper.adaptive else min(t0 + (n_steps + 1) * max_step, t1)
+        if strategy.apply_captures(t, t_new, y_new, dists):
+            strategy.dynamics(t_new, y_new, out=f_new)
+        dists[:] = strategy.distances(y_new)
+
+        t = t_new
+        y, y_new = y_new, y
+        f, f_new = f_new, f
+        n_steps += 1
+        if sink is not None:
+            sink(t, y, f)
+        if record_every and n_steps % record_every == 0:
+            snapshots_t.append(t)
+            snapshots.append(y.reshape(strategy.n, strategy.dim).copy())
+        if stepper.adaptive:
+            h *= step_factor(err)
+
+    return GraphPursuitResult(
+        t=t,
+        positions=y.reshape(strategy.n, strategy.dim).copy(),
+        capture_times=strategy.capture_times.copy(),
+        n_steps=n_steps,
+        n_rejected=n_rejected,
+        snapshots_t=np.array(snapshots_t),
+        snapshots=np.stack(snapshots) if record_every else None,
+    )
+
+
+def cyclic_targets(n: int) -> NDArray[np.intp]:
+    """Graf pościgu cyklicznego: agent i ściga i + 1 (mod n)."""
+    return np.roll(np.arange(n), -1)
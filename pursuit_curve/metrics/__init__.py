@@ -0,0 +1,13 @@
+from .engine import MetricsAccumulator, MetricSeries, PursuitMetrics, compute_metrics
+from .geometry import Euclidean, Geometry, Sphere, Torus
+
+__all__ = [
+    "Euclidean",
+    "Geometry",
+    "MetricSeries",
+    "MetricsAccumulator",
+    "PursuitMetrics",
+    "Sphere",
+    "Torus",
+    "compute_metrics",
+]
@@ -0,0 +1,349 @@
+"""
+Metryki pościgu: długość drogi, energia sterowania, krzywizna, skręcenie i odległość pary w czasie.
+
+Wszystko liczone jest jednym zwektoryzowanym przejściem po zapisanych krokach (t, y, f):
+- prędkość w zanurzeniu pochodzi wprost z f = dy/dt (Geometry.velocity), więc długość drogi
+  (całka z prędkości, wzór trapezów) nie ma błędu cięciwy,
+- przyspieszenie to różnica prędkości na przedziale między krokami, a w kroku - średnia ważona
+  sąsiednich przedziałów; zryw (do skręcenia) to różnica przyspieszeń sąsiednich przedziałów.
+
+MetricsAccumulator przyjmuje kroki porcjami (update) albo pojedynczo (append - sink dla StepStream,
+run_engagement, run_graph_pursuit), trzymając tylko dwa ostatnie kroki, więc metryki można liczyć
+w trakcie całkowania bez przechowywania trajektorii. compute_metrics przepuszcza przez niego gotowe
+rozwiązanie (OdeResult, TrajectoryReader, ...) porcjami po CHUNK_SIZE kroków.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from pursuit_curve.common import Strategy
+
+from .geometry import Euclidean, Geometry
+
+CHUNK_SIZE = 65536
+"""Liczba kroków przetwarzanych jednym wywołaniem MetricsAccumulator.update w compute_metrics"""
+
+BUFFER_SIZE = 256
+"""Liczba kroków zbieranych przez MetricsAccumulator.append przed przeliczeniem porcji"""
+
+EPSILON = 1e-12
+
+DIFF_STEP = 1e-6
+"""Względny krok różnic centralnych interpolantu sol w compute_metrics (OdeResult bez strategii)"""
+
+
+@dataclass
+class MetricSeries:
+    """Metryki w każdym kroku; krzywizna i skręcenie są NaN w pierwszym i ostatnim kroku."""
+
+    t: NDArray[np.float64]
+    """Czasy kroków (k,)"""
+    speed: NDArray[np.float64]
+    """Szybkość agentów (k, n_agents)"""
+    curvature: NDArray[np.float64]
+    """Krzywizna toru (k, n_agents)"""
+    torsion: NDArray[np.float64]
+    """Skręcenie toru (k, n_agents) - tylko dla zanurzenia 3D, poza nim NaN"""
+    distance: NDArray[np.float64]
+    """Odległość par (k, n_pairs)"""
+
+
+@dataclass
+class PursuitMetrics:
+    t_start: float
+    t_end: float
+    n_samples: int
+    path_length: NDArray[np.float64]
+    """Długość drogi agentów (n_agents,) - po rozmaitości"""
+    displacement: NDArray[np.float64]
+    """Odległość od pozycji startowej do końcowej (n_agents,) - najkrótsza droga do punktu końcowego"""
+    energy: NDArray[np.float64]
+    """Energia sterowania ∫|a|² dt (n_agents,)"""
+    max_curvature: NDArray[np.float64]
+    total_turning: NDArray[np.float64]
+    """Całkowity obrót kierunku ∫κ ds (n_agents,)"""
+    mean_torsion: NDArray[np.float64]
+    """Średnie |τ| względem drogi ∫|τ| ds / długość (n_agents,)"""
+    pairs: NDArray[np.intp]
+    """Pary agentów (n_pairs, 2), których odległość jest śledzona"""
+    min_distance: NDArray[np.float64]
+    t_min_distance: NDArray[np.float64]
+    final_distance: NDArray[np.float64]
+    series: MetricSeries | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.t_end - self.t_start
+
+    @property
+    def efficiency(self) -> NDArray[np.float64]:
+        """Stosunek najkrótszej drogi do przebytej (n_agents,) - 1 dla ruchu po geodezyjnej."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.path_length > 0, self.displacement / self.path_length, 1.0)
+
+
+def _norm(a: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.sqrt(np.einsum("...i,...i->...", a, a))
+
+
+class MetricsAccumulator:
+    """
+    Metryki liczone przyrostowo z kolejnych kroków.
+
+    n_states: Długość wektora stanu
+    geometry: Geometria stanu agenta (domyślnie Euclidean(2))
+    pairs: Pary (ścigający, cel) indeksów agentów (n_pairs, 2); domyślnie [(0, 1)] - układ
+           [ścigający, cel] z run_continuous_simulation
+    series: Czy zapamiętać metryki w każdym kroku (MetricSeries) - pamięć rośnie wtedy z liczbą kroków
+    """
+
+    def __init__(
+        self,
+        n_states: int,
+        geometry: Geometry | None = None,
+        pairs: ArrayLike | None = None,
+        series: bool = False,
+        buffer_size: int = BUFFER_SIZE,
+    ):
+        self.geometry = geometry or Euclidean()
+        self.n_agents = n_states // self.geometry.dim
+        if pairs is None:
+            pairs = [(0, 1)] if self.n_agents > 1 else np.empty((0, 2))
+        self.pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        self.n_samples = 0
+        self.t_start = np.nan
+        self.t_end = np.nan
+
+        n, p = self.n_agents, len(self.pairs)
+        self.path_length = np.zeros(n)
+        self.energy = np.zeros(n)
+        self.max_curvature = np.zeros(n)
+        self.total_turning = np.zeros(n)
+        self._torsion_integral = np.zeros(n)
+        self.min_distance = np.full(p, np.inf)
+        self.t_min_distance = np.full(p, np.nan)
+        self.final_distance = np.full(p, np.nan)
+        self._q_start: NDArray[np.float64] | None = None
+        self._q_end: NDArray[np.float64] | None = None
+
+        # Dwa ostatnie kroki - przedział i punkt wewnętrzny na styku porcji
+        self._carry_t = np.empty(0)
+        self._carry_v = np.empty((0, n, 0))
+
+        self._series: dict[str, list[NDArray[np.float64]]] | None = None
+        if series:
+            self._series = {name: [] for name in ("t", "speed", "curvature", "torsion", "distance")}
+
+        self._buffer_t = np.empty(buffer_size)
+        self._buffer_y = np.empty((buffer_size, n_states))
+        self._buffer_f = np.empty((buffer_size, n_states))
+        self._fill = 0
+
+    def append(self, t: float, y: ArrayLike, f: ArrayLike) -> None:
+        """Jeden krok - sink(t, y, f); kroki są zbierane i przeliczane porcjami."""
+        self._buffer_t[self._fill] = t
+        self._buffer_y[self._fill] = y
+        self._buffer_f[self._fill] = f
+        self._fill += 1
+        if self._fill == len(self._buffer_t):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._fill:
+            fill, self._fill = self._fill, 0
+            self.update(self._buffer_t[:fill], self._buffer_y[:fill].T, self._buffer_f[:fill].T)
+
+    def update(self, t: ArrayLike, y: ArrayLike, f: ArrayLike) -> None:
+        """Porcja kolejnych kroków: t (k,), y i f (n_states, k) - jak OdeResult.y."""
+        t = np.asarray(t, dtype=np.float64)
+        if not len(t):
+            return
+        q = self.geometry.split(np.asarray(y, dtype=np.float64))
+        v_new = self.geometry.velocity(q, self.geometry.split(np.asarray(f, dtype=np.float64)))
+        if self._q_start is None:
+            self._q_start = q[0].copy()
+            self.t_start = float(t[0])
+        self._q_end = q[-1].copy()
+        self.t_end = float(t[-1])
+        self.n_samples += len(t)
+
+        distance = self._distances(t, q)
+        carried = len(self._carry_t)
+        times = np.concatenate([self._carry_t, t])
+        velocity = np.concatenate([self._carry_v, v_new]) if carried else v_new
+        speed = _norm(velocity)
+
+        # Przedziały między krokami - te zaczynające się przed porcją zostały już policzone
+        dt = np.diff(times)
+        accel = np.diff(velocity, axis=0) / np.maximum(dt, EPSILON)[:, np.newaxis, np.newaxis]
+        first = max(carried - 1, 0)
+        self.path_length += np.sum(0.5 * (speed[first:-1] + speed[first + 1 :]) * dt[first:, np.newaxis], axis=0)
+        self.energy += np.sum(_norm(accel[first:]) ** 2 * dt[first:, np.newaxis], axis=0)
+
+        # Punkty wewnętrzne 1..m-2 - każdy liczony raz, gdy pojawi się jego następnik
+        curvature, torsion = self._curvature(dt, velocity, accel, speed)
+        if len(curvature):
+            weight = speed[1:-1] * (0.5 * (dt[:-1] + dt[1:]))[:, np.newaxis]
+            np.maximum(self.max_curvature, curvature.max(axis=0), out=self.max_curvature)
+            self.total_turning += np.sum(curvature * weight, axis=0)
+            self._torsion_integral += np.nansum(np.abs(torsion) * weight, axis=0)
+
+        if self._series is not None:
+            self._series["t"].append(t)
+            self._series["speed"].append(speed[carried:])
+            self._series["curvature"].append(curvature)
+            self._series["torsion"].append(torsion)
+            self._series["distance"].append(distance)
+
+        self._carry_t = times[-2:].copy()
+        self._carry_v = velocity[-2:].copy()
+
+    def _distances(self, t: NDArray[np.float64], q: NDArray[np.float64]) -> NDArray[np.float64]:
+        if not len(self.pairs):
+            return np.empty((len(t), 0))
+        distance = self.geometry.distance(q[:, self.pairs[:, 0]], q[:, self.pairs[:, 1]])
+        index = distance.argmin(axis=0)
+        closest = distance[index, np.arange(len(self.pairs))]
+        better = closest < self.min_distance
+        self.min_distance[better] = closest[better]
+        self.t_min_distance[better] = t[index[better]]
+        self.final_distance = distance[-1].copy()
+        return distance
+
+    @staticmethod
+    def _curvature(
+        dt: NDArray[np.float64],
+        velocity: NDArray[np.float64],
+        accel: NDArray[np.float64],
+        speed: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Krzywizna i skręcenie w punktach wewnętrznych: κ = |v × a| / |v|³, τ = (v × a)·j / |v × a|².
+        Dla wymiaru innego niż 3 |v × a| liczone jest z tożsamości Lagrange'a, a skręcenie to NaN.
+        """
+        before, after = dt[:-1, np.newaxis, np.newaxis], dt[1:, np.newaxis, np.newaxis]
+        span = np.maximum(before + after, EPSILON)
+        a = (accel[:-1] * after + accel[1:] * before) / span
+        v = velocity[1:-1]
+        s = speed[1:-1]
+        moving = s > EPSILON
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if v.shape[-1] == 3:
+                cross = np.cross(v, a)
+                cross_norm = _norm(cross)
+                jerk = (accel[1:] - accel[:-1]) / (0.5 * span)
+                torsion = np.where(cross_norm > EPSILON, np.einsum("...i,...i->...", cross, jerk) / cross_norm**2, 0.0)
+            else:
+                cross_norm = np.sqrt(np.maximum(s**2 * _norm(a) ** 2 - np.einsum("...i,...i->...", v, a) ** 2, 0.0))
+                torsion = np.full(s.shape, 0.0 if v.shape[-1] == 2 else np.nan)
+            curvature = np.where(moving, cross_norm / s**3, 0.0)
+        return curvature, np.where(moving, torsion, 0.0)
+
+    def result(self) -> PursuitMetrics:
+        """Metryki z dotychczasowych kroków (kroki z bufora append są najpierw przeliczane)."""
+        self.flush()
+        if self._q_start is None or self._q_end is None:
+            raise ValueError("Brak kroków do policzenia metryk")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_torsion = np.where(self.path_length > 0, self._torsion_integral / self.path_length, 0.0)
+        if self.geometry.embed(self._q_end).shape[-1] > 3:
+            mean_torsion[:] = np.nan
+        return PursuitMetrics(
+            t_start=self.t_start,
+            t_end=self.t_end,
+            n_samples=self.n_samples,
+            path_length=self.path_length.copy(),
+            displacement=self.geometry.distance(self._q_start, self._q_end),
+            energy=self.energy.copy(),
+            max_curvature=self.max_curvature.copy(),
+            total_turning=self.total_turning.copy(),
+            mean_torsion=mean_torsion,
+            pairs=self.pairs,
+            min_distance=self.min_distance.copy(),
+            t_min_distance=self.t_min_distance.copy(),
+            final_distance=self.final_distance.copy(),
+            series=self._collect_series(),
+        )
+
+    def _collect_series(self) -> MetricSeries | None:
+        if self._series is None:
+            return None
+        parts = self._series
+        edge = np.full((min(self.n_samples, 1), self.n_agents), np.nan)
+        inner = [np.concatenate(parts[name]) for name in ("curvature", "torsion")]
+        tail = np.full((1 if self.n_samples > 1 else 0, self.n_agents), np.nan)
+        curvature, torsion = (np.concatenate([edge, values, tail]) for values in inner)
+        return MetricSeries(
+            t=np.concatenate(parts["t"]),
+            speed=np.concatenate(parts["speed"]),
+            curvature=curvature,
+            torsion=torsion,
+            distance=np.concatenate(parts["distance"]),
+        )
+
+
+def _derivatives(
+    solution: Any, t: NDArray[np.float64], y: NDArray[np.float64], strategy: Strategy | None
+) -> NDArray[np.float64]:
+    """
+    Pochodne stanu w krokach, od najdokładniejszych: zapisane f (TrajectoryReader, wynik integrate()),
+    strategy.dynamics() w każdym kroku, pochodna interpolantu Hermite'a (integrators.HermiteDenseOutput),
+    różnice centralne interpolantu sol solve_ivp w otoczeniu kroku. OdeResult bez sol i bez strategii
+    daje tylko różnice między krokami solwera - przy dużym kroku adaptacyjnym długość drogi jest wtedy
+    wyraźnie zaniżona.
+    """
+    f = getattr(solution, "f", None)
+    if f is not None:
+        return f
+    if strategy is not None:
+        f = np.empty(y.shape)
+        for i, t_i in enumerate(t):
+            f[:, i] = strategy.dynamics(float(t_i), np.array(y[:, i], dtype=np.float64))
+        return f
+    sol = getattr(solution, "sol", None)
+    spline = getattr(sol, "spline", None)
+    if spline is not None:
+        return spline(t, 1).T
+    if len(t) < 2:
+        return np.zeros_like(y)
+    if sol is not None:
+        h = DIFF_STEP * max(float(np.abs(t).max()), t[-1] - t[0])
+        lower, upper = np.maximum(t - h, t[0]), np.minimum(t + h, t[-1])
+        return (sol(upper) - sol(lower)) / (upper - lower)
+    if len(t) < 3:
+        return np.gradient(y, t, axis=1)
+    return np.gradient(y, t, axis=1, edge_order=2)
+
+
+def compute_metrics(
+    solution: Any,
+    geometry: Geometry | None = None,
+    pairs: ArrayLike | None = None,
+    series: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+    strategy: Strategy | None = None,
+) -> PursuitMetrics:
+    """
+    Metryki rozwiązania z polami t i y (OdeResult, TrajectoryReader, EngagementResult, ...).
+
+    geometry: Euclidean(dim), Sphere() albo Torus(R, r); domyślnie Euclidean(2)
+    pairs: Pary agentów do odległości - patrz MetricsAccumulator
+    series: Czy dołączyć metryki w każdym kroku (PursuitMetrics.series)
+    strategy: Strategia, która dała rozwiązanie - dla OdeResult solve_ivp pochodne w krokach liczone są
+              wtedy dokładnie z dynamics(). Bez niej pochodne to różnice interpolantu sol (albo kroków,
+              gdy sol nie ma), więc metryki OdeResult są przybliżone. Strategia ze stanem zmienianym
+              w trakcie symulacji (runtime_state) nie nadaje się do tego.
+    Kroki czytane są porcjami po chunk_size, więc plik TrajectoryReader nie jest wczytywany w całości
+    (o ile series=False).
+    """
+    t = np.asarray(solution.t, dtype=np.float64)
+    y = solution.y
+    f = _derivatives(solution, t, np.asarray(y), strategy)
+    accumulator = MetricsAccumulator(y.shape[0], geometry, pairs, series)
+    for start in range(0, len(t), chunk_size):
+        stop = start + chunk_size
+        accumulator.update(t[start:stop], y[:, start:stop], f[:, start:stop])
+    return accumulator.result()
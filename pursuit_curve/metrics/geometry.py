@@ -0,0 +1,125 @@
+"""
+Geometrie przestrzeni stanów agentów dla metryk pościgu.
+
+Geometria zamienia współrzędne agenta (np. [r, θ, φ] na sferze) na punkt i prędkość w przestrzeni
+euklidesowej, w której leży rozmaitość. Długość krzywej liczona z prędkości w zanurzeniu to długość
+geodezyjna po powierzchni, a krzywizna i skręcenie - krzywizna i skręcenie krzywej w przestrzeni.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pursuit_curve.sphere.utils import spherical_to_cartesian
+
+
+class Geometry(ABC):
+    dim: int
+    """Liczba współrzędnych stanu jednego agenta"""
+
+    def split(self, y: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Stany (n_states, k) -> współrzędne agentów (k, n_agents, dim), bez zmiennych spoza pozycji na końcu."""
+        n_agents = y.shape[0] // self.dim
+        return y[: n_agents * self.dim].T.reshape(y.shape[1], n_agents, self.dim)
+
+    @abstractmethod
+    def embed(self, q: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Współrzędne (..., dim) -> punkty w zanurzeniu (..., embed_dim)."""
+
+    @abstractmethod
+    def velocity(self, q: NDArray[np.float64], dq: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Pochodne współrzędnych (..., dim) w punktach q -> prędkości w zanurzeniu (..., embed_dim)."""
+
+    @abstractmethod
+    def distance(self, a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Odległość po rozmaitości między współrzędnymi a i b (..., dim) -> (...)."""
+
+
+class Euclidean(Geometry):
+    """Przestrzeń R^dim - stan agenta to jego pozycja."""
+
+    def __init__(self, dim: int = 2):
+        self.dim = dim
+
+    def embed(self, q: NDArray[np.float64]) -> NDArray[np.float64]:
+        return q
+
+    def velocity(self, q: NDArray[np.float64], dq: NDArray[np.float64]) -> NDArray[np.float64]:
+        return dq
+
+    def distance(self, a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.float64]:
+        return np.linalg.norm(b - a, axis=-1)
+
+
+class Sphere(Geometry):
+    """Stan agenta [r, θ, φ] jak w sphere.continuous - θ to szerokość (spherical_to_cartesian)."""
+
+    dim = 3
+
+    def embed(self, q: NDArray[np.float64]) -> NDArray[np.float64]:
+        return np.moveaxis(spherical_to_cartesian(q[..., 0], q[..., 1], q[..., 2]), 0, -1)  # type: ignore [arg-type]
+
+    def velocity(self, q: NDArray[np.float64], dq: NDArray[np.float64]) -> NDArray[np.float64]:
+        r, theta, phi = q[..., 0], q[..., 1], q[..., 2]
+        dr, dtheta, dphi = dq[..., 0], dq[..., 1], dq[..., 2]
+        sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+        sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+        radial = dr * cos_theta - r * sin_theta * dtheta
+        return np.stack(
+            [
+                radial * cos_phi - r * cos_theta * sin_phi * dphi,
+                radial * sin_phi + r * cos_theta * cos_phi * dphi,
+                dr * sin_theta + r * cos_theta * dtheta,
+            ],
+            axis=-1,
+        )
+
+    def distance(self, a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Długość łuku koła wielkiego na sferze o średnim promieniu obu punktów."""
+        cos_dist = np.sin(a[..., 1]) * np.sin(b[..., 1]) + np.cos(a[..., 1]) * np.cos(b[..., 1]) * np.cos(
+            b[..., 2] - a[..., 2]
+        )
+        return (a[..., 0] + b[..., 0]) / 2 * np.arccos(np.clip(cos_dist, -1.0, 1.0))
+
+
+class Torus(Geometry):
+    """
+    Stan agenta [u, v] jak w torus.continuous; metryka ds² = (R + r·cos(v))²·du² + r²·dv².
+    R: Promień dużego okręgu
+    r: Promień przekroju
+    """
+
+    dim = 2
+
+    def __init__(self, R: float, r: float):
+        self.R = R
+        self.r = r
+
+    def embed(self, q: NDArray[np.float64]) -> NDArray[np.float64]:
+        u, v = q[..., 0], q[..., 1]
+        ring = self.R + self.r * np.cos(v)
+        return np.stack([ring * np.cos(u), ring * np.sin(u), self.r * np.sin(v)], axis=-1)
+
+    def velocity(self, q: NDArray[np.float64], dq: NDArray[np.float64]) -> NDArray[np.float64]:
+        u, v = q[..., 0], q[..., 1]
+        du, dv = dq[..., 0], dq[..., 1]
+        ring = self.R + self.r * np.cos(v)
+        sin_u, cos_u = np.sin(u), np.cos(u)
+        ring_rate = -self.r * np.sin(v) * dv
+        return np.stack(
+            [
+                ring_rate * cos_u - ring * sin_u * du,
+                ring_rate * sin_u + ring * cos_u * du,
+                self.r * np.cos(v) * dv,
+            ],
+            axis=-1,
+        )
+
+    def distance(self, a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Odległość w metryce w punkcie a po najkrótszych różnicach kątów - ta sama miara, którą
+        kieruje się ContinuousDirectPursuitTorus (dokładna geodezyjna na torusie nie ma postaci zamkniętej).
+        """
+        delta = np.remainder(b - a + np.pi, 2 * np.pi) - np.pi
+        return np.hypot((self.R + self.r * np.cos(a[..., 1])) * delta[..., 0], self.r * delta[..., 1])
@@ -0,0 +1,33 @@
+from .frames import FrameSource, TrailBuffer, TrailCollection, pixel_size, save_animation, trail_capacity
+from .raster import (
+    Canvas,
+    FFmpegPipeWriter,
+    NPZWriter,
+    OrbitView,
+    PlaneView,
+    PNGSequenceWriter,
+    open_writer,
+    render_raster,
+)
+from .video import Scene, concat_segments, render_animation, render_parallel
+
+__all__ = [
+    "Canvas",
+    "FFmpegPipeWriter",
+    "FrameSource",
+    "NPZWriter",
+    "OrbitView",
+    "PNGSequenceWriter",
+    "PlaneView",
+    "Scene",
+    "TrailBuffer",
+    "TrailCollection",
+    "concat_segments",
+    "open_writer",
+    "pixel_size",
+    "render_animation",
+    "render_parallel",
+    "render_raster",
+    "save_animation",
+    "trail_capacity",
+]
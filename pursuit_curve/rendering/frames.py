@@ -0,0 +1,219 @@
+"""
+Leniwe generowanie klatek animacji z rozwiązania ciągłego (solution.sol) i ślady o stałym rozmiarze.
+
+FrameSource wylicza pozycje agentów z solution.sol porcjami po chunk_size klatek, więc w pamięci
+jest tylko bieżąca porcja, a nie cała tablica (n_states, num_frames). TrailBuffer trzyma ślad każdego
+agenta w buforze cyklicznym o stałej pojemności i pomija punkty bliższe niż min_spacing (rozmiar
+piksela) - koszt rysowania klatki nie zależy od jej numeru, więc cała animacja jest liniowa w liczbie
+klatek, a pamięć stała.
+"""
+
+from typing import Any, Callable, Iterator
+
+import numpy as np
+from matplotlib.animation import AbstractMovieWriter, Animation
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from numpy.typing import NDArray
+
+CHUNK_SIZE = 256
+"""Liczba klatek wyliczanych jednym wywołaniem solution.sol"""
+
+MAX_TRAIL_POINTS = 4096
+"""Pojemność śladu, gdy animacja rysuje całą historię (trail_length=None)"""
+
+FADE_BANDS = 4
+"""Liczba kawałków zanikającego śladu o różnej przezroczystości"""
+
+Transform = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+
+
+class FrameSource:
+    """
+    Klatki animacji wyliczane na żądanie z solution.sol (OdeResult, TrajectoryReader, ...).
+
+    transform: Zamienia porcję stanów (n_states, k) na pozycje (k, n_agents, dim); domyślnie stan to
+               kolejne współrzędne agentów [x0, y0, x1, y1, ...] - dodatkowe zmienne na końcu stanu,
+               niepełne do kolejnego agenta (kurs w ContinuousProportionalNavigation), są pomijane
+    dim: Wymiar pozycji dla domyślnej transformacji
+    Dostęp po indeksie jest najtańszy sekwencyjnie - porcja jest wyliczana ponownie tylko po wyjściu poza nią.
+    """
+
+    def __init__(
+        self,
+        solution: Any,
+        num_frames: int = 200,
+        transform: Transform | None = None,
+        dim: int = 2,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.solution = solution
+        self.t = np.linspace(solution.t[0], solution.t[-1], num_frames)
+        self.dim = dim
+        self.transform = transform or self._split_agents
+        self.chunk_size = chunk_size
+        self._start = -1
+        self._chunk = np.empty((0, 0, dim))
+
+    def _split_agents(self, y: NDArray[np.float64]) -> NDArray[np.float64]:
+        n_agents = y.shape[0] // self.dim
+        return y[: n_agents * self.dim].T.reshape(y.shape[1], n_agents, self.dim)
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def _load(self, start: int) -> None:
+        y = np.asarray(self.solution.sol(self.t[start : start + self.chunk_size]), dtype=np.float64)
+        self._chunk = self.transform(y)
+        self._start = start
+
+    def __getitem__(self, frame: int) -> NDArray[np.float64]:
+        """Pozycje agentów (n_agents, dim) w klatce frame."""
+        if frame < 0:
+            frame += len(self)
+        if not 0 <= frame < len(self):
+            raise IndexError(frame)
+        if not self._start <= frame < self._start + len(self._chunk):
+            self._load(frame - frame % self.chunk_size)
+        return self._chunk[frame - self._start]
+
+    def __iter__(self) -> Iterator[NDArray[np.float64]]:
+        for frame in range(len(self)):
+            yield self[frame]
+
+    def bounds(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Najmniejsze i największe współrzędne (dim,) po wszystkich klatkach - jedno przejście porcjami."""
+        lower = np.full(self.dim, np.inf)
+        upper = np.full(self.dim, -np.inf)
+        for start in range(0, len(self), self.chunk_size):
+            self._load(start)
+            np.minimum(lower, self._chunk.min(axis=(0, 1)), out=lower)
+            np.maximum(upper, self._chunk.max(axis=(0, 1)), out=upper)
+        return lower, upper
+
+
+class TrailBuffer:
+    """
+    Ślady agentów w buforze cyklicznym (n_agents, capacity, dim).
+
+    capacity: Maksymalna liczba punktów śladu agenta - najstarsze są nadpisywane
+    min_spacing: Punkt bliżej niż min_spacing od ostatniego zapisanego jest pomijany (decymacja do
+                 rozdzielczości ekranu, patrz pixel_size)
+    """
+
+    def __init__(self, n_agents: int, dim: int, capacity: int, min_spacing: float = 0.0):
+        self.n_agents = n_agents
+        self.dim = dim
+        self.capacity = capacity
+        self.min_spacing = min_spacing
+        self._points = np.empty((n_agents, capacity, dim))
+        self._agents = np.arange(n_agents)
+        self.clear()
+
+    def clear(self) -> None:
+        self.head = np.zeros(self.n_agents, dtype=np.intp)
+        """Indeks następnego zapisu dla każdego agenta"""
+        self.count = np.zeros(self.n_agents, dtype=np.intp)
+        """Liczba zapisanych punktów dla każdego agenta (<= capacity)"""
+
+    def push(self, positions: NDArray[np.float64]) -> None:
+        """positions - pozycje agentów (n_agents, dim) w kolejnej klatce"""
+        last = self._points[self._agents, (self.head - 1) % self.capacity]
+        moved = self.count == 0
+        if self.min_spacing > 0:
+            step = positions - last
+            moved |= np.einsum("ij,ij->i", step, step) >= self.min_spacing**2
+        else:
+            moved[:] = True
+
+        agents = self._agents[moved]
+        self._points[agents, self.head[agents]] = positions[agents]
+        self.head[agents] = (self.head[agents] + 1) % self.capacity
+        self.count[agents] = np.minimum(self.count[agents] + 1, self.capacity)
+
+    def points(self, agent: int) -> NDArray[np.float64]:
+        """Ślad jednego agenta (count, dim) od najstarszego punktu - widok bufora, gdy ślad się nie zawinął."""
+        count, head = int(self.count[agent]), int(self.head[agent])
+        start = head - count
+        if start >= 0:
+            return self._points[agent, start:head]
+        return np.concatenate([self._points[agent, start:], self._points[agent, :head]])
+
+    def segments(
+        self,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.intp], NDArray[np.float64]]:
+        """
+        Wszystkie odcinki śladów naraz, bez pętli po agentach: (początki (m, dim), końce (m, dim),
+        indeksy agentów (m,), wiek odcinka w (0, 1] - 1 dla najnowszego).
+        """
+        n_segments = np.maximum(self.count - 1, 0)
+        agents = np.repeat(self._agents, n_segments)
+        rank = np.arange(len(agents)) - np.repeat(np.cumsum(n_segments) - n_segments, n_segments)
+        start = (self.head - self.count)[agents] + rank
+        starts = self._points[agents, start % self.capacity]
+        ends = self._points[agents, (start + 1) % self.capacity]
+        return starts, ends, agents, (rank + 1) / n_segments[agents]
+
+    def polylines(self, bands: int = 1) -> tuple[list[NDArray[np.float64]], list[int], list[float]]:
+        """
+        Ślady jako łamane dla LineCollection: ślad każdego agenta podzielony na bands kawałków wg wieku.
+        Zwraca (łamane, indeksy agentów, wiek kawałka w (0, 1] - 1 dla najnowszego).
+        LineCollection tworzy osobny Path dla każdej łamanej, więc łamanych jest n_agents * bands,
+        a nie po jednej na odcinek.
+        """
+        edges = np.rint(np.outer(self.count - 1, np.arange(bands + 1) / bands)).astype(np.intp)
+        lines, owners, ages = [], [], []
+        for agent, agent_edges in enumerate(edges.tolist()):
+            if agent_edges[-1] < 1:
+                continue
+            points = self.points(agent)
+            for band in range(bands):
+                start, stop = agent_edges[band], agent_edges[band + 1]
+                if stop > start:
+                    lines.append(points[start : stop + 1])
+                    owners.append(agent)
+                    ages.append((band + 1) / bands)
+        return lines, owners, ages
+
+
+class TrailCollection:
+    """
+    Ślady wielu agentów jako jedna LineCollection - jeden artysta zamiast n_agents obiektów Line2D.
+    fade: Zanikający ślad - ślad dzielony jest na FADE_BANDS kawałków o rosnącej nieprzezroczystości
+    """
+
+    def __init__(self, ax: Axes, colors: NDArray[np.float64], fade: bool = False, **kwargs: Any):
+        self.colors = np.asarray(colors, dtype=np.float64)
+        self.bands = FADE_BANDS if fade else 1
+        self.alpha = kwargs.pop("alpha", 1.0)
+        self.collection = LineCollection([], **kwargs)
+        ax.add_collection(self.collection)
+
+    def update(self, trail: TrailBuffer) -> LineCollection:
+        lines, owners, ages = trail.polylines(self.bands)
+        colors = self.colors[np.array(owners, dtype=np.intp) % len(self.colors)]
+        colors[:, 3] = self.alpha * np.array(ages)
+        self.collection.set_segments(lines)  # type: ignore [arg-type]
+        self.collection.set_color(colors)
+        return self.collection
+
+
+def trail_capacity(num_frames: int, trail_length: int | None) -> int:
+    """Pojemność TrailBuffer: trail_length klatek albo cała historia, ograniczona przez MAX_TRAIL_POINTS."""
+    return max(2, min(num_frames, trail_length or MAX_TRAIL_POINTS))
+
+
+def pixel_size(ax: Axes) -> float:
+    """Rozmiar piksela w jednostkach danych - dla ustawionych już granic osi."""
+    bbox = ax.get_window_extent()
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    return min(abs(x1 - x0) / max(bbox.width, 1.0), abs(y1 - y0) / max(bbox.height, 1.0))
+
+
+def save_animation(anim: Animation, file: str, writer: str | AbstractMovieWriter = "ffmpeg", fps: int = 30) -> None:
+    """Zapis animacji; fps przekazywane tylko nazwie writera - gotowy obiekt MovieWriter ma je już ustawione."""
+    if isinstance(writer, str):
+        anim.save(file, writer=writer, fps=fps)
+    else:
+        anim.save(file, writer=writer)
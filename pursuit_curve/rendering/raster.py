@@ -0,0 +1,381 @@
+"""
+Szybki eksport klatek bez Matplotlib - ślady i znaczniki rysowane wprost do bufora RGB w NumPy.
+
+Canvas rysuje odcinki przez próbkowanie co piksel (wszystkie odcinki klatki naraz, bez pętli
+w Pythonie) i koła jako gotowe maski przesunięć. Widoki (PlaneView, OrbitView) rzutują pozycje
+na piksele - OrbitView to rzut ortograficzny z kamerą obracaną jak ax.view_init, używany dla 3D,
+sfery i torusa. Gotowe klatki trafiają do writera: potoku ffmpeg (surowe rgb24 na stdin), sekwencji
+PNG albo archiwum NPZ. Brak antyaliasingu, podpisów i osi - do jakości publikacyjnej służy
+ścieżka Matplotlib (render_animation).
+"""
+
+import os
+import subprocess
+import zipfile
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+from matplotlib.colors import to_rgba_array
+from numpy.typing import ArrayLike, NDArray
+from PIL import Image
+
+from .frames import FrameSource, TrailBuffer, trail_capacity
+from .video import _check, _run_ffmpeg
+
+DEFAULT_SIZE = (1000, 800)
+"""Rozmiar klatki (szerokość, wysokość) w pikselach"""
+
+MAX_SEGMENT_SAMPLES = 8192
+"""Górna granica liczby próbek jednego odcinka - chroni przed odcinkami wybiegającymi daleko poza klatkę"""
+
+
+class View(Protocol):
+    pixel_size: float
+    """Rozmiar piksela w jednostkach danych"""
+
+    def __call__(self, points: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Pozycje (..., dim) -> współrzędne pikseli (..., 2) jako (kolumna, wiersz)."""
+        ...
+
+
+class PlaneView:
+    """Prostokąt [lower, upper] wpisany w klatkę z zachowaniem proporcji osi (jak ax.set_aspect("equal"))."""
+
+    def __init__(self, lower: ArrayLike, upper: ArrayLike, size: tuple[int, int] = DEFAULT_SIZE, margin: float = 1.0):
+        lower = np.asarray(lower, dtype=np.float64)[:2] - margin
+        upper = np.asarray(upper, dtype=np.float64)[:2] + margin
+        width, height = size
+        self.pixel_size = float(max((upper - lower) / (np.array([width, height]) - 1)))
+        self._center = (lower + upper) / 2
+        self._origin = np.array([(width - 1) / 2, (height - 1) / 2])
+
+    def __call__(self, points: NDArray[np.float64]) -> NDArray[np.float64]:
+        pixels = (points[..., :2] - self._center) / self.pixel_size
+        pixels[..., 1] *= -1
+        return pixels + self._origin
+
+
+class OrbitView:
+    """
+    Rzut ortograficzny sceny 3D oglądanej z kąta elevation nad płaszczyzną XY i azymutu azimuth (stopnie).
+    Kula o środku center i promieniu radius mieści się w klatce przy każdym położeniu kamery.
+    """
+
+    def __init__(
+        self,
+        center: ArrayLike,
+        radius: float,
+        size: tuple[int, int] = DEFAULT_SIZE,
+        elevation: float = 20.0,
+        azimuth: float = 0.0,
+    ):
+        width, height = size
+        self.center = np.asarray(center, dtype=np.float64)
+        self.pixel_size = 2 * radius / (min(width, height) - 1)
+        self.elevation = elevation
+        self._origin = np.array([(width - 1) / 2, (height - 1) / 2])
+        self.rotate(azimuth)
+
+    def rotate(self, azimuth: float) -> None:
+        """Ustawia azymut kamery - odpowiednik ax.view_init(elev=elevation, azim=azimuth)."""
+        el, az = np.radians(self.elevation), np.radians(azimuth)
+        # Wiersze: kierunek w prawo i w górę ekranu (oś "w górę" skierowana do góry obrazu, więc ze znakiem -)
+        self._axes = (
+            np.array(
+                [
+                    [-np.sin(az), np.cos(az), 0.0],
+                    [np.sin(el) * np.cos(az), np.sin(el) * np.sin(az), -np.cos(el)],
+                ]
+            )
+            / self.pixel_size
+        )
+
+    def __call__(self, points: NDArray[np.float64]) -> NDArray[np.float64]:
+        return (points - self.center) @ self._axes.T + self._origin
+
+
+def to_rgb(colors: Any) -> NDArray[np.uint8]:
+    """Kolory Matplotlib (nazwy, RGB, RGBA w [0, 1]) -> tablica (n, 3) uint8; przezroczystość jest pomijana."""
+    return np.rint(to_rgba_array(colors)[:, :3] * 255).astype(np.uint8)
+
+
+def _disc(radius: int) -> NDArray[np.intp]:
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span)
+    inside = dx**2 + dy**2 <= radius**2 + radius
+    return np.stack([dx[inside], dy[inside]], axis=1)
+
+
+def _square(radius: int) -> NDArray[np.intp]:
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span)
+    return np.stack([dx.ravel(), dy.ravel()], axis=1)
+
+
+class Canvas:
+    """
+    Bufor RGB (height, width, 3) uint8 z rysowaniem wielu odcinków i kół jednym wywołaniem.
+
+    Koszt rysowania zależy tylko od liczby zamalowanych pikseli, nie od rozmiaru klatki: powtórzone
+    piksele odrzucane są przez pomocniczą mapę (height * width,), do której każdy piksel wpisuje swój
+    numer kolejny - zostaje ostatni wpis, więc kolor mieszany jest raz na piksel i nie trzeba sortować
+    ani czyścić mapy między wywołaniami.
+    """
+
+    def __init__(self, size: tuple[int, int] = DEFAULT_SIZE, background: Any = "white"):
+        self.width, self.height = size
+        self.background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.background[:] = to_rgb([background])[0]
+        self.pixels = self.background.copy()
+        self._flat = self.pixels.reshape(-1, 3)
+        self._latest = np.empty(self.height * self.width, dtype=np.intp)
+        self._masks: dict[tuple[str, int], NDArray[np.intp]] = {}
+
+    def clear(self) -> None:
+        np.copyto(self.pixels, self.background)
+
+    def _mask(self, shape: str, radius: int) -> NDArray[np.intp]:
+        if (shape, radius) not in self._masks:
+            self._masks[shape, radius] = _disc(radius) if shape == "disc" else _square(radius)
+        return self._masks[shape, radius]
+
+    def _pixels(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        owners: NDArray[np.intp],
+        mask: NDArray[np.intp] | None = None,
+    ) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+        """
+        Piksele najbliższe punktom (x, y), poszerzone o przesunięcia mask, bez powtórzeń i bez pikseli
+        spoza klatki. Zwraca (indeksy w spłaszczonej klatce, właściciele) - przy powtórzeniu wygrywa
+        ostatni punkt.
+        """
+        if mask is not None:
+            # Najpierw bez powtórzeń - gęste próbki odcinków trafiają wielokrotnie w ten sam piksel
+            index, owners = self._pixels(x, y, owners)
+            column, row = index % self.width, index // self.width
+            column = (column[:, np.newaxis] + mask[:, 0]).ravel()
+            row = (row[:, np.newaxis] + mask[:, 1]).ravel()
+            owners = np.repeat(owners, len(mask))
+        else:
+            column = np.rint(x).astype(np.intp)
+            row = np.rint(y).astype(np.intp)
+        inside = (column >= 0) & (column < self.width) & (row >= 0) & (row < self.height)
+        index = row[inside] * self.width + column[inside]
+        owners = owners[inside]
+
+        order = np.arange(len(index))
+        self._latest[index] = order
+        latest = self._latest[index] == order
+        return index[latest], owners[latest]
+
+    def _paint(
+        self,
+        index: NDArray[np.intp],
+        owners: NDArray[np.intp],
+        colors: NDArray[np.uint8],
+        alpha: NDArray[np.float64] | None,
+    ) -> None:
+        if alpha is None:
+            self._flat[index] = colors[owners]
+            return
+        # Mieszanie w liczbach całkowitych: (tło * (255 - a) + kolor * a) / 255
+        weight = np.rint(np.clip(alpha, 0.0, 1.0) * 255).astype(np.uint32)[owners, np.newaxis]
+        blended = self._flat[index] * (255 - weight) + colors[owners] * weight
+        self._flat[index] = (blended + 127) // 255
+
+    def lines(
+        self,
+        starts: NDArray[np.float64],
+        ends: NDArray[np.float64],
+        colors: NDArray[np.uint8],
+        alpha: NDArray[np.float64] | None = None,
+        width: int = 1,
+    ) -> None:
+        """
+        Odcinki starts[i] -> ends[i] (współrzędne pikseli (m, 2)) w kolorach colors (m, 3).
+        alpha: Nieprzezroczystość odcinków (m,); None - kolor nadpisuje tło
+        width: Grubość w pikselach (parzysta zaokrąglana w górę do nieparzystej)
+        Piksel pokryty przez kilka odcinków dostaje kolor odcinka o największym indeksie.
+        """
+        if not len(starts):
+            return
+        x0, y0 = starts[:, 0], starts[:, 1]
+        dx, dy = ends[:, 0] - x0, ends[:, 1] - y0
+        samples = np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(np.intp) + 1
+        np.minimum(samples, MAX_SEGMENT_SAMPLES, out=samples)
+        owners = np.repeat(np.arange(len(starts)), samples)
+        offset = np.arange(len(owners)) - np.repeat(np.cumsum(samples) - samples, samples)
+        fraction = offset / np.repeat(np.maximum(samples - 1, 1), samples)
+
+        mask = self._mask("square", width // 2) if width > 1 else None
+        x = x0[owners] + fraction * dx[owners]
+        y = y0[owners] + fraction * dy[owners]
+        self._paint(*self._pixels(x, y, owners, mask), colors, alpha)
+
+    def discs(self, centers: NDArray[np.float64], colors: NDArray[np.uint8], radius: int = 5) -> None:
+        """Koła o środkach centers (współrzędne pikseli (n, 2)) w kolorach colors (n, 3)."""
+        mask = self._mask("disc", radius) if radius > 0 else None
+        self._paint(*self._pixels(centers[:, 0], centers[:, 1], np.arange(len(centers)), mask), colors, None)
+
+    def crosses(self, centers: NDArray[np.float64], colors: NDArray[np.uint8], size: int = 6, width: int = 2) -> None:
+        """Znaczniki "x" - odpowiednik markera "x" Matplotlib."""
+        arm = np.array([[size, size], [size, -size]], dtype=np.float64)
+        starts = (centers[:, np.newaxis, :] - arm).reshape(-1, 2)
+        ends = (centers[:, np.newaxis, :] + arm).reshape(-1, 2)
+        self.lines(starts, ends, np.repeat(colors, 2, axis=0), width=width)
+
+
+class FrameWriter(Protocol):
+    def write(self, frame: NDArray[np.uint8]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class FFmpegPipeWriter:
+    """Surowe klatki rgb24 na stdin procesu ffmpeg - bez plików pośrednich."""
+
+    def __init__(self, file: str | os.PathLike, size: tuple[int, int], fps: int = 30, codec: str = "libx264"):
+        width, height = size
+        # Wymiary muszą być parzyste dla yuv420p
+        self._process = _run_ffmpeg(
+            ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+            + ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", codec, "-pix_fmt", "yuv420p", str(file)],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, frame: NDArray[np.uint8]) -> None:
+        assert self._process.stdin is not None
+        self._process.stdin.write(frame.data)
+
+    def close(self) -> None:
+        assert self._process.stdin is not None
+        self._process.stdin.close()
+        _check(self._process)
+
+
+class PNGSequenceWriter:
+    """
+    Każda klatka w osobnym pliku PNG.
+    pattern: Ścieżka z polem formatu na numer klatki, np. "frames/frame_{:05d}.png"
+    compress_level: Poziom kompresji zlib (0-9) - niski jest wielokrotnie szybszy
+    """
+
+    def __init__(self, pattern: str, compress_level: int = 1):
+        self.pattern = pattern
+        self.compress_level = compress_level
+        self.count = 0
+        Path(pattern.format(0)).parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame: NDArray[np.uint8]) -> None:
+        Image.fromarray(frame).save(self.pattern.format(self.count), compress_level=self.compress_level)
+        self.count += 1
+
+    def close(self) -> None:
+        pass
+
+
+class NPZWriter:
+    """
+    Klatki jako tablice frame_00000, frame_00001, ... archiwum NPZ (np.load(file)["frame_00000"]).
+    Każda klatka zapisywana jest od razu do archiwum, więc pamięć nie rośnie z liczbą klatek.
+    """
+
+    def __init__(self, file: str | os.PathLike, compress: bool = False):
+        self._zip = zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        self.count = 0
+
+    def write(self, frame: NDArray[np.uint8]) -> None:
+        with self._zip.open(f"frame_{self.count:05d}.npy", "w", force_zip64=True) as entry:
+            np.lib.format.write_array(entry, frame)
+        self.count += 1
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+def open_writer(file: str | os.PathLike, size: tuple[int, int], fps: int = 30) -> FrameWriter:
+    """Writer dobrany po rozszerzeniu: .npz - NPZWriter, .png - PNGSequenceWriter, inne - potok ffmpeg."""
+    path = Path(file)
+    if path.suffix == ".npz":
+        return NPZWriter(path)
+    if path.suffix == ".png":
+        pattern = str(path)
+        if "{" not in pattern:
+            pattern = str(path.with_name(f"{path.stem}_{{:05d}}{path.suffix}"))
+        return PNGSequenceWriter(pattern)
+    return FFmpegPipeWriter(path, size, fps)
+
+
+def render_raster(
+    frames: FrameSource,
+    file: str | os.PathLike | FrameWriter,
+    colors: Any,
+    size: tuple[int, int] = DEFAULT_SIZE,
+    trail_length: int | None = None,
+    fade: bool = False,
+    alpha: float = 0.6,
+    line_width: int = 2,
+    marker_radius: int = 6,
+    endpoints: bool = True,
+    surface: NDArray[np.float64] | None = None,
+    elevation: float = 20.0,
+    azimuth: float = 0.0,
+    rotation: float = 0.0,
+    fps: int = 30,
+) -> int:
+    """
+    Rysuje klatki z frames i przekazuje je do writera. Zwraca liczbę klatek.
+
+    file: Plik wyjściowy (writer wg open_writer) albo gotowy obiekt z write(frame) i close()
+    colors: Kolory agentów (n_agents) w dowolnym formacie Matplotlib
+    fade: Zanikające ślady - nieprzezroczystość odcinka rośnie liniowo z jego wiekiem
+    endpoints: Znaczniki pozycji startowej (koło) i końcowej ("x") każdego agenta
+    surface: Punkty (k, 3) powierzchni rysowane jako tło sceny 3D (siatka sfery, torusa)
+    elevation, azimuth, rotation: Kamera sceny 3D - azymut klatki frame to azimuth + frame * rotation
+    Scena 2D rzutowana jest przez PlaneView, 3D przez OrbitView obejmujący kulę opisaną na zakresie danych.
+    """
+    lower, upper = frames.bounds()
+    view: View
+    if frames.dim == 2:
+        view = PlaneView(lower, upper, size)
+    else:
+        if surface is not None:
+            surface = np.asarray(surface, dtype=np.float64)
+            lower, upper = np.minimum(lower, surface.min(axis=0)), np.maximum(upper, surface.max(axis=0))
+        view = OrbitView((lower + upper) / 2, np.linalg.norm(upper - lower) / 2 + 1.0, size, elevation, azimuth)
+
+    rgb = to_rgb(colors)
+    n_agents = len(frames[0])
+    rgb = rgb[np.arange(n_agents) % len(rgb)]
+    canvas = Canvas(size)
+    surface_color = np.array([[200, 215, 230]], dtype=np.uint8)
+
+    trail = TrailBuffer(n_agents, frames.dim, trail_capacity(len(frames), trail_length), min_spacing=view.pixel_size)
+    first, last = frames[0].copy(), frames[-1].copy()
+    writer = open_writer(file, size, fps) if isinstance(file, (str, os.PathLike)) else file
+    try:
+        for frame, positions in enumerate(frames):
+            trail.push(positions)
+            if isinstance(view, OrbitView):
+                view.rotate(azimuth + frame * rotation)
+
+            canvas.clear()
+            if surface is not None:
+                canvas.discs(view(surface), np.repeat(surface_color, len(surface), axis=0), radius=0)
+
+            starts, ends, agents, ages = trail.segments()
+            canvas.lines(
+                view(starts), view(ends), rgb[agents], alpha * ages if fade else np.full(len(ages), alpha), line_width
+            )
+
+            if endpoints:
+                canvas.discs(view(first), rgb, radius=marker_radius // 2 + 1)
+                canvas.crosses(view(last), rgb, size=marker_radius)
+            canvas.discs(view(positions), rgb, radius=marker_radius)
+            writer.write(canvas.pixels)
+    finally:
+        writer.close()
+    return len(frames)
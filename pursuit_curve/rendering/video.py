@@ -0,0 +1,162 @@
+"""
+Zapis animacji do wideo - sekwencyjnie przez FuncAnimation albo równolegle w procesach roboczych.
+
+Animacja opisana jest fabryką sceny (Scene): funkcją bez argumentów, która buduje figurę i zwraca
+update(frame). Przy render_parallel każdy proces buduje własną figurę, rysuje swój przedział klatek
+i przesyła surowe bufory RGBA do osobnego procesu ffmpeg. Segmenty są na końcu sklejane bez ponownego
+kodowania (demuxer concat, -c copy).
+"""
+
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.animation import AbstractMovieWriter, FuncAnimation
+from matplotlib.figure import Figure
+
+from .frames import FrameSource, TrailBuffer, save_animation
+
+
+@dataclass
+class Scene:
+    fig: Figure
+    update: Callable[[int], Iterable[Any]]
+    """Rysuje klatkę o podanym numerze, zwraca zmienione artysty (jak funkcja FuncAnimation)"""
+    init: Callable[[], Iterable[Any]] | None = None
+    frames: FrameSource | None = None
+    trail: TrailBuffer | None = None
+    """Ślad odtwarzany przez seek() - update(frame) dopisuje do niego tylko klatkę frame"""
+
+    def seek(self, frame: int) -> None:
+        """Odtwarza stan śladu sprzed klatki frame bez rysowania - proces roboczy zaczyna w środku animacji."""
+        if self.trail is None or self.frames is None:
+            return
+        self.trail.clear()
+        for index in range(frame):
+            self.trail.push(self.frames[index])
+
+
+SceneFactory = Callable[[], Scene]
+
+
+def _ffmpeg() -> str:
+    return matplotlib.rcParams["animation.ffmpeg_path"]
+
+
+def _run_ffmpeg(args: list[str], **kwargs: Any) -> subprocess.Popen:
+    return subprocess.Popen([_ffmpeg(), "-y", "-loglevel", "error", *args], **kwargs)
+
+
+def _check(process: subprocess.Popen) -> None:
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg zakończył się kodem {process.returncode}")
+
+
+def _render_segment(factory: SceneFactory, start: int, stop: int, path: str, fps: int, codec: str) -> int:
+    """Rysuje klatki [start, stop) i koduje je do pliku path. Zwraca liczbę klatek."""
+    plt.switch_backend("agg")
+    scene = factory()
+    if scene.init is not None:
+        scene.init()
+    scene.seek(start)
+    canvas = scene.fig.canvas
+    canvas.draw()
+    width, height = canvas.get_width_height(physical=True)
+
+    # Wymiary muszą być parzyste dla yuv420p
+    encoder = _run_ffmpeg(
+        ["-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+        + ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", codec, "-pix_fmt", "yuv420p", path],
+        stdin=subprocess.PIPE,
+    )
+    assert encoder.stdin is not None
+    try:
+        for frame in range(start, stop):
+            scene.update(frame)
+            canvas.draw()
+            encoder.stdin.write(canvas.buffer_rgba())  # type: ignore [attr-defined]
+    finally:
+        encoder.stdin.close()
+        plt.close(scene.fig)
+    _check(encoder)
+    return stop - start
+
+
+def concat_segments(segments: list[Path], file: str | os.PathLike) -> None:
+    """Skleja pliki wideo o tych samych parametrach bez ponownego kodowania."""
+    listing = Path(file).with_suffix(".segments.txt")
+    listing.write_text("".join(f"file '{segment.resolve()}'\n" for segment in segments))
+    try:
+        _check(_run_ffmpeg(["-f", "concat", "-safe", "0", "-i", str(listing), "-c", "copy", str(file)]))
+    finally:
+        listing.unlink()
+
+
+def render_parallel(
+    factory: SceneFactory,
+    num_frames: int,
+    file: str | os.PathLike,
+    workers: int | None = None,
+    fps: int = 30,
+    codec: str = "libx264",
+) -> None:
+    """
+    Dzieli klatki na workers równych przedziałów i rysuje je w osobnych procesach.
+
+    factory: Funkcja budująca scenę - musi dać się zserializować (funkcja modułu lub functools.partial)
+    workers: Liczba procesów; domyślnie os.cpu_count()
+    codec: Kodek segmentów; segmenty są sklejane bez ponownego kodowania
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, num_frames))
+    edges = np.linspace(0, num_frames, workers + 1).astype(int).tolist()
+    starts, stops = edges[:-1], edges[1:]
+
+    with tempfile.TemporaryDirectory(dir=Path(file).resolve().parent) as tmp:
+        segments = [Path(tmp) / f"segment_{index:04d}.mp4" for index in range(workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            # list() - wyjątek z procesu roboczego przerywa zapis
+            list(
+                pool.map(
+                    _render_segment, repeat(factory), starts, stops, map(str, segments), repeat(fps), repeat(codec)
+                )
+            )
+        concat_segments(segments, file)
+
+
+def render_animation(
+    factory: SceneFactory,
+    num_frames: int,
+    file: str | os.PathLike,
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    fps: int = 30,
+    workers: int = 1,
+    blit: bool = False,
+) -> None:
+    """
+    Zapis animacji sceny: workers > 1 (tylko writer "ffmpeg") - render_parallel, w przeciwnym razie
+    FuncAnimation na jednej figurze.
+    """
+    if workers > 1 and writer == "ffmpeg":
+        render_parallel(factory, num_frames, file, workers, fps)
+        return
+
+    scene = factory()
+    anim = FuncAnimation(
+        scene.fig,
+        scene.update,
+        init_func=scene.init,
+        frames=num_frames,
+        interval=50,
+        blit=blit,
+        repeat=True,
+    )
+    save_animation(anim, str(file), writer, fps)
+    plt.close(scene.fig)
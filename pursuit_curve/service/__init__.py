@@ -0,0 +1,7 @@
+from .engine import ServiceClient, SimulationService, SimulationUpdate
+
+__all__ = [
+    "ServiceClient",
+    "SimulationService",
+    "SimulationUpdate",
+]
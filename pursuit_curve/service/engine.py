@@ -0,0 +1,436 @@
+"""
+Usługa symulacji dla interaktywnych widoków (dashboard ipywidgets): przesunięcie suwaka zleca nowy
+scenariusz bez blokowania pętli zdarzeń, a wyniki spływają porcjami w trakcie całkowania.
+
+- Scenariusze liczone są w puli procesów (jak sweep.run_sweep) - build(**params) w procesie roboczym
+  zwraca (initial_state, strategy), więc przez granicę procesu idą tylko parametry.
+- Każdy klient (ServiceClient, np. jeden widok) ma co najwyżej jedno bieżące zadanie. Nowe zlecenie
+  anuluje poprzednie: zadanie czekające w kolejce puli nie startuje, a liczone kończy się po bieżącym
+  kroku - proces roboczy sprawdza znacznik anulowania we współdzielonej tablicy.
+- Proces roboczy całkuje przyrostowo (common.ProgressiveSimulation) i odsyła co interval sekund porcję
+  przerzedzonej trajektorii (co najwyżej jeden krok na przedział czasu resolution) z metrykami
+  dotychczasowych kroków (metrics.MetricsAccumulator). Pierwsza porcja wychodzi po pierwszym kroku,
+  więc pierwszy częściowy wynik nie czeka na interval.
+- Przeciwciśnienie: skrzynka klienta mieści maxsize porcji; gdy konsument nie nadąża, kolejne porcje
+  tego samego zadania są doklejane do ostatniej zamiast rosnąć kolejką, a porcje zadań zastąpionych
+  nowym zleceniem są usuwane.
+
+workers=0 liczy zadania w wątku bieżącego procesu - bez puli procesów (testy, lokalny klient).
+"""
+
+import asyncio
+import collections
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pursuit_curve.common import ProgressiveSimulation, Strategy
+from pursuit_curve.metrics import Geometry, MetricsAccumulator, PursuitMetrics
+
+logger = logging.getLogger(__name__)
+
+BuildFn = Callable[..., tuple[list[float], Strategy]]
+
+INTERVAL = 0.05
+"""Domyślny odstęp [s] między porcjami wyników wysyłanymi przez proces roboczy"""
+MAILBOX_SIZE = 4
+"""Domyślna liczba porcji czekających w skrzynce klienta"""
+CHECK_INTERVAL = 0.01
+"""Odstęp [s] między porcjami ProgressiveSimulation w procesie roboczym - co tyle sprawdzane jest anulowanie"""
+CANCEL_SLOTS = 4096
+"""
+Rozmiar współdzielonej tablicy znaczników anulowania. Zadanie job_id zajmuje pole job_id % CANCEL_SLOTS,
+a anulowanie wpisuje tam job_id - stary wpis nie pasuje do żadnego nowszego zadania.
+"""
+
+# Kanały usług w procesie roboczym: token usługi -> (kolejka wyników, znaczniki anulowania)
+_CHANNELS: dict[int, tuple[Any, Any]] = {}
+_TOKENS = itertools.count()
+
+
+@dataclass
+class SimulationUpdate:
+    """
+    Porcja wyników zadania. Kolejne porcje zadania są rozłączne - trajektorię skleja się z nich
+    po kolei (merge). Ostatnia porcja ma done=True.
+    """
+
+    job_id: int
+    params: dict[str, Any]
+    t: NDArray[np.float64]
+    """Czasy przerzedzonych kroków (k,)"""
+    y: NDArray[np.float64]
+    """Stany w tych krokach (n_states, k)"""
+    metrics: PursuitMetrics | None = None
+    """Metryki wszystkich dotychczasowych kroków (nie tylko przerzedzonych)"""
+    done: bool = False
+    status: int | None = None
+    """Status integratora po zakończeniu (1 - złapanie celu, 0 - koniec t_span, -1 - błąd kroku)"""
+    message: str = ""
+    capture_time: float = np.nan
+    error: str | None = None
+    """Wyjątek zadania (build, całkowanie) jako tekst; porcja z błędem ma done=True"""
+    latency: float = np.nan
+    """Czas od zlecenia do dostarczenia porcji do skrzynki klienta [s]"""
+    n_merged: int = field(default=1, repr=False)
+    """Liczba porcji sklejonych w tę jedną przez przeciwciśnienie"""
+
+    def merge(self, later: "SimulationUpdate") -> "SimulationUpdate":
+        """Porcja obejmująca tę i następną porcję tego samego zadania."""
+        # Porcja bez kroków (np. błąd zadania) ma y o kształcie (0, 0) - nie da się jej sklejać
+        parts = [update for update in (self, later) if len(update.t)] or [later]
+        return SimulationUpdate(
+            job_id=self.job_id,
+            params=self.params,
+            t=np.concatenate([update.t for update in parts]),
+            y=np.concatenate([update.y for update in parts], axis=1),
+            metrics=later.metrics if later.metrics is not None else self.metrics,
+            done=later.done,
+            status=later.status,
+            message=later.message,
+            capture_time=later.capture_time,
+            error=later.error,
+            latency=self.latency,
+            n_merged=self.n_merged + later.n_merged,
+        )
+
+
+def _install(token: int, updates: Any, cancelled: Any) -> None:
+    """Inicjalizator procesu roboczego - kanały nie dają się zpicklować w zadaniu, tylko przy starcie procesu."""
+    _CHANNELS[token] = (updates, cancelled)
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _run_job(
+    token: int,
+    job_id: int,
+    build: BuildFn,
+    params: dict[str, Any],
+    t_span: tuple[float, float],
+    max_step: float,
+    method: str | None,
+    geometry: Geometry | None,
+    resolution: float,
+    interval: float,
+) -> None:
+    """Zadanie procesu roboczego: porcje ProgressiveSimulation zbierane i wysyłane co interval do kolejki usługi."""
+    updates, cancelled = _CHANNELS[token]
+    slot = job_id % len(cancelled)
+    try:
+        initial_state, strategy = build(**params)
+        method = method or strategy.integrator or "dopri5"
+        simulation = ProgressiveSimulation(initial_state, strategy, t_span, max_step, method, interval=CHECK_INTERVAL)
+        accumulator = MetricsAccumulator(simulation.initial_state.size, geometry)
+        times: list[NDArray[np.float64]] = []
+        states: list[NDArray[np.float64]] = []
+        bucket = -np.inf
+        last_sent: float | None = None
+        for chunk in simulation:
+            if cancelled[slot] == job_id:
+                return
+            accumulator.update(chunk.t, chunk.y, chunk.f)
+            keep = _decimate(chunk.t, bucket, resolution)
+            if chunk.done and len(keep):
+                # Ostatni krok zawsze trafia do wyniku, nawet gdy przerzedzenie go pominęło
+                keep[-1] = True
+            if resolution > 0 and len(chunk.t):
+                bucket = np.floor(chunk.t[-1] / resolution)
+            times.append(chunk.t[keep])
+            states.append(chunk.y[:, keep])
+            now = time.monotonic()
+            # Pierwsza porcja symulacji (po pierwszym kroku) wychodzi od razu, kolejne co interval
+            if chunk.done or last_sent is None or now - last_sent >= interval:
+                update = SimulationUpdate(
+                    job_id, params, np.concatenate(times), np.concatenate(states, axis=1), accumulator.result()
+                )
+                times, states = [], []
+                last_sent = now
+                if chunk.done:
+                    update.done = True
+                    update.status = simulation.status
+                    update.message = simulation.message
+                    if simulation.t_events[0]:
+                        update.capture_time = simulation.t_events[0][0]
+                updates.put((job_id, update))
+    except Exception as e:
+        updates.put((job_id, _failure(job_id, params, f"{type(e).__name__}: {e}")))
+
+
+def _decimate(t: NDArray[np.float64], bucket: float, resolution: float) -> NDArray[np.bool_]:
+    """Maska kroków wysyłanych do klienta - pierwszy krok w każdym przedziale czasu o długości resolution."""
+    if resolution <= 0:
+        return np.ones(len(t), dtype=bool)
+    buckets = np.floor(t / resolution)
+    return np.diff(buckets, prepend=bucket) != 0
+
+
+def _failure(job_id: int, params: dict[str, Any], error: str) -> SimulationUpdate:
+    return SimulationUpdate(job_id, params, np.empty(0), np.empty((0, 0)), done=True, status=-1, error=error)
+
+
+class ServiceClient:
+    """
+    Połączenie z usługą (SimulationService.connect) - np. jeden widok dashboardu.
+    submit() zleca scenariusz i zastępuje poprzedni, porcje wyników odbiera się przez get()
+    albo iterację (async for).
+    """
+
+    def __init__(self, service: "SimulationService", maxsize: int):
+        self._service = service
+        self._maxsize = maxsize
+        self._mailbox: collections.deque[SimulationUpdate] = collections.deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.job_id: int | None = None
+        """Bieżące zadanie klienta"""
+        self.n_dropped = 0
+        """Porcje zadań zastąpionych, które nie zostały odebrane"""
+
+    def submit(self, **params: Any) -> int:
+        """Zleca scenariusz build(**params), anulując poprzednie zadanie klienta. Zwraca job_id."""
+        if self._closed:
+            raise RuntimeError("Klient został zamknięty")
+        self.cancel()
+        self.job_id = self._service._submit(self, params)
+        return self.job_id
+
+    def cancel(self) -> None:
+        """Anuluje bieżące zadanie i usuwa jego nieodebrane porcje."""
+        if self.job_id is not None:
+            self._service._cancel(self.job_id)
+            self.job_id = None
+        self.n_dropped += sum(update.n_merged for update in self._mailbox)
+        self._mailbox.clear()
+        self._ready.clear()
+
+    def _deliver(self, update: SimulationUpdate) -> None:
+        if update.job_id != self.job_id:
+            return
+        if len(self._mailbox) >= self._maxsize:
+            self._mailbox[-1] = self._mailbox[-1].merge(update)
+        else:
+            self._mailbox.append(update)
+        self._ready.set()
+
+    async def _wait(self) -> None:
+        while not self._mailbox and not self._closed:
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def get(self) -> SimulationUpdate:
+        """Najstarsza nieodebrana porcja bieżącego zadania - czeka, jeśli skrzynka jest pusta."""
+        await self._wait()
+        if not self._mailbox:
+            raise RuntimeError("Klient został zamknięty")
+        return self._mailbox.popleft()
+
+    def get_nowait(self) -> SimulationUpdate | None:
+        return self._mailbox.popleft() if self._mailbox else None
+
+    async def result(self) -> SimulationUpdate:
+        """Cała trajektoria bieżącego zadania - porcje sklejone do porcji z done=True."""
+        job_id = self.job_id
+        update = await self.get()
+        while not update.done:
+            later = await self.get()
+            if later.job_id != job_id:
+                raise RuntimeError(f"Zadanie {job_id} zostało zastąpione zadaniem {later.job_id}")
+            update = update.merge(later)
+        return update
+
+    def __aiter__(self) -> AsyncIterator[SimulationUpdate]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[SimulationUpdate]:
+        # Iteracja kończy się po close()
+        while True:
+            await self._wait()
+            if not self._mailbox:
+                return
+            yield self._mailbox.popleft()
+
+    def close(self) -> None:
+        self.cancel()
+        self._closed = True
+        self._ready.set()
+        self._service._clients.discard(self)
+
+
+class SimulationService:
+    """
+    build: Funkcja na poziomie modułu (musi dać się zpicklować) zwracająca dla parametrów scenariusza
+           (initial_state, strategy) - jak w sweep.run_sweep
+    t_span: Przedział czasu symulacji
+    max_step: Maksymalny krok integratora
+    method: Integrator jak w ProgressiveSimulation (domyślnie strategy.integrator, a gdy nie jest
+            ustawiony - "dopri5")
+    geometry: Geometria metryk (metrics.Geometry); domyślnie Euclidean(2)
+    workers: Liczba procesów roboczych; 0 - zadania w wątku bieżącego procesu
+    resolution: Przerzedzenie trajektorii - co najwyżej jeden krok na przedział czasu o tej długości
+                (0 - każdy krok); metryki liczone są ze wszystkich kroków
+    interval: Odstęp [s] między porcjami wysyłanymi w trakcie całkowania
+    mp_context: Kontekst multiprocessing puli (domyślnie domyślny kontekst platformy)
+
+    Usługa działa w pętli asyncio - start() (albo async with) uruchamia i rozgrzewa pulę, żeby pierwsze
+    zlecenie nie czekało na start procesów i import modułów.
+    """
+
+    def __init__(
+        self,
+        build: BuildFn,
+        t_span: tuple[float, float] = (0, 50),
+        max_step: float = 0.1,
+        method: str | None = None,
+        geometry: Geometry | None = None,
+        workers: int = 1,
+        resolution: float = 0.0,
+        interval: float = INTERVAL,
+        mp_context: Any = None,
+    ):
+        if workers < 0:
+            raise ValueError(f"Niepoprawna liczba procesów roboczych: {workers}")
+        self.build = build
+        self.t_span = t_span
+        self.max_step = max_step
+        self.method = method
+        self.geometry = geometry
+        self.workers = workers
+        self.resolution = resolution
+        self.interval = interval
+        self._mp_context = mp_context
+        self._token = next(_TOKENS)
+        self._job_ids = itertools.count(1)
+        self._jobs: dict[int, tuple[ServiceClient, Future, float]] = {}
+        self._clients: set[ServiceClient] = set()
+        self._pool: Executor | None = None
+        self._updates: Any = None
+        self._cancelled: Any = None
+        self._reader: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self) -> None:
+        if self._pool is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._cancelled = multiprocessing.RawArray("q", CANCEL_SLOTS)
+        if self.workers == 0:
+            self._updates = queue.SimpleQueue()
+            _install(self._token, self._updates, self._cancelled)
+            self._pool = ThreadPoolExecutor(1, thread_name_prefix="simulation")
+        else:
+            context = self._mp_context or multiprocessing.get_context()
+            self._updates = context.Queue()
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_install,
+                initargs=(self._token, self._updates, self._cancelled),
+            )
+            # Procesy powstają przy pierwszych zadaniach - przed startem wątku czytającego (fork z wątkami)
+            warmup = [self._pool.submit(_warmup) for _ in range(self.workers)]
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in warmup))
+        self._reader = threading.Thread(target=self._read, name="simulation-updates", daemon=True)
+        self._reader.start()
+
+    async def close(self) -> None:
+        if self._pool is None:
+            return
+        for client in list(self._clients):
+            client.close()
+        pool, self._pool = self._pool, None
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+        self._updates.put(None)
+        await asyncio.to_thread(self._reader.join)  # type: ignore [union-attr]
+        if self.workers == 0:
+            _CHANNELS.pop(self._token, None)
+        else:
+            self._updates.close()
+
+    async def __aenter__(self) -> "SimulationService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def connect(self, maxsize: int = MAILBOX_SIZE) -> ServiceClient:
+        """Nowy klient; maxsize - pojemność skrzynki porcji (patrz przeciwciśnienie w opisie modułu)."""
+        if self._pool is None:
+            raise RuntimeError("Usługa nie została uruchomiona (start())")
+        if maxsize < 1:
+            raise ValueError(f"Niepoprawna pojemność skrzynki: {maxsize}")
+        client = ServiceClient(self, maxsize)
+        self._clients.add(client)
+        return client
+
+    def _submit(self, client: ServiceClient, params: dict[str, Any]) -> int:
+        if self._pool is None:
+            raise RuntimeError("Usługa nie została uruchomiona (start())")
+        job_id = next(self._job_ids)
+        future = self._pool.submit(
+            _run_job,
+            self._token,
+            job_id,
+            self.build,
+            params,
+            self.t_span,
+            self.max_step,
+            self.method,
+            self.geometry,
+            self.resolution,
+            self.interval,
+        )
+        self._jobs[job_id] = (client, future, time.monotonic())
+        future.add_done_callback(lambda f: self._call_soon(self._finished, job_id, params, f))
+        return job_id
+
+    def _cancel(self, job_id: int) -> None:
+        job = self._jobs.pop(job_id, None)
+        if job is not None and not job[1].cancel():
+            # Zadanie już liczone - proces roboczy przerwie je po bieżącym kroku
+            self._cancelled[job_id % CANCEL_SLOTS] = job_id
+
+    def _finished(self, job_id: int, params: dict[str, Any], future: Future) -> None:
+        """Błąd puli (np. proces roboczy zabity przez system) - wyjątki zadania zgłasza samo zadanie."""
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        self._dispatch(job_id, _failure(job_id, params, f"{type(error).__name__}: {error}"))
+
+    def _read(self) -> None:
+        """Wątek czytający kolejkę wyników procesów roboczych."""
+        while (message := self._updates.get()) is not None:
+            self._call_soon(self._dispatch, *message)
+
+    def _call_soon(self, callback: Callable[..., None], *args: Any) -> None:
+        """Wywołanie w wątku pętli zdarzeń z wątku puli albo wątku czytającego."""
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)  # type: ignore [union-attr]
+        except RuntimeError:
+            # Pętla zdarzeń już zamknięta - nie ma komu dostarczyć wyniku
+            pass
+
+    def _dispatch(self, job_id: int, update: SimulationUpdate) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        client, _, submitted = job
+        if update.done:
+            del self._jobs[job_id]
+        if update.error is not None:
+            logger.warning("Zadanie %d zakończone błędem: %s", job_id, update.error, extra={"params": update.params})
+        update.latency = time.monotonic() - submitted
+        client._deliver(update)
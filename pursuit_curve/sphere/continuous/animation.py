@@ -1,24 +1,38 @@
+import logging
+from functools import partial
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
-
+from matplotlib.animation import AbstractMovieWriter
+from numpy.typing import NDArray
+
+from pursuit_curve.rendering import (
+    FrameSource,
+    Scene,
+    TrailBuffer,
+    pixel_size,
+    render_animation,
+    render_raster,
+    trail_capacity,
+)
 from pursuit_curve.sphere.utils import spherical_to_cartesian
 
+logger = logging.getLogger(__name__)
+
 
-def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
-    t_eval = np.linspace(solution.t[0], solution.t[-1], num_frames)
-    y_interp = solution.sol(t_eval)
+def _to_cartesian(y: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Stany [r, θ, φ] ścigającego i celu (6, k) -> pozycje kartezjańskie (k, 2, 3)."""
+    r, theta, phi = y.reshape(2, 3, -1).transpose(1, 0, 2)
+    return spherical_to_cartesian(r, theta, phi).transpose(2, 1, 0)  # type: ignore [arg-type]
 
-    p_r, p_theta, p_phi = y_interp[0:3]
-    t_r, t_theta, t_phi = y_interp[3:6]
 
-    p_x, p_y, p_z = spherical_to_cartesian(p_r, p_theta, p_phi)
-    t_x, t_y, t_z = spherical_to_cartesian(t_r, t_theta, t_phi)
+def _sphere_pursuit_scene(solution, num_frames: int, trail_length: int | None) -> Scene:
+    frames = FrameSource(solution, num_frames, transform=_to_cartesian, dim=3)
 
     fig = plt.figure(figsize=(14, 10))
     ax = fig.add_subplot(111, projection="3d")
 
-    radius = t_r[0]  # Zakładamy, że cel jest na stałym promieniu
+    radius = solution.sol(solution.t[0])[3]  # Zakładamy, że cel jest na stałym promieniu
     u = np.linspace(0, 2 * np.pi, 50)
     v = np.linspace(0, np.pi, 50)
     sphere_x = radius * np.outer(np.sin(v), np.cos(u))
@@ -27,9 +41,9 @@ def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
 
     ax.plot_surface(sphere_x, sphere_y, sphere_z, alpha=0.1, color="lightblue", linewidth=0, antialiased=True)
 
-    all_coords = np.concatenate([p_x, p_y, p_z, t_x, t_y, t_z])
+    lower, upper = frames.bounds()
     margin = 2.0
-    limit = max(abs(all_coords.max()), abs(all_coords.min())) + margin
+    limit = max(np.abs(lower).max(), np.abs(upper).max()) + margin
     ax.set_xlim(-limit, limit)
     ax.set_ylim(-limit, limit)
     ax.set_zlim(-limit, limit)
@@ -40,10 +54,9 @@ def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
     (current_pursuer,) = ax.plot([], [], [], "bo", markersize=12, alpha=0.9)
 
     # Punkty startowe i końcowe
+    (p_start, t_start), (p_end, t_end) = frames[0].copy(), frames[-1].copy()
     ax.plot(
-        [t_x[0]],
-        [t_y[0]],
-        [t_z[0]],
+        *t_start[:, None],
         "r^",
         markersize=15,
         label="Start T",
@@ -51,17 +64,15 @@ def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
         markeredgewidth=2,
     )
     ax.plot(
-        [p_x[0]],
-        [p_y[0]],
-        [p_z[0]],
+        *p_start[:, None],
         "b^",
         markersize=15,
         label="Start P",
         markeredgecolor="darkblue",
         markeredgewidth=2,
     )
-    ax.plot([t_x[-1]], [t_y[-1]], [t_z[-1]], "rx", markersize=15, label="End T", markeredgewidth=3)
-    ax.plot([p_x[-1]], [p_y[-1]], [p_z[-1]], "bx", markersize=15, label="End P", markeredgewidth=3)
+    ax.plot(*t_end[:, None], "rx", markersize=15, label="End T", markeredgewidth=3)
+    ax.plot(*p_end[:, None], "bx", markersize=15, label="End P", markeredgewidth=3)
 
     time_text = ax.text2D(
         0.02,
@@ -81,6 +92,8 @@ def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
 
     ax.set_box_aspect([1, 1, 1])
 
+    trail = TrailBuffer(2, 3, trail_capacity(num_frames, trail_length), min_spacing=pixel_size(ax))
+
     def init():
         """Inicjalizacja animacji"""
         line_target.set_data([], [])
@@ -95,39 +108,70 @@ def animate_sphere_pursuit_3d(solution, num_frames: int = 200) -> None:
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
     def animate_frame(frame):
-        line_target.set_data(t_x[: frame + 1], t_y[: frame + 1])
-        line_target.set_3d_properties(t_z[: frame + 1])  # type: ignore [attr-defined]
+        if frame == 0:
+            trail.clear()
+        positions = frames[frame]
+        trail.push(positions)
 
-        line_pursuer.set_data(p_x[: frame + 1], p_y[: frame + 1])
-        line_pursuer.set_3d_properties(p_z[: frame + 1])  # type: ignore [attr-defined]
+        p_trail, t_trail = trail.points(0), trail.points(1)
+        line_target.set_data(t_trail[:, 0], t_trail[:, 1])
+        line_target.set_3d_properties(t_trail[:, 2])  # type: ignore [attr-defined]
 
-        current_target.set_data([t_x[frame]], [t_y[frame]])
-        current_target.set_3d_properties([t_z[frame]])  # type: ignore [attr-defined]
+        line_pursuer.set_data(p_trail[:, 0], p_trail[:, 1])
+        line_pursuer.set_3d_properties(p_trail[:, 2])  # type: ignore [attr-defined]
 
-        current_pursuer.set_data([p_x[frame]], [p_y[frame]])
-        current_pursuer.set_3d_properties([p_z[frame]])  # type: ignore [attr-defined]
+        current_target.set_data(positions[1:2, 0], positions[1:2, 1])
+        current_target.set_3d_properties(positions[1:2, 2])  # type: ignore [attr-defined]
 
-        distance = np.sqrt(
-            (p_x[frame] - t_x[frame]) ** 2 + (p_y[frame] - t_y[frame]) ** 2 + (p_z[frame] - t_z[frame]) ** 2
-        )
-        time_text.set_text(f"Czas: {t_eval[frame]:.2f}s\nOdległość: {distance:.2f}")
+        current_pursuer.set_data(positions[0:1, 0], positions[0:1, 1])
+        current_pursuer.set_3d_properties(positions[0:1, 2])  # type: ignore [attr-defined]
+
+        distance = np.linalg.norm(positions[0] - positions[1])
+        time_text.set_text(f"Czas: {frames.t[frame]:.2f}s\nOdległość: {distance:.2f}")
 
         # Obrót kamery
         ax.view_init(elev=20, azim=frame * 360 / num_frames)
 
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
-    anim = FuncAnimation(
-        fig,
-        animate_frame,
-        init_func=init,
-        frames=num_frames,
-        interval=50,
-        blit=False,
-        repeat=True,
-    )
-
-    file = "sphere_pursuit.mp4"
-    anim.save(file, writer="ffmpeg", fps=30)
-    plt.close(fig)
-    print(f"Animacja zapisana do: {file}")
+    return Scene(fig, animate_frame, init, frames, trail)
+
+
+def animate_sphere_pursuit_3d(
+    solution,
+    num_frames: int = 200,
+    trail_length: int | None = None,
+    file: str = "sphere_pursuit.mp4",
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> None:
+    """
+    trail_length: Długość śladu w klatkach (None - cała historia, zdecymowana do rozmiaru piksela)
+    workers: Liczba procesów rysujących klatki (rendering.render_parallel); 1 - FuncAnimation
+    backend: "matplotlib" albo "raster" - szybki eksport bez Matplotlib (rendering.render_raster, writer
+             wybierany po rozszerzeniu file: wideo, .png, .npz); sfera jako siatka punktów
+    """
+    if backend == "raster":
+        radius = solution.sol(solution.t[0])[3]
+        theta, phi = np.meshgrid(np.linspace(-np.pi / 2, np.pi / 2, 30), np.linspace(0, 2 * np.pi, 60))
+        render_raster(
+            FrameSource(solution, num_frames, transform=_to_cartesian, dim=3),
+            file,
+            ["blue", "red"],
+            trail_length=trail_length,
+            surface=spherical_to_cartesian(radius, theta.ravel(), phi.ravel()).T,  # type: ignore [arg-type]
+            rotation=360 / num_frames,
+        )
+    elif backend == "matplotlib":
+        render_animation(
+            partial(_sphere_pursuit_scene, solution, num_frames, trail_length),
+            num_frames,
+            file,
+            writer,
+            workers=workers,
+            blit=False,
+        )
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
+    logger.info("Animacja zapisana do: %s", file, extra={"file": str(file)})
@@ -1,18 +1,34 @@
+import math
+
 import numpy as np
 from numpy.typing import NDArray
 
-from pursuit_curve.common import Strategy, TargetStrategy
+from pursuit_curve.common import KernelSpec, Strategy, TargetStrategy, kernels, numba_enabled, stack_components
 from pursuit_curve.sphere.utils import spherical_to_cartesian
 
 
 class ContinuousDirectPursuitSphere(Strategy):
-    def __init__(self, vel: float, target_strategy: TargetStrategy):
+    """capture_radius i capture_distance() to odległość kątowa po wielkim okręgu [rad]."""
+
+    distance_cached = True
+    _cos_distance = 1.0
+
+    def __init__(self, vel: float, target_strategy: TargetStrategy, capture_radius: float = 0.1):
         self.vel = vel
         self.target_strategy = target_strategy
+        self.capture_radius = capture_radius
+        self.kernel_spec = KernelSpec(
+            kernels.sphere_pursuit,
+            kernels.sphere_pursuit_stop,
+            params=np.concatenate([stack_components(vel)[:, 0], target_strategy.calculate_movement(0.0)]),
+            stop_params=np.array([capture_radius]),
+            target_strategy=target_strategy,
+            target_offset=1,
+        )
 
     def tangent_direction_cart(
-        self, pos_p_sph: NDArray[np.float32], pos_t_sph: NDArray[np.float32]
-    ) -> NDArray[np.float32]:
+        self, pos_p_sph: NDArray[np.float64], pos_t_sph: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
         r_p, theta_p, phi_p = pos_p_sph
         r_t, theta_t, phi_t = pos_t_sph
 
@@ -25,10 +41,10 @@ class ContinuousDirectPursuitSphere(Strategy):
 
         norm = np.linalg.norm(tangent_3d)
         if norm < 1e-6:
-            return np.array([0.0, 0.0, 0.0], dtype=np.float32)
+            return np.zeros(3)
         return tangent_3d / norm
 
-    def cart_vel_to_sph(self, pos_sph: NDArray[np.float32], vel_cart: NDArray[np.float32]) -> NDArray[np.float32]:
+    def cart_vel_to_sph(self, pos_sph: NDArray[np.float64], vel_cart: NDArray[np.float64]) -> NDArray[np.float64]:
         """Konwertuje wektor prędkości w R^3 na pochodne współrzędnych sferycznych"""
         r, theta, phi = pos_sph
         vx, vy, vz = vel_cart
@@ -39,46 +55,108 @@ class ContinuousDirectPursuitSphere(Strategy):
             dphi_dt = 0.0
         else:
             dphi_dt = (-np.sin(phi) * vx + np.cos(phi) * vy) / (r * np.cos(theta))
-        return np.array([dr_dt, dtheta_dt, dphi_dt], dtype=np.float32)
-
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        # r, theta, phi
-        pursuer_pos = y[0:3]
-        target_pos = y[3:6]
+        return np.array([dr_dt, dtheta_dt, dphi_dt])
+
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        """
+        y = [r_p, theta_p, phi_p, r_t, theta_t, phi_t]
+        Te same obliczenia co tangent_direction_cart() + cart_vel_to_sph(), ale na skalarach.
+        """
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(6)
+        r_p, theta_p, phi_p, r_t, theta_t, phi_t = y
+
+        sin_theta, cos_theta = math.sin(theta_p), math.cos(theta_p)
+        sin_phi, cos_phi = math.sin(phi_p), math.cos(phi_p)
+        p_x, p_y, p_z = r_p * cos_theta * cos_phi, r_p * cos_theta * sin_phi, r_p * sin_theta
+        cos_theta_t = math.cos(theta_t)
+        d_x = r_t * cos_theta_t * math.cos(phi_t) - p_x
+        d_y = r_t * cos_theta_t * math.sin(phi_t) - p_y
+        d_z = r_t * math.sin(theta_t) - p_z
+
+        radial_comp = (d_x * p_x + d_y * p_y + d_z * p_z) / (r_p * r_p)
+        # cos odległości kątowej: (t . p) / (r_t r_p), gdzie t . p = d . p + r_p^2
+        self._distance_state, self._cos_distance = y, r_p * (radial_comp + 1.0) / r_t
+        d_x -= radial_comp * p_x
+        d_y -= radial_comp * p_y
+        d_z -= radial_comp * p_z
+        norm = math.sqrt(d_x * d_x + d_y * d_y + d_z * d_z)
+        if norm < 1e-6:
+            out[0:3] = 0.0
+        else:
+            scale = self.vel / norm
+            vx, vy, vz = d_x * scale, d_y * scale, d_z * scale
+            out[0] = cos_theta * cos_phi * vx + cos_theta * sin_phi * vy + sin_theta * vz
+            out[1] = (-sin_theta * cos_phi * vx - sin_theta * sin_phi * vy + cos_theta * vz) / r_p
+            if abs(sin_theta) < 1e-6:
+                out[2] = 0.0
+            else:
+                out[2] = (-sin_phi * vx + cos_phi * vy) / (r_p * cos_theta)
+        out[3:6] = self.target_strategy.calculate_movement(t)
+        return out
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """Y - tablica (6, M) stanów [r_p, theta_p, phi_p, r_t, theta_t, phi_t]"""
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(3, -1)
+        r, theta, phi = Y[0:3]
+
+        pos_p_cart = spherical_to_cartesian(r, theta, phi)
+        pos_t_cart = spherical_to_cartesian(Y[3], Y[4], Y[5])
+        direction_3d = pos_t_cart - pos_p_cart
+        radial_comp = np.sum(direction_3d * pos_p_cart, axis=0) / (r * r)
+        tangent_3d = direction_3d - radial_comp * pos_p_cart
+        norm = np.linalg.norm(tangent_3d, axis=0)
+        vx, vy, vz = self.vel * tangent_3d / np.where(norm < 1e-6, np.inf, norm)
+
+        sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+        sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+
+        dY = np.empty(np.broadcast_shapes(Y.shape, (6, target_vel.shape[1])))
+        dY[0] = cos_theta * cos_phi * vx + cos_theta * sin_phi * vy + sin_theta * vz
+        dY[1] = (-sin_theta * cos_phi * vx - sin_theta * sin_phi * vy + cos_theta * vz) / r
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dY[2] = np.where(np.abs(sin_theta) < 1e-6, 0.0, (-sin_phi * vx + cos_phi * vy) / (r * cos_theta))
+        dY[3:6] = target_vel
+        return dY
+
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        theta_p, phi_p, theta_t, phi_t = Y[1], Y[2], Y[4], Y[5]
+        cos_dist = np.sin(theta_p) * np.sin(theta_t) + np.cos(theta_p) * np.cos(theta_t) * np.cos(phi_t - phi_p)
+        return np.arccos(np.clip(cos_dist, -1.0, 1.0)) - self.capture_radius
 
-        target_vel = self.target_strategy.calculate_movement(t)
-        tangent_direction = self.tangent_direction_cart(pursuer_pos, target_pos)
-        pursuer_vel_cart = self.vel * tangent_direction
-        pursuer_vel = self.cart_vel_to_sph(pursuer_pos, pursuer_vel_cart)
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        _, theta_p, phi_p, _, theta_t, phi_t = y.tolist()
+        cos_dist = math.sin(theta_p) * math.sin(theta_t) + math.cos(theta_p) * math.cos(theta_t) * math.cos(
+            phi_t - phi_p
+        )
+        return math.acos(min(1.0, max(-1.0, cos_dist)))
 
-        return np.concatenate([pursuer_vel, target_vel])
+    def cached_distance(self, y: NDArray[np.float64]) -> float | None:
+        """dynamics() zapamiętuje cosinus odległości - arcus cosinus liczony jest dopiero tutaj."""
+        if y is not self._distance_state:
+            return None
+        return math.acos(min(1.0, max(-1.0, self._cos_distance)))
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0:3], dtype=np.float32)
-        target_pos = np.array(y[3:6], dtype=np.float32)
-        _, theta_p, phi_p = pursuer_pos
-        _, theta_t, phi_t = target_pos
-        cos_dist = np.sin(theta_p) * np.sin(theta_t) + np.cos(theta_p) * np.cos(theta_t) * np.cos(phi_t - phi_p)
-        cos_dist = np.clip(cos_dist, -1.0, 1.0)
-        angular_distance = np.arccos(cos_dist)
-        return angular_distance - 0.1
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
 
 class ContinuousTargetSphereStrategy(TargetStrategy):
+    constant_velocity = True
+
     def __init__(self, dr: float, dtheta: float, dphi: float):
         self.dr = dr
         self.dtheta = dtheta
         self.dphi = dphi
+        self._velocity = np.array([dr, dtheta, dphi], dtype=np.float64)
+        self._velocity.flags.writeable = False
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array(
-            [
-                self.dr,
-                self.dtheta,
-                self.dphi,
-            ],
-            dtype=np.float32,
-        )
+        return self._velocity
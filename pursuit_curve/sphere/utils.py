@@ -2,8 +2,8 @@ import numpy as np
 from numpy.typing import NDArray
 
 
-def spherical_to_cartesian(r: float, theta: float, phi: float) -> NDArray[np.float32]:
+def spherical_to_cartesian(r: float, theta: float, phi: float) -> NDArray[np.float64]:
     x = r * np.cos(theta) * np.cos(phi)
     y = r * np.cos(theta) * np.sin(phi)
     z = r * np.sin(theta)
-    return np.array([x, y, z], dtype=np.float32)
+    return np.array([x, y, z])
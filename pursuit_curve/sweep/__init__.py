@@ -0,0 +1,7 @@
+from .runner import iter_grid, load_sweep, run_sweep
+
+__all__ = [
+    "iter_grid",
+    "load_sweep",
+    "run_sweep",
+]
@@ -0,0 +1,56 @@
+"""
+Uruchomienie z linii poleceń:
+
+    python -m pursuit_curve.sweep --build moj_modul:zbuduj --grid siatka.json --output wyniki/
+
+siatka.json: {"nazwa_parametru": [wartość, ...], ...}
+zbuduj(**parametry) -> (initial_state, strategy)
+"""
+
+import argparse
+import importlib
+import json
+
+import numpy as np
+
+from .runner import run_sweep
+
+
+def _load_callable(spec: str):
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m pursuit_curve.sweep", description="Przegląd siatki parametrów")
+    parser.add_argument("--build", required=True, help="Funkcja budująca scenariusz: 'modul:funkcja'")
+    parser.add_argument("--grid", required=True, help="Plik JSON z siatką parametrów")
+    parser.add_argument("--output", required=True, help="Katalog na wyniki (wznawialny)")
+    parser.add_argument("--t-start", type=float, default=0.0)
+    parser.add_argument("--t-end", type=float, default=50.0)
+    parser.add_argument("--max-step", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--max-memory-mb", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.grid) as f:
+        grid = json.load(f)
+
+    table = run_sweep(
+        _load_callable(args.build),
+        grid,
+        args.output,
+        t_span=(args.t_start, args.t_end),
+        max_step=args.max_step,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_memory_mb=args.max_memory_mb,
+    )
+
+    captured = ~np.isnan(table["capture_time"])
+    print(f"Scenariusze: {len(table['index'])}, udane: {int(table['success'].sum())}, złapane: {int(captured.sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import hashlib
+import itertools
+import json
+import os
+import resource
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pursuit_curve.common import Strategy, run_continuous_simulation
+from pursuit_curve.metrics import Geometry, compute_metrics
+
+BuildFn = Callable[..., tuple[list[float], Strategy] | tuple[list[float], Strategy, Geometry]]
+
+COLUMNS = ("index", "params", "capture_time", "t_final", "path_length", "n_steps", "nfev", "success", "error")
+
+
+def iter_grid(grid: Mapping[str, Sequence[Any]]) -> Iterator[dict[str, Any]]:
+    """Iloczyn kartezjański siatki parametrów w deterministycznej kolejności (kolejność kluczy i wartości)."""
+    keys = list(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def _limit_memory(max_memory_mb: int | None) -> None:
+    if max_memory_mb is not None:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _pursuer_path_length(solution: Any, strategy: Strategy, geometry: Geometry | None) -> float:
+    """Droga ścigającego (agent 0 w geometrii stanu) - NaN, gdy układ stanu nie jest znany."""
+    if geometry is None:
+        return np.nan
+    metrics = compute_metrics(
+        solution, geometry, pairs=[], series=False, strategy=None if strategy.runtime_state else strategy
+    )
+    return float(metrics.path_length[0])
+
+
+def _run_case(
+    build: BuildFn,
+    params: dict[str, Any],
+    t_span: tuple[float, float],
+    max_step: float,
+    geometry: Geometry | None,
+) -> dict[str, Any]:
+    try:
+        initial_state, strategy, *rest = build(**params)
+        geometry = rest[0] if rest else geometry
+        solution = run_continuous_simulation(initial_state, strategy, t_span=t_span, max_step=max_step)
+        path_length = _pursuer_path_length(solution, strategy, geometry)
+    except MemoryError:
+        return {"success": False, "error": "MemoryError"}
+    except Exception as e:
+        return {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+    events = solution.t_events[0] if solution.t_events else []
+    return {
+        "capture_time": float(events[0]) if len(events) else np.nan,
+        "t_final": float(solution.t[-1]),
+        "path_length": path_length,
+        "n_steps": len(solution.t) - 1,
+        "nfev": solution.nfev,
+        "success": bool(solution.success),
+        "error": "" if solution.success else solution.message,
+    }
+
+
+def _run_chunk(
+    build: BuildFn,
+    cases: list[tuple[int, dict[str, Any]]],
+    t_span: tuple[float, float],
+    max_step: float,
+    geometry: Geometry | None,
+) -> dict[str, NDArray]:
+    rows = [_run_case(build, params, t_span, max_step, geometry) for _, params in cases]
+    return {
+        "index": np.array([index for index, _ in cases], dtype=np.int64),
+        "params": np.array([json.dumps(params, sort_keys=True, default=repr) for _, params in cases], dtype=np.str_),
+        "capture_time": np.array([row.get("capture_time", np.nan) for row in rows], dtype=np.float64),
+        "t_final": np.array([row.get("t_final", np.nan) for row in rows], dtype=np.float64),
+        "path_length": np.array([row.get("path_length", np.nan) for row in rows], dtype=np.float64),
+        "n_steps": np.array([row.get("n_steps", -1) for row in rows], dtype=np.int64),
+        "nfev": np.array([row.get("nfev", -1) for row in rows], dtype=np.int64),
+        "success": np.array([row["success"] for row in rows], dtype=bool),
+        "error": np.array([row["error"] for row in rows], dtype=np.str_),
+    }
+
+
+def _chunk_path(output_dir: Path, chunk_index: int) -> Path:
+    return output_dir / f"chunk_{chunk_index:06d}.npz"
+
+
+def _write_chunk(output_dir: Path, chunk_index: int, table: dict[str, NDArray]) -> None:
+    """Zapis atomowy - po awarii na dysku zostają tylko kompletne fragmenty."""
+    path = _chunk_path(output_dir, chunk_index)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, **table)
+    os.replace(tmp, path)
+
+
+def _manifest(
+    build: BuildFn,
+    cases: list[tuple[int, dict[str, Any]]],
+    t_span: tuple[float, float],
+    max_step: float,
+    chunk_size: int,
+    geometry: Geometry | None,
+) -> dict[str, Any]:
+    """Opis przebiegu: funkcja build, skrót parametrów wszystkich punktów siatki, horyzont, podział i geometria."""
+    params = "\n".join(json.dumps(params, sort_keys=True, default=repr) for _, params in cases)
+    return {
+        "build": f"{build.__module__}.{build.__qualname__}",
+        "cases": hashlib.sha256(params.encode()).hexdigest(),
+        "n_cases": len(cases),
+        "t_span": [float(t_span[0]), float(t_span[1])],
+        "max_step": float(max_step),
+        "chunk_size": chunk_size,
+        "geometry": None if geometry is None else f"{type(geometry).__qualname__}{json.dumps(vars(geometry))}",
+    }
+
+
+def _check_manifest(output_dir: Path, manifest: dict[str, Any]) -> None:
+    """Wznowienie ma sens tylko dla tej samej siatki podzielonej na te same fragmenty."""
+    path = output_dir / "sweep.json"
+    if path.exists():
+        stored = json.loads(path.read_text())
+        if stored != manifest:
+            raise ValueError(f"Katalog {output_dir} zawiera wyniki innego przebiegu: {stored} != {manifest}")
+    else:
+        path.write_text(json.dumps(manifest))
+
+
+def load_sweep(output_dir: str | Path) -> dict[str, NDArray]:
+    """Wczytuje i skleja wszystkie zapisane fragmenty w jedną tabelę kolumnową posortowaną po indeksie."""
+    paths = sorted(Path(output_dir).glob("chunk_*.npz"))
+    if not paths:
+        return {column: np.array([]) for column in COLUMNS}
+    chunks = []
+    for path in paths:
+        with np.load(path) as data:
+            chunks.append({column: data[column] for column in COLUMNS})
+    table = {column: np.concatenate([chunk[column] for chunk in chunks]) for column in COLUMNS}
+    order = np.argsort(table["index"], kind="stable")
+    return {column: values[order] for column, values in table.items()}
+
+
+def run_sweep(
+    build: BuildFn,
+    grid: Mapping[str, Sequence[Any]],
+    output_dir: str | Path,
+    t_span: tuple[float, float] = (0, 50),
+    max_step: float = 0.1,
+    workers: int | None = None,
+    chunk_size: int = 16,
+    max_memory_mb: int | None = None,
+    geometry: Geometry | None = None,
+) -> dict[str, NDArray]:
+    """
+    Uruchamia run_continuous_simulation dla każdego punktu siatki parametrów w puli procesów.
+
+    build: Funkcja na poziomie modułu (musi dać się zpicklować), która dla parametrów punktu
+           siatki zwraca (initial_state, strategy) albo (initial_state, strategy, geometry)
+    grid: Słownik nazwa_parametru -> lista wartości, np. strategia × prędkość × stan początkowy
+    output_dir: Katalog na fragmenty wyników (chunk_XXXXXX.npz). Fragmenty już zapisane są
+                pomijane, więc ponowne wywołanie po awarii wznawia przeliczenia.
+    workers: Liczba procesów (domyślnie os.cpu_count())
+    chunk_size: Liczba scenariuszy w jednym zadaniu puli
+    max_memory_mb: Limit pamięci (RLIMIT_AS) dla każdego procesu roboczego
+    geometry: Geometria stanu agenta (metrics.Euclidean(dim), Sphere(), Torus(R, r)) dla kolumny path_length -
+              drogi ścigającego, czyli agenta 0. Geometria zwrócona przez build ma pierwszeństwo; bez żadnej
+              path_length to NaN, bo sam wektor stanu nie mówi, jak podzielić go na agentów.
+
+    Zwraca tabelę kolumnową (słownik kolumna -> tablica) w kolejności punktów siatki.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    cases = list(enumerate(iter_grid(grid)))
+    _check_manifest(output_dir, _manifest(build, cases, t_span, max_step, chunk_size, geometry))
+    chunks = [
+        (chunk_index, cases[start : start + chunk_size])
+        for chunk_index, start in enumerate(range(0, len(cases), chunk_size))
+        if not _chunk_path(output_dir, chunk_index).exists()
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_limit_memory, initargs=(max_memory_mb,)) as pool:
+        pending = {}
+        queue = iter(chunks)
+        while True:
+            # Ograniczamy liczbę zadań w locie, żeby nie trzymać w pamięci wszystkich wyników naraz
+            for chunk_index, chunk in itertools.islice(queue, 2 * workers - len(pending)):
+                future = pool.submit(_run_chunk, build, chunk, t_span, max_step, geometry)
+                pending[future] = chunk_index
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _write_chunk(output_dir, pending.pop(future), future.result())
+
+    return load_sweep(output_dir)
@@ -1,23 +1,42 @@
+import logging
+from functools import partial
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
+from matplotlib.animation import AbstractMovieWriter
+
+from pursuit_curve.rendering import (
+    FrameSource,
+    Scene,
+    TrailBuffer,
+    pixel_size,
+    render_animation,
+    render_raster,
+    trail_capacity,
+)
+
+logger = logging.getLogger(__name__)
+
 
+def _torus_to_cartesian(u: np.ndarray, v: np.ndarray, R: float, r: float) -> np.ndarray:
+    x = (R + r * np.cos(v)) * np.cos(u)
+    y = (R + r * np.cos(v)) * np.sin(u)
+    z = r * np.sin(v)
+    return np.array([x, y, z])
 
-def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200) -> None:
-    t_eval = np.linspace(solution.t[0], solution.t[-1], num_frames)
-    y_interp = solution.sol(t_eval)
 
-    p_u, p_v = y_interp[0:2]
-    t_u, t_v = y_interp[2:4]
+def _states_to_cartesian(y: np.ndarray, R: float, r: float) -> np.ndarray:
+    """Stany [u, v] ścigającego i celu (4, k) -> pozycje kartezjańskie (k, 2, 3)."""
+    u, v = y.reshape(2, 2, -1).transpose(1, 0, 2)
+    return _torus_to_cartesian(u, v, R, r).transpose(2, 1, 0)
 
-    def torus_to_cartesian(u: np.ndarray, v: np.ndarray) -> np.ndarray:
-        x = (R + r * np.cos(v)) * np.cos(u)
-        y = (R + r * np.cos(v)) * np.sin(u)
-        z = r * np.sin(v)
-        return np.array([x, y, z])
 
-    p_x, p_y, p_z = torus_to_cartesian(p_u, p_v)
-    t_x, t_y, t_z = torus_to_cartesian(t_u, t_v)
+def _torus_frames(solution, R: float, r: float, num_frames: int) -> FrameSource:
+    return FrameSource(solution, num_frames, transform=partial(_states_to_cartesian, R=R, r=r), dim=3)
+
+
+def _torus_pursuit_scene(solution, R: float, r: float, num_frames: int, trail_length: int | None) -> Scene:
+    frames = _torus_frames(solution, R, r, num_frames)
 
     fig = plt.figure(figsize=(16, 12))
     ax = fig.add_subplot(111, projection="3d")
@@ -26,7 +45,7 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
     v_surf = np.linspace(0, 2 * np.pi, 100)
     U, V = np.meshgrid(u_surf, v_surf)
 
-    X, Y, Z = torus_to_cartesian(U, V)
+    X, Y, Z = _torus_to_cartesian(U, V, R, r)
 
     colors = np.sin(V)
 
@@ -57,10 +76,9 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
         [], [], [], "bo", markersize=15, alpha=1.0, markeredgecolor="darkblue", markeredgewidth=2
     )
 
+    (p_start, t_start), (p_end, t_end) = frames[0].copy(), frames[-1].copy()
     ax.plot(
-        [t_x[0]],
-        [t_y[0]],
-        [t_z[0]],
+        *t_start[:, None],
         "r^",
         markersize=15,
         markeredgecolor="darkred",
@@ -68,9 +86,7 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
         label="Start T",
     )
     ax.plot(
-        [p_x[0]],
-        [p_y[0]],
-        [p_z[0]],
+        *p_start[:, None],
         "b^",
         markersize=15,
         markeredgecolor="darkblue",
@@ -78,8 +94,8 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
         label="Start P",
     )
 
-    ax.plot([t_x[-1]], [t_y[-1]], [t_z[-1]], "rx", markersize=18, markeredgewidth=4, label="Koniec T")
-    ax.plot([p_x[-1]], [p_y[-1]], [p_z[-1]], "bx", markersize=18, markeredgewidth=4, label="Koniec P")
+    ax.plot(*t_end[:, None], "rx", markersize=18, markeredgewidth=4, label="Koniec T")
+    ax.plot(*p_end[:, None], "bx", markersize=18, markeredgewidth=4, label="Koniec P")
 
     time_text = ax.text2D(
         0.02,
@@ -103,6 +119,8 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
 
     ax.set_box_aspect([1, 1, 1])
 
+    trail = TrailBuffer(2, 3, trail_capacity(num_frames, trail_length), min_spacing=pixel_size(ax))
+
     def init():
         line_target.set_data([], [])
         line_target.set_3d_properties([])  # type: ignore [attr-defined]
@@ -116,40 +134,74 @@ def animate_torus_pursuit_3d(solution, R: float, r: float, num_frames: int = 200
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
     def animate_frame(frame):
-        line_target.set_data(t_x[: frame + 1], t_y[: frame + 1])
-        line_target.set_3d_properties(t_z[: frame + 1])  # type: ignore [attr-defined]
+        if frame == 0:
+            trail.clear()
+        positions = frames[frame]
+        trail.push(positions)
 
-        line_pursuer.set_data(p_x[: frame + 1], p_y[: frame + 1])
-        line_pursuer.set_3d_properties(p_z[: frame + 1])  # type: ignore [attr-defined]
+        p_trail, t_trail = trail.points(0), trail.points(1)
+        line_target.set_data(t_trail[:, 0], t_trail[:, 1])
+        line_target.set_3d_properties(t_trail[:, 2])  # type: ignore [attr-defined]
 
-        current_target.set_data([t_x[frame]], [t_y[frame]])
-        current_target.set_3d_properties([t_z[frame]])  # type: ignore [attr-defined]
+        line_pursuer.set_data(p_trail[:, 0], p_trail[:, 1])
+        line_pursuer.set_3d_properties(p_trail[:, 2])  # type: ignore [attr-defined]
 
-        current_pursuer.set_data([p_x[frame]], [p_y[frame]])
-        current_pursuer.set_3d_properties([p_z[frame]])  # type: ignore [attr-defined]
+        current_target.set_data(positions[1:2, 0], positions[1:2, 1])
+        current_target.set_3d_properties(positions[1:2, 2])  # type: ignore [attr-defined]
 
-        distance = np.sqrt(
-            (p_x[frame] - t_x[frame]) ** 2 + (p_y[frame] - t_y[frame]) ** 2 + (p_z[frame] - t_z[frame]) ** 2
-        )
+        current_pursuer.set_data(positions[0:1, 0], positions[0:1, 1])
+        current_pursuer.set_3d_properties(positions[0:1, 2])  # type: ignore [attr-defined]
+
+        distance = np.linalg.norm(positions[0] - positions[1])
 
-        time_text.set_text(f"Czas: {t_eval[frame]:.2f}s\nOdległość: {distance:.2f}")
+        time_text.set_text(f"Czas: {frames.t[frame]:.2f}s\nOdległość: {distance:.2f}")
 
         # Obrót kamery
         ax.view_init(elev=20, azim=30 + frame * 360 / num_frames)
 
         return line_target, line_pursuer, current_target, current_pursuer, time_text
 
-    anim = FuncAnimation(
-        fig,
-        animate_frame,
-        init_func=init,
-        frames=num_frames,
-        interval=50,
-        blit=False,
-        repeat=True,
-    )
-
-    file = "torus_pursuit.mp4"
-    anim.save(file, writer="ffmpeg", fps=30)
-    plt.close(fig)
-    print(f"Animacja zapisana do: {file}")
+    return Scene(fig, animate_frame, init, frames, trail)
+
+
+def animate_torus_pursuit_3d(
+    solution,
+    R: float,
+    r: float,
+    num_frames: int = 200,
+    trail_length: int | None = None,
+    file: str = "torus_pursuit.mp4",
+    writer: str | AbstractMovieWriter = "ffmpeg",
+    workers: int = 1,
+    backend: str = "matplotlib",
+) -> None:
+    """
+    trail_length: Długość śladu w klatkach (None - cała historia, zdecymowana do rozmiaru piksela)
+    workers: Liczba procesów rysujących klatki (rendering.render_parallel); 1 - FuncAnimation
+    backend: "matplotlib" albo "raster" - szybki eksport bez Matplotlib (rendering.render_raster, writer
+             wybierany po rozszerzeniu file: wideo, .png, .npz); powierzchnia torusa jako siatka punktów
+    """
+    if backend == "raster":
+        u, v = np.meshgrid(np.linspace(0, 2 * np.pi, 60), np.linspace(0, 2 * np.pi, 30))
+        render_raster(
+            _torus_frames(solution, R, r, num_frames),
+            file,
+            ["blue", "red"],
+            trail_length=trail_length,
+            line_width=3,
+            surface=_torus_to_cartesian(u.ravel(), v.ravel(), R, r).T,
+            azimuth=30,
+            rotation=360 / num_frames,
+        )
+    elif backend == "matplotlib":
+        render_animation(
+            partial(_torus_pursuit_scene, solution, R, r, num_frames, trail_length),
+            num_frames,
+            file,
+            writer,
+            workers=workers,
+            blit=False,
+        )
+    else:
+        raise ValueError(f"Nieznany backend: {backend}")
+    logger.info("Animacja zapisana do: %s", file, extra={"file": str(file)})
@@ -1,15 +1,30 @@
+import math
+
 import numpy as np
 from numpy.typing import NDArray
 
-from pursuit_curve.common import Strategy, TargetStrategy
+from pursuit_curve.common import KernelSpec, Strategy, TargetStrategy, kernels, numba_enabled, stack_components
 
 
 class ContinuousDirectPursuitTorus(Strategy):
-    def __init__(self, vel: float, target_strategy: TargetStrategy, R: float, r: float):
+    """capture_radius i capture_distance() to długość w metryce Riemanna torusa."""
+
+    distance_cached = True
+
+    def __init__(self, vel: float, target_strategy: TargetStrategy, R: float, r: float, capture_radius: float = 0.1):
         self.vel = vel
         self.target_strategy = target_strategy
         self.R = R
         self.r = r
+        self.capture_radius = capture_radius
+        self.kernel_spec = KernelSpec(
+            kernels.torus_pursuit,
+            kernels.torus_pursuit_stop,
+            params=np.concatenate([stack_components(vel, R, r)[:, 0], target_strategy.calculate_movement(0.0)]),
+            stop_params=np.array([R, r, capture_radius]),
+            target_strategy=target_strategy,
+            target_offset=3,
+        )
 
     def shortest_angular_distance(self, angle_from: float, angle_to: float) -> float:
         """
@@ -18,7 +33,7 @@ class ContinuousDirectPursuitTorus(Strategy):
         d = angle_to - angle_from
         return np.arctan2(np.sin(d), np.cos(d))
 
-    def tangent_direction(self, pos_p: NDArray[np.float32], pos_t: NDArray[np.float32]) -> NDArray[np.float32]:
+    def tangent_direction(self, pos_p: NDArray[np.float64], pos_t: NDArray[np.float64]) -> NDArray[np.float64]:
         p_u, p_v = pos_p
         t_u, t_v = pos_t
 
@@ -32,10 +47,10 @@ class ContinuousDirectPursuitTorus(Strategy):
 
         norm = np.sqrt(d_u**2 + d_v**2)
         if norm < 1e-6:
-            return np.array([0.0, 0.0], dtype=np.float32)
-        return np.array([d_u / norm, d_v / norm], dtype=np.float32)
+            return np.zeros(2)
+        return np.array([d_u / norm, d_v / norm])
 
-    def tangent_to_angular_vel(self, pos: NDArray[np.float32], tangent: NDArray[np.float32]) -> NDArray[np.float32]:
+    def tangent_to_angular_vel(self, pos: NDArray[np.float64], tangent: NDArray[np.float64]) -> NDArray[np.float64]:
         _, v = pos
         t_u, t_v = tangent
 
@@ -44,42 +59,82 @@ class ContinuousDirectPursuitTorus(Strategy):
         du_dt = self.vel * t_u / (self.R + self.r * np.cos(v))
         dv_dt = self.vel * t_v / self.r
 
-        return np.array([du_dt, dv_dt], dtype=np.float32)
+        return np.array([du_dt, dv_dt])
 
-    def dynamics(self, t: float, y: NDArray[np.float32]) -> np.ndarray:
-        # u, v
-        pursuer_pos = y[0:2]
-        target_pos = y[2:4]
+    def dynamics(self, t: float, y: NDArray[np.float64], out: NDArray[np.float64] | None = None) -> np.ndarray:
+        """
+        y = [u_p, v_p, u_t, v_t]
+        Te same obliczenia co tangent_direction() + tangent_to_angular_vel(), ale na skalarach.
+        """
+        if numba_enabled():
+            return self.kernel_spec.dynamics(t, y, out)  # type: ignore [union-attr]
+        if out is None:
+            out = np.empty(4)
+        p_u, p_v, t_u, t_v = y
 
-        target_vel = self.target_strategy.calculate_movement(t)
+        delta_u = math.remainder(t_u - p_u, 2 * math.pi)
+        delta_v = math.remainder(t_v - p_v, 2 * math.pi)
 
-        tangent = self.tangent_direction(pursuer_pos, target_pos)
-        pursuer_vel = self.tangent_to_angular_vel(pursuer_pos, tangent)
+        u_scale = self.R + self.r * math.cos(p_v)
+        d_u = u_scale * delta_u
+        d_v = self.r * delta_v
+        norm = math.hypot(d_u, d_v)
+        self._distance_state, self._distance = y, norm
+        if norm < 1e-6:
+            out[0] = out[1] = 0.0
+        else:
+            out[0] = self.vel * d_u / norm / u_scale
+            out[1] = self.vel * d_v / norm / self.r
+        out[2:4] = self.target_strategy.calculate_movement(t)
+        return out
+
+    def dynamics_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        """Y - tablica (4, M) stanów [u_p, v_p, u_t, v_t]"""
+        target_vel = np.asarray(self.target_strategy.calculate_movement(t), dtype=np.float64).reshape(2, -1)
+        p_v = Y[1]
+
+        delta_u = self.shortest_angular_distance(Y[0], Y[2])
+        delta_v = self.shortest_angular_distance(p_v, Y[3])
+
+        u_scale = self.R + self.r * np.cos(p_v)
+        d_u = u_scale * delta_u
+        d_v = self.r * delta_v
+        norm = np.sqrt(d_u**2 + d_v**2)
+        inv_norm = 1.0 / np.where(norm < 1e-6, np.inf, norm)
 
-        return np.concatenate([pursuer_vel, target_vel])
+        dY = np.empty(np.broadcast_shapes(Y.shape, (4, target_vel.shape[1])))
+        dY[0] = self.vel * d_u * inv_norm / u_scale
+        dY[1] = self.vel * d_v * inv_norm / self.r
+        dY[2:4] = target_vel
+        return dY
 
-    def stop_condition(self, t: float, y: list[float]) -> np.float32:
-        pursuer_pos = np.array(y[0:2], dtype=np.float32)
-        target_pos = np.array(y[2:4], dtype=np.float32)
+    def stop_condition_batch(self, t: float, Y: np.ndarray) -> np.ndarray:
+        delta_u = self.shortest_angular_distance(Y[0], Y[2])
+        delta_v = self.shortest_angular_distance(Y[1], Y[3])
+        distance = np.sqrt((self.R + self.r * np.cos(Y[1])) ** 2 * delta_u**2 + self.r**2 * delta_v**2)
+        return distance - self.capture_radius
 
-        p_u, p_v = pursuer_pos
-        t_u, t_v = target_pos
+    def capture_distance(self, y: NDArray[np.float64]) -> float:
+        p_u, p_v, t_u, t_v = y.tolist()
 
-        delta_u = self.shortest_angular_distance(p_u, t_u)
-        delta_v = self.shortest_angular_distance(p_v, t_v)
+        delta_u = math.remainder(t_u - p_u, 2 * math.pi)
+        delta_v = math.remainder(t_v - p_v, 2 * math.pi)
 
         # Odległość w metryce Riemanna ds² = (R + r·cos(v))²·du² + r²·dv²
-        dist = np.sqrt(
-            (self.R + self.r * np.cos(p_v)) ** 2 * delta_u**2 + self.r**2 * delta_v**2,
-        )
+        return math.hypot((self.R + self.r * math.cos(p_v)) * delta_u, self.r * delta_v)
 
-        return dist - 0.1
+    def stop_condition(self, t: float, y: list[float]) -> float:
+        if numba_enabled():
+            return self.kernel_spec.stop_condition(y)  # type: ignore [union-attr]
+        return self.capture_distance(np.asarray(y)) - self.capture_radius
 
     stop_condition.terminal = True
     stop_condition.direction = -1
 
 
 class ContinuousTargetTorusStrategy(TargetStrategy):
+    constant_velocity = True
+
     def __init__(self, omega_u: float, omega_v: float):
         """
         omega_u - Predkość kątowa wokół głównej osi torusa [rad/s]
@@ -87,6 +142,8 @@ class ContinuousTargetTorusStrategy(TargetStrategy):
         """
         self.omega_u = omega_u
         self.omega_v = omega_v
+        self._velocity = np.array([omega_u, omega_v], dtype=np.float64)
+        self._velocity.flags.writeable = False
 
     def calculate_movement(self, t: float) -> np.ndarray:
-        return np.array([self.omega_u, self.omega_v], dtype=np.float32)
+        return self._velocity